@@ -0,0 +1,312 @@
+"""
+Batch Scenario Runner - Evaluate what-if loan scenarios from a JSONL or CSV file without the UI
+
+Each input row is one scenario. Field names follow the app's sidebar inputs
+(all optional except loan_amount):
+
+    id, loan_amount, tenure_years (20), banks (all banks; list, or names
+    separated by ";" in CSV), tax_slab (30), old_tax_regime (true),
+    property_type ("Self-Occupied"), annual_prepayment (0), prepayment_month (12),
+    surplus_amount (0), monthly_surplus (0), and the personalized-rate profile
+    (credit_score, age, gender, employment, property_location; a "profile"
+    object in JSONL, or plain columns in CSV)
+
+Every scenario produces one output row per bank, written as JSONL or CSV
+(by output file extension) as soon as its chunk is done, so memory stays flat
+however large the input is.
+
+Usage:
+    python batch_scenarios.py scenarios.jsonl -o results.jsonl --workers 4 --chunk-size 500
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# Add utils directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils'))
+from rate_loader import get_bank_data_for_app
+from rate_calculator import personalized_rates
+
+from engine import loan_terms, evaluate_regular_scenarios, overdraft_scenario_results
+
+REGULAR = "Regular Home Loan (EMI)"
+OVERDRAFT = "Home Loan with Overdraft"
+
+PROFILE_FIELDS = ("credit_score", "age", "gender", "employment", "property_location")
+
+# Scalar result fields written for every bank (yearly breakdowns are left out)
+OUTPUT_FIELDS = [
+    "id", "loan_type", "bank", "interest_rate", "emi", "final_emi", "total_payment", "total_interest",
+    "total_interest_paid", "total_interest_saved", "processing_fee", "od_charge", "total_tax_benefit",
+    "net_cost", "actual_tenure_months", "total_prepayments", "final_od_balance", "error"
+]
+
+# Stands in for an input line that is not valid JSON, so it becomes an error record instead of ending the run
+UnreadableRow = namedtuple("UnreadableRow", "error")
+
+# Bank data is loaded once per worker process
+_BANK_DATA = None
+
+
+def _bank_data():
+    global _BANK_DATA
+    if _BANK_DATA is None:
+        _BANK_DATA, _ = get_bank_data_for_app()
+    return _BANK_DATA
+
+
+def read_scenarios(path):
+    """Stream scenario dicts from a JSONL or CSV file one row at a time (UnreadableRow for bad JSON lines)"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield UnreadableRow(f"Invalid JSON: {e}")
+
+
+def _flag(value):
+    """Read a boolean from JSON or CSV ("true"/"false", "yes"/"no", "1"/"0")"""
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "yes", "1", "old")
+    return bool(value)
+
+
+def _number(row, key, default, kind=float):
+    value = row.get(key)
+    if value is None or value == "":
+        return default
+    return kind(float(value))
+
+
+def parse_scenario(row):
+    """
+    Turn a raw input row into calculation inputs with the app's defaults filled in
+
+    Args:
+        row (dict): One input row (JSONL object or CSV record)
+
+    Returns:
+        dict: Normalized scenario
+    """
+    if not isinstance(row, dict):
+        raise ValueError(f"Scenario must be a JSON object, got {type(row).__name__}")
+    loan_amount = _number(row, "loan_amount", None)
+    if loan_amount is None:
+        raise ValueError("loan_amount is required")
+    if not loan_amount > 0:
+        raise ValueError(f"loan_amount must be positive, got {loan_amount}")
+    tenure_years = _number(row, "tenure_years", 20, int)
+    if tenure_years < 1:
+        raise ValueError(f"tenure_years must be at least 1, got {tenure_years}")
+    prepayment_month = _number(row, "prepayment_month", 12, int)
+    if not 1 <= prepayment_month <= 12:
+        raise ValueError(f"prepayment_month must be 1-12, got {prepayment_month}")
+
+    banks = row.get("banks") or []
+    if isinstance(banks, str):
+        banks = [bank.strip() for bank in banks.split(";") if bank.strip()]
+
+    profile = dict(row.get("profile") or {})
+    for field in PROFILE_FIELDS:
+        if row.get(field) not in (None, ""):
+            profile[field] = row[field]
+    if "age" in profile:
+        profile["age"] = int(float(profile["age"]))
+    if profile:
+        profile["loan_amount"] = loan_amount  # Same as the app: profile uses the loan being compared
+
+    old_regime = row.get("old_tax_regime")
+    return {
+        "id": row.get("id"),
+        "loan_amount": loan_amount,
+        "tenure_months": tenure_years * 12,
+        "banks": banks,
+        "tax_slab": _number(row, "tax_slab", 30),
+        "old_tax_regime": True if old_regime in (None, "") else _flag(old_regime),
+        "property_type": row.get("property_type") or "Self-Occupied",
+        "annual_prepayment": _number(row, "annual_prepayment", 0),
+        "prepayment_month": prepayment_month,
+        "surplus_amount": _number(row, "surplus_amount", 0),
+        "monthly_surplus": _number(row, "monthly_surplus", 0),
+        "profile": profile
+    }
+
+
+def _terms(loan_type, bank_names, profile):
+    """Bank terms for one loan type, with personalized rates when a profile is given"""
+    banks = [_bank_data()[loan_type][bank_name] for bank_name in bank_names]
+    if not profile:
+        return [loan_terms(bank) for bank in banks]
+    custom_rates = personalized_rates([bank["base_rate"] for bank in banks], [profile])[0].tolist()
+    return [loan_terms(bank, custom_rate) for bank, custom_rate in zip(banks, custom_rates)]
+
+
+def evaluate_scenario(scenario):
+    """
+    Evaluate one scenario for every requested bank with the same calculations the app uses
+
+    Args:
+        scenario (dict): Normalized scenario from parse_scenario
+
+    Returns:
+        list: One output record per bank
+    """
+    bank_data = _bank_data()
+    banks = scenario["banks"] or list(bank_data[REGULAR]) + list(bank_data[OVERDRAFT])
+    unknown = [bank for bank in banks if bank not in bank_data[REGULAR] and bank not in bank_data[OVERDRAFT]]
+    if unknown:
+        raise ValueError(f"Unknown bank(s): {', '.join(unknown)}")
+
+    regular_banks = [bank for bank in banks if bank in bank_data[REGULAR]]
+    od_banks = [bank for bank in banks if bank in bank_data[OVERDRAFT]]
+    amount = scenario["loan_amount"]
+    tenure = scenario["tenure_months"]
+    tax = (scenario["tax_slab"], scenario["old_tax_regime"], scenario["property_type"])
+
+    records = []
+    if regular_banks:
+        results = evaluate_regular_scenarios(
+            amount, _terms(REGULAR, regular_banks, scenario["profile"]), tenure, *tax,
+            scenario["annual_prepayment"], scenario["prepayment_month"]
+        )
+        records += [(REGULAR, bank, result) for bank, result in zip(regular_banks, results)]
+    if od_banks:
+        results = overdraft_scenario_results(
+            amount, _terms(OVERDRAFT, od_banks, scenario["profile"]), tenure,
+            scenario["surplus_amount"], scenario["monthly_surplus"], *tax
+        )
+        records += [(OVERDRAFT, bank, result) for bank, result in zip(od_banks, results)]
+
+    return [
+        {"id": scenario["id"], "loan_type": loan_type, "bank": bank,
+         **{key: value for key, value in result.items() if key in OUTPUT_FIELDS}}
+        for loan_type, bank, result in records
+    ]
+
+
+def evaluate_chunk(rows):
+    """Evaluate a chunk of (row number, raw row) pairs; bad rows become error records"""
+    records = []
+    for number, row in rows:
+        if isinstance(row, UnreadableRow):
+            records.append({"id": number, "error": row.error})
+            continue
+        try:
+            scenario = parse_scenario(row)
+            if scenario["id"] is None:
+                scenario["id"] = number
+            records += evaluate_scenario(scenario)
+        except (KeyError, TypeError, ValueError) as e:
+            records.append({"id": row.get("id", number) if isinstance(row, dict) else number, "error": str(e)})
+    return records
+
+
+class ResultWriter:
+    """Write output records incrementally as JSONL or CSV"""
+
+    def __init__(self, path):
+        self._file = open(path, 'w', encoding='utf-8', newline='') if path != '-' else sys.stdout
+        self._csv = None
+        if path.lower().endswith('.csv'):
+            self._csv = csv.DictWriter(self._file, fieldnames=OUTPUT_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, records):
+        for record in records:
+            if self._csv:
+                self._csv.writerow(record)
+            else:
+                self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+def run_batch(input_path, output_path, workers=None, chunk_size=500):
+    """
+    Evaluate every scenario in input_path and stream the results to output_path
+
+    Chunks are evaluated on a process pool (in-process when workers is 1). At
+    most two chunks per worker are in flight at a time, and results are written
+    in input order as soon as they are ready.
+
+    Args:
+        input_path (str): JSONL or CSV scenario file
+        output_path (str): JSONL or CSV result file ("-" for stdout)
+        workers (int, optional): Worker processes (default: CPU count)
+        chunk_size (int): Scenarios per task sent to a worker
+
+    Returns:
+        dict: {
+            'scenarios': int,
+            'results': int (output rows written),
+            'errors': int,
+            'seconds': float,
+            'rows_per_sec': float (scenarios per second)
+        }
+    """
+    workers = workers or os.cpu_count() or 1
+    rows = enumerate(read_scenarios(input_path), start=1)
+    chunks = iter(lambda: list(itertools.islice(rows, chunk_size)), [])
+    writer = ResultWriter(output_path)
+    stats = {"scenarios": 0, "results": 0, "errors": 0}
+
+    def record(chunk, records):
+        writer.write(records)
+        stats["scenarios"] += len(chunk)
+        stats["results"] += len(records)
+        stats["errors"] += sum(1 for item in records if "error" in item)
+
+    start = time.perf_counter()
+    try:
+        if workers == 1:
+            for chunk in chunks:
+                record(chunk, evaluate_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append((chunk, pool.submit(evaluate_chunk, chunk)))
+                    if len(pending) >= 2 * workers:
+                        done, future = pending.popleft()
+                        record(done, future.result())
+                while pending:
+                    done, future = pending.popleft()
+                    record(done, future.result())
+    finally:
+        writer.close()
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["rows_per_sec"] = stats["scenarios"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate home loan scenarios from a JSONL or CSV file")
+    parser.add_argument("input", help="Scenario file (.jsonl or .csv)")
+    parser.add_argument("-o", "--output", default="-", help="Result file (.jsonl or .csv, default: JSONL to stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=500, help="Scenarios per worker task")
+    args = parser.parse_args(argv)
+
+    stats = run_batch(args.input, args.output, args.workers, args.chunk_size)
+    print(f"Evaluated {stats['scenarios']:,} scenarios ({stats['results']:,} result rows, "
+          f"{stats['errors']:,} errors) in {stats['seconds']:.2f}s - {stats['rows_per_sec']:,.0f} rows/sec",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Loan Engine - Headless home loan calculations usable without Streamlit
+
+Depends only on the standard library and NumPy, and takes bank terms as
+explicit arguments (see engine.loans), so batch jobs, notebooks and tests can
+import it directly:
+
+    from engine import loan_terms, regular_home_loan
+
+Submodules are loaded on first use, so importing the package itself is
+cheap and NumPy is only imported once a calculation is requested.
+"""
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "BALANCE_EPSILON": "amortization",
+    "RESET_POLICIES": "amortization",
+    "MAX_TENURE_MONTHS": "amortization",
+    "calculate_emi": "amortization",
+    "annuity_balances": "amortization",
+    "annuity_factors": "amortization",
+    "amortize_regular": "amortization",
+    "amortize_regular_batch": "amortization",
+    "amortize_regular_reference": "amortization",
+    "amortize_regular_yearly": "amortization",
+    "amortize_regular_yearly_batch": "amortization",
+    "yearly_totals": "amortization",
+    "chained_balances": "amortization",
+    "amortize_floating": "amortization",
+    "segment_balances": "amortization",
+    "amortize_rate_resets": "amortization",
+    "amortize_rate_resets_batch": "amortization",
+    "simulate_overdraft_batch": "overdraft",
+    "simulate_overdraft_reference": "overdraft",
+    "simulate_overdraft_floating": "overdraft",
+    "simulate_overdraft_rate_resets": "overdraft",
+    "simulate_overdraft_rate_resets_batch": "overdraft",
+    "simulate_overdraft_daily": "overdraft",
+    "simulate_overdraft_daily_batch": "overdraft",
+    "daily_flows": "overdraft",
+    "DAYS_IN_MONTH": "overdraft",
+    "MONTH_LENGTHS": "overdraft",
+    "month_days": "overdraft",
+    "find_break_even": "break_even",
+    "ScenarioCache": "scenario_cache",
+    "SCENARIO_CACHE": "scenario_cache",
+    "memoize_scenario": "scenario_cache",
+    "SCHEDULE_CACHE": "scenario_cache",
+    "loan_terms": "loans",
+    "regular_schedule": "loans",
+    "regular_yearly": "loans",
+    "regular_schedule_tax": "loans",
+    "evaluate_regular_scenarios": "loans",
+    "regular_home_loan": "loans",
+    "overdraft_schedule": "loans",
+    "overdraft_yearly": "loans",
+    "overdraft_schedule_tax": "loans",
+    "evaluate_overdraft_scenarios": "loans",
+    "overdraft_scenario_results": "loans",
+    "overdraft_home_loan": "loans",
+    "overdraft_net_costs": "loans",
+    "find_break_even_surplus": "loans",
+    "sweep_overdraft_surplus": "loans",
+    "loan_processing_fees": "loans",
+    "regular_tax_benefit": "loans",
+    "overdraft_tax_benefit": "loans",
+    "TAX_REGIMES": "tax",
+    "PROPERTY_TYPES": "tax",
+    "SECTION_80C_LIMIT": "tax",
+    "SECTION_24B_LIMIT": "tax",
+    "deduction_limits": "tax",
+    "tax_benefit": "tax",
+    "tax_benefits": "tax",
+    "generate_rate_shifts": "monte_carlo",
+    "monte_carlo_comparison": "monte_carlo",
+    "floating_rate_paths": "monte_carlo",
+    "PATH_CACHE": "monte_carlo",
+    "generate_withdrawals": "withdrawals",
+    "simulate_overdraft_withdrawals": "withdrawals",
+    "overdraft_withdrawal_risk": "withdrawals",
+    "SENSITIVITY_DELTAS": "sensitivity",
+    "sensitivity_analysis": "sensitivity",
+    "savings_grid": "sensitivity",
+    "savings_grid_interest": "sensitivity",
+    "profile_sweep": "profile_sweep",
+    "RegularLoanResult": "results",
+    "OverdraftLoanResult": "results",
+    "SCHEDULE_COLUMNS": "schedule_view",
+    "PARQUET_AVAILABLE": "schedule_view",
+    "ScheduleView": "schedule_view",
+    "regular_schedule_view": "schedule_view",
+    "overdraft_schedule_view": "schedule_view",
+    "ScheduleRow": "schedule_view",
+    "iter_regular_schedule": "schedule_view",
+    "iter_overdraft_schedule": "schedule_view",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,694 @@
+"""
+Amortization Engine - Build home loan EMI schedules as NumPy arrays
+"""
+import math
+
+import numpy as np
+
+# Outstanding below this is treated as fully repaid (handles floating point precision)
+BALANCE_EPSILON = 0.01
+
+# What the bank does when the rate changes: recalculate the EMI over the remaining
+# tenure, or keep the EMI and let the tenure move instead
+RESET_POLICIES = ("recompute_emi", "extend_tenure")
+
+# Longest tenure banks allow; with "extend_tenure" the EMI goes up once this would be exceeded
+MAX_TENURE_MONTHS = 360
+
+
+def calculate_emi(principal, annual_rate, months):
+    """Calculate EMI for home loan"""
+    monthly_rate = annual_rate / (12 * 100)
+    if monthly_rate == 0:
+        return principal / months
+    growth = (1 + monthly_rate) ** months
+    emi = principal * monthly_rate * growth / (growth - 1)
+    return emi
+
+
+def _safe_rates(monthly_rate):
+    """Split out zero rates, substituting a dummy rate so closed forms stay finite"""
+    interest_free = monthly_rate == 0
+    if interest_free.any():
+        return interest_free, np.where(interest_free, 1.0, monthly_rate)
+    return None, monthly_rate
+
+
+def annuity_balances(balance, payment, monthly_rate, months_elapsed):
+    """
+    Closed-form balance after `months_elapsed` monthly payments (broadcasts over banks and months)
+
+    Solves B' = B * (1 + r) - payment, i.e. B_k = (B - payment/r) * (1 + r)^k + payment/r
+    """
+    interest_free, monthly_rate = _safe_rates(monthly_rate)
+    payoff = payment / monthly_rate
+    balances = (balance - payoff) * np.exp(months_elapsed * np.log1p(monthly_rate)) + payoff
+    if interest_free is None:
+        return balances
+    return np.where(interest_free, balance - payment * months_elapsed, balances)
+
+
+def annuity_factors(monthly_rate, months):
+    """EMI per rupee of principal repaid over `months` months (broadcasts over rates and tenures)"""
+    interest_free, safe_rate = _safe_rates(monthly_rate)
+    growth = np.exp(months * np.log1p(safe_rate))
+    factors = safe_rate * growth / (growth - 1)
+    if interest_free is None:
+        return factors
+    return np.where(interest_free, 1 / months, factors)
+
+
+def chained_balances(balance, factors, payments):
+    """
+    Opening balance of every month when both the growth factor and the payment change monthly
+
+    Solves X' = X * f_t - p_t in closed form: X_t = F_t * (X_0 - sum_{j<t} p_j / F_{j+1})
+    with F_t = f_0 * ... * f_{t-1}, so all rows (e.g. rate paths) are evaluated at once.
+
+    Args:
+        balance (float or np.ndarray): Opening balance X_0 (scalar or one per row, shape (rows, 1))
+        factors (np.ndarray): Growth factor f_t per month (months on the last axis)
+        payments (float or np.ndarray): Amount p_t taken off after month t's growth (broadcasts with factors)
+
+    Returns:
+        np.ndarray: X_0 ... X_{months-1}, months on the last axis
+    """
+    factors, payments = np.broadcast_arrays(factors, payments)
+    ones = np.ones(factors.shape[:-1] + (1,))
+    growth = np.concatenate([ones, np.cumprod(factors[..., :-1], axis=-1)], axis=-1)
+    discounted = np.cumsum(payments[..., :-1] / growth[..., 1:], axis=-1)
+    return growth * (balance - np.concatenate([0 * ones, discounted], axis=-1))
+
+
+def _prepayment_segments(amount, monthly_rate, tenure, annual_prepay, prepay_month):
+    """
+    Split every bank's loan into constant-EMI segments between annual prepayment events
+
+    An EMI sized to clear the balance over the remaining tenure leaves a fixed share
+    `keep` of it outstanding after each segment, so the balance due before prepayment k
+    solves X_k = keep_k * (X_{k-1} - prepayment). That recurrence has a closed form in
+    cumulative products, which evaluates every bank and event at once.
+
+    Args:
+        amount (float): Loan amount
+        monthly_rate (np.ndarray): Monthly rate per bank, shape (banks, 1)
+        tenure (int or np.ndarray): Tenure in months (or one per bank, shape (banks, 1))
+        annual_prepay (float or np.ndarray): Prepayment made once every year (or one per bank, shape (banks, 1))
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+
+    Returns:
+        tuple: (starts, balances, emis, prepayments, closing) where segment s runs from
+        month starts[s] with opening balance balances[:, s] and EMI emis[:, s],
+        prepayments[:, k] is paid in month starts[k + 1], and closing is the index of the
+        event whose prepayment repays each bank's loan (number of events if none does).
+        Segments after a bank's closing event have zero balance and EMI. With one
+        tenure per bank, events run up to the longest tenure and the values of
+        segments past a bank's own tenure are meaningless.
+    """
+    if prepay_month < 1:
+        raise ValueError(f"Prepayment month must be 1-12, got {prepay_month}")
+
+    banks = len(monthly_rate)
+    events = np.arange(prepay_month, np.max(tenure), 12) if np.any(np.asarray(annual_prepay) > 0) else np.arange(0)
+    starts = np.append(0, events)
+    remaining = np.maximum(tenure - starts, 1)  # Segments past a bank's tenure get a dummy length
+    lengths = events - starts[:-1]
+
+    emi_factor = annuity_factors(monthly_rate, remaining)
+    if not len(events):
+        return starts, np.full((banks, 1), float(amount)), amount * emi_factor, np.zeros((banks, 0)), np.zeros(banks, dtype=int)
+
+    interest_free, safe_rate = _safe_rates(monthly_rate)
+    log_growth = np.log1p(safe_rate)
+    growth_remaining = np.exp(remaining[..., :-1] * log_growth)
+    keep = (growth_remaining - np.exp(lengths * log_growth)) / (growth_remaining - 1)
+    if interest_free is not None:
+        keep = np.where(interest_free, 1 - lengths / remaining[..., :-1], keep)
+    if np.ndim(tenure):
+        keep = np.where(events < tenure, keep, 1.0)  # Events past a bank's tenure never happen
+
+    # X_k = scale_k * (amount - prepayment * sum_{j<k} 1/scale_j) with scale_k = keep_0 ... keep_k
+    scale = np.cumprod(keep, axis=1)
+    inverse_scale = 1 / scale
+    due = scale * (amount - annual_prepay * (np.cumsum(inverse_scale, axis=1) - inverse_scale))
+    after = due - annual_prepay
+
+    # A prepayment that clears the balance closes the loan in that event month
+    closes = np.hstack([(after <= BALANCE_EPSILON) | (events >= tenure), np.ones((banks, 1), dtype=bool)])
+    closing = closes.argmax(axis=1)
+    event_index = np.arange(len(events))
+
+    prepayments = np.where((event_index <= closing[:, None]) & (events < tenure), np.minimum(annual_prepay, due), 0.0)
+    balances = np.hstack([np.full((banks, 1), float(amount)),
+                          np.where(event_index < closing[:, None], after, 0.0)])
+    emis = balances * emi_factor
+
+    return starts, balances, emis, prepayments, closing
+
+
+def amortize_regular_batch(amount, annual_rates, tenure, annual_prepay=0, prepay_month=12):
+    """
+    Build monthly EMI schedules for several interest rates at once as (banks x months) arrays
+
+    Without prepayments this is the closed-form annuity. With prepayments the
+    loan is evaluated segment by segment between prepayment events, and every
+    month of every segment of every bank is filled in with a single broadcast
+    pass. Rows of banks whose loan closes early are zero after the closing month.
+
+    Args:
+        amount (float): Loan amount
+        annual_rates (array-like): Interest rate in % p.a. for each bank
+        tenure (int or np.ndarray): Tenure in months (or one per bank, shape (banks, 1))
+        annual_prepay (float or np.ndarray): Prepayment made once every year (or one per bank, shape (banks, 1))
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+
+    With one tenure per bank the arrays are as wide as the longest tenure, and
+    every row is zero after its own loan closes.
+
+    Returns:
+        dict: {
+            'interest', 'principal', 'prepayment', 'outstanding': np.ndarray (banks x months),
+            'emi': np.ndarray (original EMI per bank),
+            'final_emi': np.ndarray (EMI after last prepayment per bank),
+            'months': np.ndarray (actual tenure in months per bank)
+        }
+    """
+    monthly_rate = (np.asarray(annual_rates, dtype=float) / (12 * 100))[:, None]
+    starts, balances, emis, prepayments, closing = _prepayment_segments(
+        amount, monthly_rate, tenure, annual_prepay, prepay_month
+    )
+
+    width = int(np.max(tenure))
+    if len(starts) == 1:
+        months_into_segment = np.arange(width, dtype=float)
+        seg_balance, seg_emi = balances, emis
+    else:
+        segment = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, width)))
+        months_into_segment = np.arange(width) - starts[segment]
+        seg_balance = balances[:, segment]
+        seg_emi = emis[:, segment]
+
+    # Within a segment the opening balance is the annuity balance of that segment
+    opening = annuity_balances(seg_balance, seg_emi, monthly_rate, months_into_segment)
+
+    interest = opening * monthly_rate
+    principal = np.minimum(seg_emi - interest, opening)
+
+    prepayment = np.zeros_like(interest)
+    prepayment[:, starts[1:] - 1] = prepayments
+    outstanding = opening - principal - prepayment
+
+    # Stop at the first month each loan is fully repaid (or its tenure ends)
+    closed = outstanding < BALANCE_EPSILON
+    months = np.where(closed.any(axis=1), closed.argmax(axis=1) + 1, width)
+    if np.ndim(tenure):
+        months = np.minimum(months, tenure[:, 0])
+    if months.min() < width:
+        inactive = np.arange(width) >= months[:, None]
+        for values in (interest, principal, prepayment, outstanding):
+            values[inactive] = 0.0
+
+    return {
+        "interest": interest,
+        "principal": principal,
+        "prepayment": prepayment,
+        "outstanding": outstanding,
+        "emi": emis[:, 0],
+        "final_emi": emis[np.arange(len(emis)), closing],
+        "months": months
+    }
+
+
+def amortize_regular(amount, annual_rate, tenure, annual_prepay=0, prepay_month=12):
+    """
+    Build the full monthly schedule for an EMI loan with optional annual prepayment
+
+    Args:
+        amount (float): Loan amount
+        annual_rate (float): Interest rate in % p.a.
+        tenure (int): Tenure in months
+        annual_prepay (float): Prepayment made once every year
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+
+    Returns:
+        dict: Same keys as amortize_regular_batch, with per-month arrays cut at the
+        actual tenure and scalars for 'emi', 'final_emi' and 'months'
+    """
+    batch = amortize_regular_batch(amount, [annual_rate], tenure, annual_prepay, prepay_month)
+    months = int(batch["months"][0])
+
+    return {
+        "interest": batch["interest"][0, :months],
+        "principal": batch["principal"][0, :months],
+        "prepayment": batch["prepayment"][0, :months],
+        "outstanding": batch["outstanding"][0, :months],
+        "emi": float(batch["emi"][0]),
+        "final_emi": float(batch["final_emi"][0]),
+        "months": months
+    }
+
+
+def amortize_regular_reference(amount, annual_rate, tenure, annual_prepay=0, prepay_month=12):
+    """
+    Month-by-month EMI schedule kept as the reference for the regular loan engines
+
+    This is the original loop the app used before the NumPy engine. It is slow
+    but obviously correct, so use it to check amortize_regular_batch,
+    amortize_regular_yearly and amortize_regular_yearly_batch after changes.
+
+    Returns:
+        dict: Same keys as amortize_regular, with per-month lists
+    """
+    monthly_rate = annual_rate / (12 * 100)
+    emi = current_emi = calculate_emi(amount, annual_rate, tenure)
+
+    outstanding = amount
+    monthly = {"interest": [], "principal": [], "prepayment": [], "outstanding": []}
+    month = 0
+
+    while outstanding > BALANCE_EPSILON and month < tenure:
+        month += 1
+        interest_component = outstanding * monthly_rate
+        principal_component = min(current_emi - interest_component, outstanding)
+        outstanding -= principal_component
+
+        # Annual prepayment, then the EMI is recalculated over the remaining tenure
+        prepayment = 0.0
+        if (month - 1) % 12 + 1 == prepay_month and annual_prepay > 0 and outstanding > BALANCE_EPSILON:
+            prepayment = min(annual_prepay, outstanding)
+            outstanding -= prepayment
+            if outstanding > BALANCE_EPSILON and tenure - month > 0:
+                current_emi = calculate_emi(outstanding, annual_rate, tenure - month)
+
+        monthly["interest"].append(interest_component)
+        monthly["principal"].append(principal_component)
+        monthly["prepayment"].append(prepayment)
+        monthly["outstanding"].append(outstanding)
+
+    return {**monthly, "emi": emi, "final_emi": current_emi, "months": month}
+
+
+def amortize_floating(amount, annual_rates, tenure, annual_prepay=0, prepay_month=12):
+    """
+    Build EMI schedules for floating-rate loans where the rate can change every month
+
+    The EMI is recomputed each month to clear the balance over the remaining tenure,
+    so it only actually moves when the rate (or a prepayment) changes, and every
+    loan still closes on time. With a constant rate this matches amortize_regular_batch.
+
+    Args:
+        amount (float): Loan amount
+        annual_rates (np.ndarray): Interest rate in % p.a. per month, shape (paths, months)
+        tenure (int): Tenure in months
+        annual_prepay (float): Prepayment made once every year
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+
+    Returns:
+        dict: {
+            'interest', 'principal', 'prepayment', 'emi': np.ndarray (paths x months, zero after closure),
+            'months': np.ndarray (actual tenure in months per path)
+        }
+    """
+    monthly_rate = np.asarray(annual_rates, dtype=float) / (12 * 100)
+    emi_factor = annuity_factors(monthly_rate, tenure - np.arange(tenure))
+
+    prepayment_due = np.zeros(tenure)
+    if annual_prepay > 0:
+        prepayment_due[np.arange(prepay_month, tenure, 12) - 1] = annual_prepay
+
+    # After the EMI a share `keep` of the balance is left, then the prepayment comes off
+    opening = chained_balances(float(amount), 1 + monthly_rate - emi_factor, prepayment_due)
+    interest = opening * monthly_rate
+    emi = opening * emi_factor
+    principal = emi - interest
+
+    prepayment = np.minimum(prepayment_due, opening - principal)
+    outstanding = opening - principal - prepayment
+
+    # Stop at the first month each loan is fully repaid
+    closed = outstanding < BALANCE_EPSILON
+    months = np.where(closed.any(axis=-1), closed.argmax(axis=-1) + 1, tenure)
+    if months.min() < tenure:
+        inactive = np.arange(tenure) >= months[..., None]
+        for values in (interest, principal, prepayment, emi):
+            values[inactive] = 0.0
+
+    return {
+        "interest": interest,
+        "principal": principal,
+        "prepayment": prepayment,
+        "emi": emi,
+        "months": months
+    }
+
+
+def _annuity_balance(balance, payment, monthly_rate, months):
+    """Scalar annuity_balances for walking one loan's segments without NumPy overhead"""
+    if monthly_rate == 0:
+        return balance - payment * months
+    payoff = payment / monthly_rate
+    return (balance - payoff) * (1 + monthly_rate) ** months + payoff
+
+
+def _months_below(balance, payment, monthly_rate, months):
+    """First of `months` payments after which the balance is below BALANCE_EPSILON (the balance falls every month)"""
+    if _annuity_balance(balance, payment, monthly_rate, months - 1) >= BALANCE_EPSILON:
+        return months
+    low, high = 1, months - 1
+    while low < high:
+        middle = (low + high) // 2
+        if _annuity_balance(balance, payment, monthly_rate, middle) < BALANCE_EPSILON:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def _payoff_months(balance, payment, monthly_rate):
+    """Whole months a fixed payment needs to clear the balance (inf if it does not cover the interest)"""
+    if payment <= balance * monthly_rate:
+        return math.inf
+    if monthly_rate == 0:
+        months = balance / payment
+    else:
+        months = -math.log1p(-balance * monthly_rate / payment) / math.log1p(monthly_rate)
+    return max(1, math.ceil(months - 1e-9))
+
+
+def _emi_factor(monthly_rate, months):
+    """Scalar annuity_factors"""
+    if monthly_rate == 0:
+        return 1 / months
+    growth = (1 + monthly_rate) ** months
+    return monthly_rate * growth / (growth - 1)
+
+
+def amortize_regular_yearly(amount, annual_rate, tenure, annual_prepay=0, prepay_month=12):
+    """
+    Loan-year totals of an EMI loan with optional annual prepayment, without the monthly schedule
+
+    Walks the loan one constant-EMI segment at a time between prepayments (as
+    amortize_rate_resets does) and each loan year of a segment in closed form:
+    the principal repaid is the drop in the annuity balance and the interest is
+    the rest of the EMIs. A 30-year loan is about 30 steps instead of 360 months.
+    Totals agree with amortize_regular to rounding.
+
+    Args:
+        amount (float): Loan amount
+        annual_rate (float): Interest rate in % p.a.
+        tenure (int): Tenure in months
+        annual_prepay (float): Prepayment made once every year
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+
+    Returns:
+        dict: {
+            'yearly_principal', 'yearly_interest', 'yearly_prepayment': list (per loan year, zero after closure),
+            'emi': float (original EMI), 'final_emi': float (EMI after last prepayment),
+            'months': int (actual tenure in months)
+        }
+    """
+    if prepay_month < 1:
+        raise ValueError(f"Prepayment month must be 1-12, got {prepay_month}")
+
+    monthly_rate = annual_rate / (12 * 100)
+    growth = 1 + monthly_rate
+    growths = [growth ** months for months in range(13)]
+    years = -(-tenure // 12)
+    yearly_principal = [0.0] * years
+    yearly_interest = [0.0] * years
+    yearly_prepayment = [0.0] * years
+
+    # Stretches end at every year end and every prepayment, whichever comes first
+    prepay_phase = prepay_month % 12 if annual_prepay > 0 else None
+    stops = list(range(12, tenure, 12))
+    if prepay_phase:
+        stops = sorted(stops + list(range(prepay_month, tenure, 12)))
+    stops.append(tenure)
+
+    # With B' = (B - payoff) * (1 + r)^months + payoff, the EMI clearing B over n months
+    # is r * payoff with payoff = B * (1 + r)^n / ((1 + r)^n - 1)
+    balance = float(amount)
+    remaining_growth = growth ** tenure
+    emi = first_emi = balance * _emi_factor(monthly_rate, tenure)
+    payoff = emi / monthly_rate if monthly_rate else 0.0
+    months = tenure
+    start = 0
+
+    for stop in stops:
+        length = stop - start
+        closing = (balance - payoff) * growths[length] + payoff if monthly_rate else balance - emi * length
+        if closing < BALANCE_EPSILON:
+            # Repaid within this stretch: the loan closes in the first month the balance is below epsilon
+            length = _months_below(balance, emi, monthly_rate, length)
+            closing = _annuity_balance(balance, emi, monthly_rate, length)
+            months = stop = start + length
+
+        year = start // 12
+        repaid = balance - closing
+        yearly_principal[year] += repaid
+        yearly_interest[year] += emi * length - repaid
+        balance, start = closing, stop
+        remaining_growth /= growths[length]
+
+        if stop == months:
+            break
+        if stop % 12 == prepay_phase:
+            prepayment = annual_prepay if annual_prepay < balance else balance
+            yearly_prepayment[year] += prepayment
+            balance -= prepayment
+            if balance < BALANCE_EPSILON:
+                months = stop
+                break
+            # New EMI over the remaining tenure
+            if monthly_rate:
+                payoff = balance * remaining_growth / (remaining_growth - 1)
+                emi = payoff * monthly_rate
+            else:
+                emi = balance / (tenure - stop)
+
+    return {
+        "yearly_principal": yearly_principal,
+        "yearly_interest": yearly_interest,
+        "yearly_prepayment": yearly_prepayment,
+        "emi": first_emi,
+        "final_emi": emi,
+        "months": months
+    }
+
+
+def amortize_regular_yearly_batch(amount, annual_rates, tenure, annual_prepay=0, prepay_month=12):
+    """
+    Loan-year totals of EMI loans at several interest rates, as one array pass over all banks
+
+    Batched form of amortize_regular_yearly: the constant-EMI segments between
+    prepayments come from _prepayment_segments, and every stretch between a year
+    end and a prepayment is evaluated in closed form for every bank at once, so
+    the cost barely grows with the number of banks. For a bank or two the scalar
+    walk is cheaper (NumPy's per-call overhead dominates such small arrays).
+
+    Args:
+        amount (float): Loan amount
+        annual_rates (array-like): Interest rate in % p.a. for each bank
+        tenure (int): Tenure in months
+        annual_prepay (float): Prepayment made once every year
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+
+    Returns:
+        dict: {
+            'yearly_principal', 'yearly_interest', 'yearly_prepayment': np.ndarray (banks x years, zero after closure),
+            'emi', 'final_emi': np.ndarray (per bank), 'months': np.ndarray (actual tenure in months per bank)
+        }
+    """
+    annual_rates = np.asarray(annual_rates, dtype=float)
+    monthly_rate = (annual_rates / (12 * 100))[:, None]
+    starts, balances, emis, prepayments, closing = _prepayment_segments(
+        amount, monthly_rate, tenure, annual_prepay, prepay_month
+    )
+
+    # Stretches open at the loan start, every year end and every prepayment
+    opens = np.union1d(np.arange(0, tenure, 12), starts)
+    stops = np.append(opens[1:], tenure)
+    segment = np.searchsorted(starts, opens, side="right") - 1
+    seg_balance, seg_emi, seg_start = balances[:, segment], emis[:, segment], starts[segment]
+
+    # Segments after a bank's closing event have zero balance and EMI, so they add nothing
+    closing_balance = annuity_balances(seg_balance, seg_emi, monthly_rate, stops - seg_start)
+    opening_balance = np.where(opens == seg_start, seg_balance,
+                               annuity_balances(seg_balance, seg_emi, monthly_rate, opens - seg_start))
+    repaid = opening_balance - closing_balance
+    interest = seg_emi * (stops - opens) - repaid
+
+    year_starts = np.flatnonzero(opens % 12 == 0)
+    yearly_principal = np.add.reduceat(repaid, year_starts, axis=1)
+    yearly_interest = np.add.reduceat(interest, year_starts, axis=1)
+    yearly_prepayment = np.zeros_like(yearly_principal)
+    yearly_prepayment[:, (starts[1:] - 1) // 12] = prepayments
+
+    events = len(starts) - 1
+    months = np.where(closing < events, starts[np.minimum(closing + 1, events)], tenure)
+    result = {
+        "yearly_principal": yearly_principal,
+        "yearly_interest": yearly_interest,
+        "yearly_prepayment": yearly_prepayment,
+        "emi": emis[:, 0],
+        "final_emi": emis[np.arange(len(emis)), closing],
+        "months": months
+    }
+
+    # A balance can only dip below BALANCE_EPSILON before a segment's last month when
+    # it is tiny to begin with; such loans close early and are walked one at a time
+    ends = np.append(starts[1:], tenure)
+    last_month = annuity_balances(balances, emis, monthly_rate, ends - starts - 1)
+    active = np.arange(len(starts)) <= closing[:, None]
+    for bank in np.flatnonzero(((last_month < BALANCE_EPSILON) & active).any(axis=1)):
+        loan = amortize_regular_yearly(amount, float(annual_rates[bank]), tenure, annual_prepay, prepay_month)
+        for key, values in result.items():
+            values[bank] = loan[key]
+    return result
+
+
+def segment_balances(openings, starts, payments, monthly_rates, months):
+    """
+    Opening balance of every month for a loan made of constant-rate, constant-payment segments
+
+    Args:
+        openings (array-like): Opening balance of each segment
+        starts (array-like): First month (0-based) of each segment, ascending from 0
+        payments (array-like): Monthly payment in each segment
+        monthly_rates (array-like): Monthly rate in each segment
+        months (int): Total months to fill
+
+    Returns:
+        tuple: (balances, segment) where balances[t] is month t's opening balance and
+        segment[t] is the index of the segment month t falls in
+    """
+    starts = np.asarray(starts)
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, months)))
+    balances = annuity_balances(np.asarray(openings, dtype=float)[segment], np.asarray(payments, dtype=float)[segment],
+                                np.asarray(monthly_rates, dtype=float)[segment], np.arange(months) - starts[segment])
+    return balances, segment
+
+
+def amortize_rate_resets(amount, annual_rate, tenure, rate_events=(), policy="recompute_emi",
+                         annual_prepay=0, prepay_month=12):
+    """
+    Build the monthly schedule of a floating-rate EMI loan with rate changes at given months
+
+    The loan is walked one segment at a time between events (rate changes and
+    prepayments), each segment in closed form, then all months are filled in with
+    one broadcast pass, so the cost grows with the number of events, not months.
+
+    At every event the policy decides the new EMI:
+        "recompute_emi": recalculate the EMI to finish on the original tenure
+        "extend_tenure": keep the EMI and let the loan run shorter or longer, unless
+        it would then run past MAX_TENURE_MONTHS (or never finish), in which case
+        the EMI is raised just enough to finish by then
+
+    Args:
+        amount (float): Loan amount
+        annual_rate (float): Interest rate in % p.a. at the start
+        tenure (int): Tenure in months
+        rate_events (iterable): (month, new_rate) pairs; new_rate (% p.a.) applies from that month (1-based)
+        policy (str): One of RESET_POLICIES
+        annual_prepay (float): Prepayment made once every year
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+
+    Returns:
+        dict: Same keys as amortize_regular, plus 'monthly_emi' (EMI due each month) and
+        'segments' (dict of 'start', 'emi' and 'rate' (monthly) arrays, one per segment)
+    """
+    if policy not in RESET_POLICIES:
+        raise ValueError(f"Unknown rate reset policy: {policy}")
+
+    max_tenure = max(tenure, MAX_TENURE_MONTHS)
+    rate_changes = {int(month) - 1: new_rate / (12 * 100) for month, new_rate in sorted(rate_events) if month >= 1}
+    monthly_rate = rate_changes.pop(0, annual_rate / (12 * 100))
+    prepay_starts = set(range(prepay_month, max_tenure, 12)) if annual_prepay > 0 else set()
+
+    balance = float(amount)
+    emi = balance * _emi_factor(monthly_rate, tenure)
+    start = 0
+    starts, openings, emis, rates = [], [], [], []
+    prepayments = {}
+
+    for boundary in sorted(set(rate_changes) | prepay_starts) + [None]:
+        starts.append(start)
+        openings.append(balance)
+        emis.append(emi)
+        rates.append(monthly_rate)
+
+        if policy == "recompute_emi":
+            payoff = tenure
+        else:
+            payoff = start + _payoff_months(balance, emi, monthly_rate)
+        if boundary is None or payoff <= boundary:
+            horizon = payoff
+            break
+
+        balance = _annuity_balance(balance, emi, monthly_rate, boundary - start)
+        start = boundary
+
+        if boundary in prepay_starts:
+            prepayment = min(annual_prepay, balance)
+            prepayments[boundary - 1] = prepayment
+            balance -= prepayment
+            if balance < BALANCE_EPSILON:
+                horizon = boundary
+                break
+
+        monthly_rate = rate_changes.get(boundary, monthly_rate)
+        if policy == "recompute_emi":
+            emi = balance * _emi_factor(monthly_rate, tenure - start)
+        elif start + _payoff_months(balance, emi, monthly_rate) > max_tenure:
+            emi = balance * _emi_factor(monthly_rate, max_tenure - start)
+
+    opening, segment = segment_balances(openings, starts, emis, rates, horizon)
+    monthly_emi = np.asarray(emis)[segment]
+    interest = opening * np.asarray(rates)[segment]
+    principal = np.minimum(monthly_emi - interest, opening)
+
+    prepayment = np.zeros(horizon)
+    prepayment[list(prepayments)] = list(prepayments.values())
+    outstanding = opening - principal - prepayment
+
+    closed = outstanding < BALANCE_EPSILON
+    months = int(closed.argmax()) + 1 if closed.any() else horizon
+
+    return {
+        "interest": interest[:months],
+        "principal": principal[:months],
+        "prepayment": prepayment[:months],
+        "outstanding": outstanding[:months],
+        "monthly_emi": monthly_emi[:months],
+        "emi": emis[0],
+        "final_emi": emis[-1],
+        "months": months,
+        "segments": {"start": np.asarray(starts), "emi": np.asarray(emis), "rate": np.asarray(rates)}
+    }
+
+
+def amortize_rate_resets_batch(amount, annual_rates, tenure, rate_events=(), policy="recompute_emi",
+                               annual_prepay=0, prepay_month=12):
+    """
+    amortize_rate_resets for several banks, padded into the (banks x months) layout of amortize_regular_batch
+
+    The same rate events apply to every bank. Rows are zero after each loan closes;
+    with "extend_tenure" the arrays can be wider than the tenure.
+    """
+    schedules = [amortize_rate_resets(amount, rate, tenure, rate_events, policy, annual_prepay, prepay_month)
+                 for rate in annual_rates]
+    width = max([tenure] + [schedule["months"] for schedule in schedules])
+
+    batch = {}
+    for key in ("interest", "principal", "prepayment", "outstanding"):
+        batch[key] = np.zeros((len(schedules), width))
+        for row, schedule in zip(batch[key], schedules):
+            row[:schedule["months"]] = schedule[key]
+    for key in ("emi", "final_emi", "months"):
+        batch[key] = np.array([schedule[key] for schedule in schedules])
+    return batch
+
+
+def yearly_totals(monthly_values):
+    """Sum monthly values into loan-year buckets (year 1 = months 1-12) along the last axis"""
+    return np.add.reduceat(monthly_values, np.arange(0, np.shape(monthly_values)[-1], 12), axis=-1)
@@ -0,0 +1,97 @@
+"""
+Break-even Solver - Find how much surplus the overdraft needs to beat the regular EMI loan
+"""
+import math
+import sys
+
+EPSILON = sys.float_info.epsilon
+
+
+def find_break_even(cost_fn, target, low, high, known=None, tolerance=1.0, max_evaluations=60):
+    """
+    Find the smallest x in [low, high] at which a falling cost drops to the target
+
+    Uses Brent's method (inverse quadratic / secant steps with bisection as the
+    safeguard, and a minimum step so both bracket ends keep closing in) on
+    cost_fn(x) - target. Every evaluated point is remembered, and
+    points already known from earlier work (e.g. a sweep curve) can be passed in
+    so they are never recomputed.
+
+    Args:
+        cost_fn (callable): Cost for a given x, non-increasing in x
+        target (float): Cost to reach (e.g. the regular loan's net cost)
+        low (float): Lower end of the search range
+        high (float): Upper end of the search range
+        known (dict, optional): Previously computed {x: cost} points to reuse
+        tolerance (float): Stop when the bracket is about this narrow
+        max_evaluations (int): Safety cap on cost_fn calls
+
+    Returns:
+        dict: {
+            'value': float or None (None if even x = high does not reach the target),
+            'evaluations': int (number of cost_fn calls made)
+        }
+    """
+    costs = dict(known or {})
+    evaluations = 0
+
+    def gap(x):
+        nonlocal evaluations
+        if x not in costs:
+            costs[x] = cost_fn(x)
+            evaluations += 1
+        return costs[x] - target
+
+    f_low = gap(low)
+    if f_low <= 0:
+        return {"value": float(low), "evaluations": evaluations}
+    f_high = gap(high)
+    if f_high > 0:
+        return {"value": None, "evaluations": evaluations}
+
+    # b is the best estimate and c the opposite end of the bracket; a is the previous b
+    a, fa, b, fb = low, f_low, high, f_high
+    c, fc = a, fa
+    d = e = b - a
+    while evaluations < max_evaluations:
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        # Smallest step worth taking: without it b creeps towards the root and c never moves
+        step_floor = 2 * EPSILON * abs(b) + tolerance / 2
+        half = (c - b) / 2
+        if abs(half) <= step_floor or fb == 0:
+            break
+
+        if abs(e) >= step_floor and abs(fa) > abs(fb):
+            # Secant (two points) or inverse quadratic interpolation (three)
+            s = fb / fa
+            if a == c:
+                p, q = 2 * half * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * half * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            # Fall back to bisection whenever the interpolated step is not trustworthy
+            if 2 * p < min(3 * half * q - abs(step_floor * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = half
+        else:
+            d = e = half
+
+        a, fa = b, fb
+        b += d if abs(d) > step_floor else math.copysign(step_floor, half)
+        fb = gap(b)
+
+    # Report the bracket end where the cost has actually reached the target (if the
+    # loop ran out of evaluations with b and c on one side, a is on the other)
+    value = b if fb <= 0 else c if fc <= 0 else a
+    return {"value": float(value), "evaluations": evaluations}
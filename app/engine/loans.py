@@ -0,0 +1,441 @@
+"""
+Loan Costs - Net cost of regular EMI and overdraft home loans from explicit bank terms
+
+Bank terms are plain dicts so this module never touches the app's BANK_DATA:
+    {
+        'interest_rate': float (% p.a.),
+        'processing_fee': float (% of loan amount, before GST),
+        'min_processing': float (minimum processing fee, before GST),
+        'od_charge': float (overdraft loans only: OD account opening charge)
+    }
+"""
+from types import MappingProxyType
+
+import numpy as np
+
+from .amortization import (amortize_regular_batch, amortize_regular_yearly, amortize_regular_yearly_batch,
+                           amortize_rate_resets_batch, yearly_totals)
+from .overdraft import simulate_overdraft_batch, simulate_overdraft_rate_resets_batch, simulate_overdraft_daily_batch
+from .break_even import find_break_even
+from .tax import tax_benefit
+from .results import RegularLoanResult, OverdraftLoanResult
+from .scenario_cache import memoize_scenario, freeze, SCHEDULE_CACHE
+
+# From this many banks on, fixed-rate yearly totals are one array pass over all banks
+# (amortize_regular_yearly_batch); below it the scalar walk per bank is cheaper
+YEARLY_BATCH_MIN_BANKS = 6
+
+
+def loan_terms(bank, custom_rate=None):
+    """
+    Pick the terms used by the cost calculations out of a bank's rate data
+
+    Args:
+        bank (dict): One bank's entry from the rate data (e.g. BANK_DATA[loan_type][bank_name])
+        custom_rate (float, optional): Interest rate to use instead of the bank's rate
+
+    Returns:
+        dict: Bank terms (see module docstring)
+    """
+    terms = {
+        # Interest rate (use custom rate if provided, otherwise use bank rate)
+        "interest_rate": custom_rate if custom_rate is not None else bank["interest_rate"],
+        "processing_fee": bank["processing_fee"],
+        "min_processing": bank["min_processing"]
+    }
+    if "od_charge" in bank:
+        terms["od_charge"] = bank["od_charge"]
+    return terms
+
+
+def loan_processing_fees(amount, terms):
+    """Processing fee of each bank including 18% GST"""
+    processing_fee_pct = np.array([term["processing_fee"] for term in terms])
+    min_processing = np.array([term["min_processing"] for term in terms])
+    return np.maximum(amount * processing_fee_pct / 100, min_processing) * 1.18  # With GST
+
+
+def regular_tax_benefit(yearly_principal, yearly_interest, tax_slab, old_regime, prop_type):
+    """
+    Total tax benefit of a regular home loan from its loan-year totals
+
+    Works on any leading shape (e.g. banks or rate paths) with years on the last axis.
+    Prepayments count towards the principal for Section 80C.
+    """
+    return tax_benefit(yearly_principal, yearly_interest, tax_slab, old_regime, prop_type)
+
+
+def overdraft_tax_benefit(yearly_interest, tax_slab, old_regime, prop_type):
+    """Total tax benefit of an overdraft home loan from its loan-year interest (years on the last axis)"""
+    # Note: OD deposits are NOT eligible for 80C deduction (important!)
+    return tax_benefit(None, yearly_interest, tax_slab, old_regime, prop_type, principal_eligible=False)
+
+
+@memoize_scenario(SCHEDULE_CACHE)
+def regular_schedule(amount, interest_rates, tenure, annual_prepay=0, prepay_month=12,
+                     rate_events=(), reset_policy="recompute_emi"):
+    """
+    Stage 1: every bank's month-by-month EMI schedule as (banks x months) arrays
+
+    Depends only on the loan itself, not on tax inputs or fees. See
+    amortize_regular_batch / amortize_rate_resets_batch for the returned keys.
+    """
+    if rate_events or reset_policy != "recompute_emi":
+        return amortize_rate_resets_batch(amount, interest_rates, tenure, rate_events, reset_policy,
+                                          annual_prepay, prepay_month)
+    return amortize_regular_batch(amount, interest_rates, tenure, annual_prepay, prepay_month)
+
+
+@memoize_scenario()
+def regular_yearly(amount, interest_rates, tenure, annual_prepay=0, prepay_month=12,
+                   rate_events=(), reset_policy="recompute_emi"):
+    """
+    Stage 2: loan-year totals and overall sums of every bank's loan
+
+    At a fixed rate the totals come straight from the closed-form yearly engines
+    (amortize_regular_yearly_batch for YEARLY_BATCH_MIN_BANKS banks or more, else
+    amortize_regular_yearly per bank), so the monthly regular_schedule stage is
+    only built when a schedule is asked for.
+    """
+    if not rate_events and reset_policy == "recompute_emi":
+        if len(interest_rates) >= YEARLY_BATCH_MIN_BANKS:
+            loan = amortize_regular_yearly_batch(amount, interest_rates, tenure, annual_prepay, prepay_month)
+        else:
+            loans = [amortize_regular_yearly(amount, rate, tenure, annual_prepay, prepay_month)
+                     for rate in interest_rates]
+            loan = {key: np.array([each[key] for each in loans]) for key in loans[0]}
+        return {
+            "yearly_principal": loan["yearly_principal"] + loan["yearly_prepayment"],
+            "yearly_interest": loan["yearly_interest"],
+            "total_interest": loan["yearly_interest"].sum(axis=1),
+            "total_principal_paid": loan["yearly_principal"].sum(axis=1),
+            "total_prepayments": loan["yearly_prepayment"].sum(axis=1),
+            "emi": loan["emi"],
+            "final_emi": loan["final_emi"],
+            "months": loan["months"]
+        }
+
+    schedule = regular_schedule(amount, interest_rates, tenure, annual_prepay, prepay_month,
+                                rate_events, reset_policy)
+    return {
+        # Prepayments count towards principal repaid in the year they are made
+        "yearly_principal": yearly_totals(schedule["principal"] + schedule["prepayment"]),
+        "yearly_interest": yearly_totals(schedule["interest"]),
+        "total_interest": schedule["interest"].sum(axis=1),
+        "total_principal_paid": schedule["principal"].sum(axis=1),
+        "total_prepayments": schedule["prepayment"].sum(axis=1),
+        "emi": schedule["emi"],
+        "final_emi": schedule["final_emi"],
+        "months": schedule["months"]
+    }
+
+
+@memoize_scenario()
+def regular_schedule_tax(amount, interest_rates, tenure, tax_slab, old_regime, prop_type, annual_prepay=0,
+                         prepay_month=12, rate_events=(), reset_policy="recompute_emi"):
+    """Stage 3: total tax benefit per bank from the regular_yearly stage"""
+    yearly = regular_yearly(amount, interest_rates, tenure, annual_prepay, prepay_month, rate_events, reset_policy)
+    return regular_tax_benefit(yearly["yearly_principal"], yearly["yearly_interest"], tax_slab, old_regime, prop_type)
+
+
+@memoize_scenario()
+def evaluate_regular_scenarios(amount, terms, tenure, tax_slab, old_regime, prop_type, annual_prepay=0, prepay_month=12,
+                               rate_events=(), reset_policy="recompute_emi"):
+    """
+    Calculate complete cost of a regular home loan for several sets of bank terms in one batched evaluation
+
+    Built on the cached regular_yearly stage, keyed by the loan inputs only, so
+    changing tax inputs or fees reuses the yearly totals. Tax benefit, fees and net
+    cost are recomputed from them directly: that is cheaper than another cache key
+    and lookup. The monthly schedule stage is only built when a result's schedule
+    is read. Memoized on the normalized inputs; the returned results are read-only.
+
+    Args:
+        amount (float): Loan amount
+        terms (list): Bank terms, one per bank
+        tenure (int): Tenure in months
+        tax_slab (float): Income tax slab in %
+        old_regime (bool): Whether the old tax regime applies
+        prop_type (str): "Self-Occupied" or "Let-Out"
+        annual_prepay (float): Prepayment made once every year
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+        rate_events (iterable): (month, new_rate) rate changes applied to every bank
+        reset_policy (str): "recompute_emi" or "extend_tenure" (see amortize_rate_resets)
+
+    Returns:
+        tuple: One RegularLoanResult per bank (reads like a dict; see engine.results)
+    """
+    interest_rates = [term["interest_rate"] for term in terms]
+    loan = (amount, interest_rates, tenure)
+    schedule_args = (annual_prepay, prepay_month, rate_events, reset_policy)
+
+    yearly = regular_yearly(*loan, *schedule_args)
+    total_tax_benefit = regular_tax_benefit(yearly["yearly_principal"], yearly["yearly_interest"],
+                                            tax_slab, old_regime, prop_type)
+
+    # Processing fee
+    processing_fees = loan_processing_fees(amount, terms)
+
+    total_interest = yearly["total_interest"]
+
+    # Calculate total payment
+    total_payment = yearly["total_principal_paid"] + total_interest
+
+    net_cost = total_interest + processing_fees - total_tax_benefit
+
+    # Every bank's result is a row of these shared arrays
+    batch = freeze({
+        "interest_rates": interest_rates,
+        "emi": yearly["emi"],
+        "final_emi": yearly["final_emi"],
+        "total_payment": total_payment,
+        "total_interest": total_interest,
+        "processing_fee": processing_fees,
+        "total_tax_benefit": total_tax_benefit,
+        "net_cost": net_cost,
+        "yearly_principal": yearly["yearly_principal"],
+        "yearly_interest": yearly["yearly_interest"],
+        "months": yearly["months"],
+        "total_prepayments": yearly["total_prepayments"],
+        "schedule": lambda: regular_schedule(*loan, *schedule_args),
+        "tax": (tax_slab, old_regime, prop_type, True)
+    })
+    return [RegularLoanResult(batch, i) for i in range(len(terms))]
+
+
+def regular_home_loan(amount, term, tenure, tax_slab, old_regime, prop_type, annual_prepay=0, prepay_month=12,
+                      rate_events=(), reset_policy="recompute_emi"):
+    """Calculate complete cost for regular home loan with EMI and optional annual prepayment"""
+    return evaluate_regular_scenarios(
+        amount, [term], tenure, tax_slab, old_regime, prop_type, annual_prepay, prepay_month,
+        rate_events, reset_policy
+    )[0]
+
+
+def _simulate_overdraft(amount, interest_rates, tenure, surplus_initial, surplus_monthly,
+                        rate_events=(), reset_policy="recompute_emi", daily_accrual=None):
+    """Run the overdraft engine matching the rate events and accrual mode (uncached)"""
+    if daily_accrual is not None:
+        if rate_events:
+            raise ValueError("Daily accrual does not support rate reset events")
+        return simulate_overdraft_daily_batch(amount, interest_rates, tenure, surplus_initial,
+                                              surplus_monthly, **daily_accrual)
+    if rate_events or reset_policy != "recompute_emi":
+        return simulate_overdraft_rate_resets_batch(amount, interest_rates, tenure, surplus_initial,
+                                                    surplus_monthly, rate_events, reset_policy)
+    return simulate_overdraft_batch(amount, interest_rates, tenure, surplus_initial, surplus_monthly)
+
+
+@memoize_scenario(SCHEDULE_CACHE)
+def overdraft_schedule(amount, interest_rates, tenure, surplus_initial, surplus_monthly,
+                       rate_events=(), reset_policy="recompute_emi", daily_accrual=None):
+    """
+    Stage 1: every scenario's month-by-month overdraft simulation as (scenarios x months) arrays
+
+    interest_rates, surplus_initial and surplus_monthly broadcast as in
+    simulate_overdraft_batch. See evaluate_overdraft_scenarios for daily_accrual.
+    """
+    return _simulate_overdraft(amount, interest_rates, tenure, surplus_initial, surplus_monthly,
+                               rate_events, reset_policy, daily_accrual)
+
+
+@memoize_scenario()
+def overdraft_yearly(amount, interest_rates, tenure, surplus_initial, surplus_monthly,
+                     rate_events=(), reset_policy="recompute_emi", daily_accrual=None):
+    """
+    Stage 2: loan-year totals and overall sums of every scenario's overdraft loan
+
+    Simulates directly rather than through the overdraft_schedule stage, so the
+    monthly arrays are only cached when a schedule is asked for.
+    """
+    simulation = _simulate_overdraft(amount, interest_rates, tenure, surplus_initial, surplus_monthly,
+                                     rate_events, reset_policy, daily_accrual)
+    return {
+        "yearly_principal": yearly_totals(simulation["principal"]),
+        "yearly_interest": yearly_totals(simulation["interest"]),
+        "total_interest_paid": simulation["interest"].sum(axis=1),
+        "scheduled_interest": simulation["scheduled_interest"],
+        "emi": simulation["emi"],
+        "months": simulation["months"],
+        "final_od_balance": simulation["final_od_balance"]
+    }
+
+
+@memoize_scenario()
+def overdraft_schedule_tax(amount, interest_rates, tenure, surplus_initial, surplus_monthly,
+                           tax_slab, old_regime, prop_type, rate_events=(), reset_policy="recompute_emi",
+                           daily_accrual=None):
+    """Stage 3: total tax benefit per scenario from the overdraft_yearly stage"""
+    yearly = overdraft_yearly(amount, interest_rates, tenure, surplus_initial, surplus_monthly,
+                              rate_events, reset_policy, daily_accrual)
+    return overdraft_tax_benefit(yearly["yearly_interest"], tax_slab, old_regime, prop_type)
+
+
+@memoize_scenario()
+def evaluate_overdraft_scenarios(amount, terms, tenure, surplus_initial, surplus_monthly,
+                                 tax_slab, old_regime, prop_type, rate_events=(), reset_policy="recompute_emi",
+                                 daily_accrual=None):
+    """
+    Calculate overdraft loan costs for many scenarios in one batched evaluation
+
+    terms (one per bank), surplus_initial and surplus_monthly are broadcast against
+    each other; each resulting element is one scenario. Returns a read-only dict of
+    per-scenario arrays (yearly values as scenarios x years arrays), memoized on the
+    normalized inputs and built on the cached overdraft_yearly stage like
+    evaluate_regular_scenarios.
+    rate_events and reset_policy work as in evaluate_regular_scenarios.
+
+    daily_accrual switches to interest on daily closing balances: a dict with any of
+    'salary_day', 'emi_day', 'withdrawals' and 'start_year' (see simulate_overdraft_daily),
+    or None for the monthly model. It cannot be combined with rate_events.
+    """
+    interest_rates = [term["interest_rate"] for term in terms]
+    account = (amount, interest_rates, tenure, surplus_initial, surplus_monthly)
+    schedule_args = (rate_events, reset_policy, daily_accrual)
+
+    yearly = overdraft_yearly(*account, *schedule_args)
+
+    # Calculate tax benefits (same logic as regular loan)
+    total_tax_benefit = overdraft_tax_benefit(yearly["yearly_interest"], tax_slab, old_regime, prop_type)
+
+    # Processing fee
+    processing_fees = loan_processing_fees(amount, terms)
+
+    # OD account opening charge
+    od_charges = np.array([term["od_charge"] for term in terms])
+
+    total_interest_paid = yearly["total_interest_paid"]
+
+    # Interest saved compared to regular loan
+    interest_saved = yearly["scheduled_interest"] - total_interest_paid
+
+    net_cost = total_interest_paid + processing_fees + od_charges - total_tax_benefit
+
+    return {
+        "emi": yearly["emi"],
+        "total_interest_paid": total_interest_paid,
+        "total_interest_saved": interest_saved,
+        "processing_fee": processing_fees,
+        "od_charge": od_charges,
+        "total_tax_benefit": total_tax_benefit,
+        "net_cost": net_cost,
+        "yearly_principal": yearly["yearly_principal"],
+        "yearly_interest": yearly["yearly_interest"],
+        "months": yearly["months"],
+        "final_od_balance": yearly["final_od_balance"]
+    }
+
+
+def overdraft_scenario_results(amount, terms, tenure, surplus_initial, surplus_monthly,
+                               tax_slab, old_regime, prop_type, rate_events=(), reset_policy="recompute_emi",
+                               daily_accrual=None):
+    """Calculate cost of a home loan with overdraft facility for several sets of bank terms, one OverdraftLoanResult per bank"""
+    costs = evaluate_overdraft_scenarios(amount, terms, tenure, surplus_initial, surplus_monthly,
+                                         tax_slab, old_regime, prop_type, rate_events, reset_policy, daily_accrual)
+
+    # costs is already frozen, so only the entries added here need to be read-only
+    batch = MappingProxyType({
+        **costs,
+        "interest_rates": tuple(term["interest_rate"] for term in terms),
+        "od_charges": tuple(term["od_charge"] for term in terms),
+        "schedule": lambda: overdraft_schedule(amount, [term["interest_rate"] for term in terms], tenure,
+                                               surplus_initial, surplus_monthly, rate_events, reset_policy,
+                                               daily_accrual),
+        "tax": (tax_slab, old_regime, prop_type, False)
+    })
+    return [OverdraftLoanResult(batch, i) for i in range(len(terms))]
+
+
+def overdraft_home_loan(amount, term, tenure, surplus_initial, surplus_monthly, tax_slab, old_regime, prop_type,
+                        rate_events=(), reset_policy="recompute_emi", daily_accrual=None):
+    """Calculate cost for home loan with overdraft facility"""
+    return overdraft_scenario_results(
+        amount, [term], tenure, surplus_initial, surplus_monthly, tax_slab, old_regime, prop_type,
+        rate_events, reset_policy, daily_accrual
+    )[0]
+
+
+def overdraft_net_costs(amount, term, tenure, surplus_initial, surplus_monthly, tax_slab, old_regime, prop_type,
+                        rate_events=(), reset_policy="recompute_emi", daily_accrual=None):
+    """Net cost of one bank's overdraft loan for an array of surplus amounts"""
+    return evaluate_overdraft_scenarios(amount, [term], tenure, surplus_initial, surplus_monthly, tax_slab, old_regime,
+                                        prop_type, rate_events, reset_policy, daily_accrual)["net_cost"]
+
+
+def _overdraft_net_costs(amount, term, tenure, surplus_initial, surplus_monthly, tax_slab, old_regime, prop_type,
+                         rate_events=(), reset_policy="recompute_emi", daily_accrual=None):
+    """
+    overdraft_net_costs without the scenario caches, for solver probes and sweep points
+
+    Every probe is a new surplus that is never asked for again, so caching its
+    stages would only evict the scenarios the app reuses.
+    """
+    simulation = _simulate_overdraft(amount, [term["interest_rate"]], tenure, surplus_initial, surplus_monthly,
+                                     rate_events, reset_policy, daily_accrual)
+    total_tax_benefit = overdraft_tax_benefit(yearly_totals(simulation["interest"]), tax_slab, old_regime, prop_type)
+    return (simulation["interest"].sum(axis=1) + loan_processing_fees(amount, [term])
+            + np.array([term["od_charge"]]) - total_tax_benefit)
+
+
+@memoize_scenario()
+def find_break_even_surplus(amount, term, tenure, surplus_initial, surplus_monthly, tax_slab, old_regime,
+                            prop_type, target_net_cost, solve_for="initial", known=None,
+                            rate_events=(), reset_policy="recompute_emi", daily_accrual=None):
+    """
+    Minimum surplus at which the overdraft loan's net cost drops to target_net_cost
+
+    solve_for="initial" searches the initial surplus (keeping surplus_monthly fixed),
+    solve_for="monthly" searches the monthly surplus (keeping surplus_initial fixed).
+    Both are searched between 0 and the loan amount, beyond which parking more
+    cannot lower the cost. Returns the solver result dict ('value' is None when
+    the overdraft cannot break even). Probes are evaluated uncached; only the
+    result is memoized.
+    """
+    def net_cost(surplus):
+        if solve_for == "initial":
+            costs = _overdraft_net_costs(amount, term, tenure, surplus, surplus_monthly,
+                                        tax_slab, old_regime, prop_type, rate_events, reset_policy, daily_accrual)
+        else:
+            costs = _overdraft_net_costs(amount, term, tenure, surplus_initial, surplus,
+                                        tax_slab, old_regime, prop_type, rate_events, reset_policy, daily_accrual)
+        return float(costs[0])
+
+    return find_break_even(net_cost, target_net_cost, 0.0, float(amount), known=known)
+
+
+@memoize_scenario()
+def sweep_overdraft_surplus(amount, term, tenure, surplus_monthly, tax_slab, old_regime, prop_type,
+                            target_net_cost, points=201, rate_events=(), reset_policy="recompute_emi",
+                            daily_accrual=None):
+    """
+    Dense net-cost curve of the overdraft loan over initial surplus from 0 to the loan amount
+
+    Also finds the break-even surplus: the smallest initial surplus at which the OD
+    net cost drops to target_net_cost (None if parking the full loan is not enough).
+    The curve brackets the crossing and the break-even solver refines it, reusing
+    the bracket points already computed for the curve. The curve and the solver
+    probes are evaluated uncached; only the result is memoized.
+    """
+    surplus = np.linspace(0, amount, points)
+    net_cost = _overdraft_net_costs(amount, term, tenure, surplus, surplus_monthly,
+                                   tax_slab, old_regime, prop_type, rate_events, reset_policy, daily_accrual)
+
+    break_even_surplus = None
+    if net_cost[0] <= target_net_cost:
+        break_even_surplus = 0.0
+    elif net_cost[-1] <= target_net_cost:
+        crossing = int(np.argmax(net_cost <= target_net_cost))
+        low, high = float(surplus[crossing - 1]), float(surplus[crossing])
+        break_even_surplus = find_break_even(
+            lambda x: float(_overdraft_net_costs(amount, term, tenure, x, surplus_monthly,
+                                                tax_slab, old_regime, prop_type, rate_events, reset_policy,
+                                                daily_accrual)[0]),
+            target_net_cost, low, high,
+            known={low: float(net_cost[crossing - 1]), high: float(net_cost[crossing])}
+        )["value"]
+
+    return {
+        "surplus": surplus,
+        "net_cost": net_cost,
+        "break_even_surplus": break_even_surplus
+    }
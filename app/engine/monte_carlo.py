@@ -0,0 +1,158 @@
+"""
+Monte Carlo - Floating-rate risk of regular and overdraft home loans across simulated repo-rate paths
+"""
+import numpy as np
+
+from .amortization import amortize_floating, yearly_totals
+from .overdraft import simulate_overdraft_floating
+from .loans import loan_processing_fees, regular_tax_benefit, overdraft_tax_benefit
+from .scenario_cache import memoize_scenario, ScenarioCache
+
+
+def generate_rate_shifts(paths, months, volatility=1.0, mean_reversion=0.3, reset_months=3, seed=None):
+    """
+    Simulate repo-rate moves as shifts (in % points) from today's rate, shape (paths x months)
+
+    The repo rate follows a mean-reverting random walk that is only reset every
+    `reset_months` months (external-benchmark loans reset quarterly) and moves in
+    multiples of 0.25%. The first reset period always stays at today's rate.
+
+    Args:
+        paths (int): Number of rate paths
+        months (int): Months per path
+        volatility (float): Standard deviation of rate moves over a year, in % points
+        mean_reversion (float): Yearly speed at which rates drift back to today's level
+        reset_months (int): Months between rate resets
+        seed (int, optional): Random seed for reproducible paths
+
+    Returns:
+        np.ndarray: Rate shift in % points for every path and month
+    """
+    rng = np.random.default_rng(seed)
+    resets = -(-months // reset_months)
+    step = reset_months / 12
+    persistence = np.exp(-mean_reversion * step)
+    shocks = rng.standard_normal((paths, resets)) * (volatility * np.sqrt(step))
+
+    # Mean-reverting walk, evaluated for all paths one reset at a time
+    shifts = np.zeros((paths, resets))
+    for reset in range(1, resets):
+        shifts[:, reset] = shifts[:, reset - 1] * persistence + shocks[:, reset]
+
+    shifts = np.round(shifts * 4) / 4
+    return np.repeat(shifts, reset_months, axis=1)[:, :months]
+
+
+# Per-path yearly totals are large (paths x years per loan), so only the last few are kept
+PATH_CACHE = ScenarioCache(maxsize=4)
+
+
+@memoize_scenario(PATH_CACHE)
+def floating_rate_paths(amount, regular_rate, od_rate, tenure, surplus_initial, surplus_monthly,
+                        annual_prepay=0, prepay_month=12, paths=10000, volatility=1.0, mean_reversion=0.3,
+                        seed=0, chunk_paths=2500):
+    """
+    Loan-year principal and interest of both loans on every simulated rate path
+
+    The simulation stage of monte_carlo_comparison: it does not depend on tax
+    inputs or fees, so changing those reuses the cached paths. Paths are evaluated
+    in chunks of `chunk_paths` to keep memory bounded.
+
+    Returns:
+        dict: {
+            'regular_yearly_principal', 'regular_yearly_interest', 'od_yearly_interest':
+            np.ndarray (paths x years; regular principal includes prepayments)
+        }
+    """
+    shifts = generate_rate_shifts(paths, tenure, volatility, mean_reversion, seed=seed)
+
+    regular_principal, regular_interest, od_interest = [], [], []
+    for start in range(0, paths, chunk_paths):
+        chunk = shifts[start:start + chunk_paths]
+
+        schedule = amortize_floating(amount, np.maximum(regular_rate + chunk, 0),
+                                     tenure, annual_prepay, prepay_month)
+        regular_principal.append(yearly_totals(schedule["principal"] + schedule["prepayment"]))
+        regular_interest.append(yearly_totals(schedule["interest"]))
+
+        simulation = simulate_overdraft_floating(amount, np.maximum(od_rate + chunk, 0),
+                                                 tenure, surplus_initial, surplus_monthly)
+        od_interest.append(yearly_totals(simulation["interest"]))
+
+    return {
+        "regular_yearly_principal": np.concatenate(regular_principal),
+        "regular_yearly_interest": np.concatenate(regular_interest),
+        "od_yearly_interest": np.concatenate(od_interest)
+    }
+
+
+@memoize_scenario()
+def monte_carlo_comparison(amount, regular_term, od_term, tenure, surplus_initial, surplus_monthly,
+                           tax_slab, old_regime, prop_type, annual_prepay=0, prepay_month=12,
+                           paths=10000, volatility=1.0, mean_reversion=0.3, seed=0,
+                           percentiles=(5, 25, 50, 75, 95), chunk_paths=2500):
+    """
+    Percentile bands of total interest and net cost for a regular and an overdraft loan under floating rates
+
+    Both banks see the same simulated repo-rate paths (added to each bank's
+    current rate), so the savings distribution compares like with like. The paths
+    come from the cached floating_rate_paths stage, so changing only tax inputs,
+    fees or percentiles skips the simulation. Memoized; with the default fixed
+    seed the bands are reproducible.
+
+    Args:
+        amount (float): Loan amount
+        regular_term (dict): Regular loan bank terms
+        od_term (dict): Overdraft loan bank terms
+        tenure (int): Tenure in months
+        surplus_initial (float): Amount parked in the OD account on day 1
+        surplus_monthly (float): Amount added to the OD account every month
+        tax_slab (float): Income tax slab in %
+        old_regime (bool): Whether the old tax regime applies
+        prop_type (str): "Self-Occupied" or "Let-Out"
+        annual_prepay (float): Yearly prepayment on the regular loan
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+        paths (int): Number of simulated rate paths
+        volatility (float): Yearly standard deviation of repo-rate moves in % points
+        mean_reversion (float): Yearly speed at which rates drift back to today's level
+        seed (int, optional): Random seed
+        percentiles (tuple): Percentiles to report
+        chunk_paths (int): Paths evaluated per chunk
+
+    Returns:
+        dict: {
+            'percentiles': np.ndarray,
+            'regular', 'overdraft': {'total_interest', 'net_cost': np.ndarray (one value per percentile)},
+            'savings': np.ndarray (regular minus overdraft net cost, one value per percentile),
+            'od_cheaper_share': float (share of paths where the overdraft is cheaper)
+        }
+    """
+    simulated = floating_rate_paths(amount, regular_term["interest_rate"], od_term["interest_rate"], tenure,
+                                    surplus_initial, surplus_monthly, annual_prepay, prepay_month,
+                                    paths, volatility, mean_reversion, seed, chunk_paths)
+    regular_fee = loan_processing_fees(amount, [regular_term])[0]
+    od_fee = loan_processing_fees(amount, [od_term])[0] + od_term["od_charge"]
+
+    regular_interest = simulated["regular_yearly_interest"].sum(axis=1)
+    regular_cost = regular_interest + regular_fee - regular_tax_benefit(
+        simulated["regular_yearly_principal"], simulated["regular_yearly_interest"], tax_slab, old_regime, prop_type
+    )
+
+    od_interest = simulated["od_yearly_interest"].sum(axis=1)
+    od_cost = od_interest + od_fee - overdraft_tax_benefit(
+        simulated["od_yearly_interest"], tax_slab, old_regime, prop_type
+    )
+
+    return {
+        "percentiles": np.asarray(percentiles, dtype=float),
+        "regular": {
+            "total_interest": np.percentile(regular_interest, percentiles),
+            "net_cost": np.percentile(regular_cost, percentiles)
+        },
+        "overdraft": {
+            "total_interest": np.percentile(od_interest, percentiles),
+            "net_cost": np.percentile(od_cost, percentiles)
+        },
+        "savings": np.percentile(regular_cost - od_cost, percentiles),
+        "od_cheaper_share": float(np.mean(od_cost < regular_cost))
+    }
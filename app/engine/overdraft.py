@@ -0,0 +1,429 @@
+"""
+Overdraft Engine - Simulate home loan overdraft accounts (like SBI MaxGain) with NumPy
+"""
+import numpy as np
+
+from .amortization import (
+    calculate_emi, annuity_balances, annuity_factors, chained_balances, amortize_floating,
+    amortize_rate_resets, segment_balances, _annuity_balance
+)
+
+
+def simulate_overdraft_batch(amount, annual_rates, tenure, surplus_initial, surplus_monthly):
+    """
+    Simulate the overdraft account for many scenarios at once as (scenarios x months) arrays
+
+    While the OD balance is below the outstanding loan, the effective outstanding
+    D = outstanding - OD balance follows D' = D * (1 + r) - (EMI + monthly surplus),
+    which has a closed form. Once D reaches zero the OD balance is capped at the
+    outstanding loan, no more interest accrues and the full EMI goes to principal
+    until the loan closes.
+
+    Args:
+        amount (float): Loan amount
+        annual_rates (array-like): Interest rate in % p.a. (e.g. one per bank)
+        tenure (int or array-like): Tenure in months
+        surplus_initial (float or array-like): Amount parked in the OD account on day 1
+        surplus_monthly (float or array-like): Amount added to the OD account every month
+
+    annual_rates, tenure, surplus_initial and surplus_monthly are broadcast against
+    each other, and each resulting element is one scenario row. With more than one
+    tenure the arrays are as wide as the longest, zero after each row closes.
+
+    Returns:
+        dict: {
+            'interest', 'principal': np.ndarray (scenarios x months, zero after closure),
+            'emi': np.ndarray (EMI per scenario),
+            'months': np.ndarray (months simulated per scenario),
+            'final_od_balance': np.ndarray (OD balance at the end per scenario),
+            'scheduled_interest': np.ndarray (interest the EMI schedule alone would pay per scenario)
+        }
+    """
+    annual_rates = np.atleast_1d(np.asarray(annual_rates, dtype=float))
+    if np.ndim(tenure) or np.ndim(surplus_initial) or np.ndim(surplus_monthly):
+        annual_rates, tenures, surplus_initial, surplus_monthly = np.broadcast_arrays(
+            annual_rates, tenure, surplus_initial, surplus_monthly
+        )
+    else:
+        # One scenario per rate: filling is much cheaper than broadcast_arrays for a bank or two
+        tenures, surplus_initial, surplus_monthly = (np.full(len(annual_rates), value)
+                                                     for value in (tenure, surplus_initial, surplus_monthly))
+    width = int(tenures.max())
+    monthly_rate = annual_rates[:, None] / (12 * 100)
+    emi = amount * annuity_factors(monthly_rate, tenures[:, None])
+    payment = emi + surplus_monthly[:, None]
+
+    # Effective outstanding (loan - OD balance) at the start of each month
+    effective = annuity_balances(amount - surplus_initial[:, None], payment, monthly_rate, np.arange(width, dtype=float))
+
+    # D only ever falls, so clipping at zero switches to the capped regime exactly when it binds
+    interest = np.maximum(effective, 0) * monthly_rate
+    principal = emi - interest
+    outstanding = amount - np.cumsum(principal, axis=1)
+
+    # Stop at the month the loan is fully repaid (or its tenure ends)
+    closed = outstanding <= 0
+    months = np.minimum(np.where(closed.any(axis=1), closed.argmax(axis=1) + 1, width), tenures)
+    if months.min() < width:
+        inactive = np.arange(width) >= months[:, None]
+        interest[inactive] = 0.0
+        principal[inactive] = 0.0
+
+    # OD balance after the last month: outstanding minus the effective outstanding,
+    # or the whole outstanding once the cap binds
+    last = (np.arange(len(months)), months - 1)
+    final_outstanding = outstanding[last]
+    final_effective = effective[last] * (1 + monthly_rate[:, 0]) - payment[:, 0]
+    final_od_balance = np.maximum(final_outstanding - np.maximum(final_effective, 0), 0)
+
+    return {
+        "interest": interest,
+        "principal": principal,
+        "emi": emi[:, 0],
+        "months": months,
+        "final_od_balance": final_od_balance,
+        "scheduled_interest": emi[:, 0] * tenures - amount
+    }
+
+
+def simulate_overdraft_floating(amount, annual_rates, tenure, surplus_initial, surplus_monthly):
+    """
+    Simulate the overdraft account when the rate can change every month
+
+    The EMI follows the bank's floating-rate schedule for the same rate path
+    (see amortize_floating), and the effective outstanding D follows
+    D' = D * (1 + r_t) - (EMI_t + monthly surplus), solved in closed form for all
+    paths at once. With a constant rate this matches simulate_overdraft_batch.
+
+    Args:
+        amount (float): Loan amount
+        annual_rates (np.ndarray): Interest rate in % p.a. per month, shape (paths, months)
+        tenure (int): Tenure in months
+        surplus_initial (float): Amount parked in the OD account on day 1
+        surplus_monthly (float): Amount added to the OD account every month
+
+    Returns:
+        dict: {
+            'interest', 'principal', 'emi': np.ndarray (paths x months, zero after closure),
+            'months': np.ndarray (months simulated per path)
+        }
+    """
+    monthly_rate = np.asarray(annual_rates, dtype=float) / (12 * 100)
+    emi = amortize_floating(amount, annual_rates, tenure)["emi"]
+
+    # Effective outstanding (loan - OD balance) at the start of each month
+    effective = chained_balances(amount - surplus_initial, 1 + monthly_rate, emi + surplus_monthly)
+
+    interest = np.maximum(effective, 0) * monthly_rate
+    principal = emi - interest
+    outstanding = amount - np.cumsum(principal, axis=-1)
+
+    # Stop at the month the loan is fully repaid
+    closed = outstanding <= 0
+    months = np.where(closed.any(axis=-1), closed.argmax(axis=-1) + 1, tenure)
+    if months.min() < tenure:
+        inactive = np.arange(tenure) >= months[..., None]
+        for values in (interest, principal, emi):
+            values[inactive] = 0.0
+
+    return {
+        "interest": interest,
+        "principal": principal,
+        "emi": emi,
+        "months": months
+    }
+
+
+def simulate_overdraft_rate_resets(amount, annual_rate, tenure, surplus_initial, surplus_monthly,
+                                   rate_events=(), policy="recompute_emi"):
+    """
+    Simulate one overdraft account with rate changes at given months, piecewise in closed form
+
+    The EMI follows the bank's EMI schedule under the same rate events and reset
+    policy (see amortize_rate_resets). Between events the rate and payment are
+    constant, so the effective outstanding is walked one segment at a time and
+    every month is then filled in with one broadcast pass.
+
+    Returns:
+        dict: Same keys as simulate_overdraft_batch for a single scenario (scalars
+        and 1-D arrays cut at the months simulated)
+    """
+    schedule = amortize_rate_resets(amount, annual_rate, tenure, rate_events, policy)
+    segments = schedule["segments"]
+    horizon = schedule["months"]
+    payments = segments["emi"] + surplus_monthly
+
+    # Effective outstanding (loan - OD balance) at the start of each segment
+    openings = [amount - surplus_initial]
+    for start, end, payment, monthly_rate in zip(segments["start"][:-1], segments["start"][1:],
+                                                  payments[:-1], segments["rate"][:-1]):
+        openings.append(_annuity_balance(openings[-1], payment, monthly_rate, end - start))
+
+    effective, segment = segment_balances(openings, segments["start"], payments, segments["rate"], horizon)
+    monthly_rate = segments["rate"][segment]
+    emi = schedule["monthly_emi"]
+
+    # D only ever falls, so clipping at zero switches to the capped regime exactly when it binds
+    interest = np.maximum(effective, 0) * monthly_rate
+    principal = emi - interest
+    outstanding = amount - np.cumsum(principal)
+
+    closed = outstanding <= 0
+    months = int(closed.argmax()) + 1 if closed.any() else horizon
+
+    final_effective = effective[months - 1] * (1 + monthly_rate[months - 1]) - payments[segment[months - 1]]
+    final_od_balance = max(outstanding[months - 1] - max(final_effective, 0), 0)
+
+    return {
+        "interest": interest[:months],
+        "principal": principal[:months],
+        "emi": schedule["emi"],
+        "months": months,
+        "final_od_balance": final_od_balance,
+        "scheduled_interest": float(emi.sum()) - amount
+    }
+
+
+def simulate_overdraft_rate_resets_batch(amount, annual_rates, tenure, surplus_initial, surplus_monthly,
+                                         rate_events=(), policy="recompute_emi"):
+    """
+    simulate_overdraft_rate_resets for many scenarios, in the padded layout of simulate_overdraft_batch
+
+    annual_rates, surplus_initial and surplus_monthly are broadcast against each
+    other as in simulate_overdraft_batch; the same rate events apply to every scenario.
+    """
+    annual_rates, surplus_initial, surplus_monthly = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(annual_rates, dtype=float)), surplus_initial, surplus_monthly
+    )
+    simulations = [
+        simulate_overdraft_rate_resets(amount, rate, tenure, initial, monthly, rate_events, policy)
+        for rate, initial, monthly in zip(annual_rates.tolist(), surplus_initial.tolist(), surplus_monthly.tolist())
+    ]
+    return _stack_simulations(simulations, tenure)
+
+
+def _stack_simulations(simulations, tenure):
+    """Pad single-scenario simulations into (scenarios x months) arrays, zero after each closes"""
+    width = max([tenure] + [simulation["months"] for simulation in simulations])
+
+    batch = {}
+    for key in ("interest", "principal", "od_balance"):
+        if key not in simulations[0]:
+            continue
+        batch[key] = np.zeros((len(simulations), width))
+        for row, simulation in zip(batch[key], simulations):
+            row[:simulation["months"]] = simulation[key]
+    for key in ("emi", "months", "final_od_balance", "scheduled_interest"):
+        batch[key] = np.array([simulation[key] for simulation in simulations])
+    return batch
+
+
+# Days in each calendar month of a non-leap year; the loan is taken to start in January
+DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# Every length a month can have: the daily flow pattern of a month depends only on its length
+MONTH_LENGTHS = np.arange(28, 32)
+
+
+def month_days(tenure, start_year=None):
+    """
+    Days in each month of the loan, which starts in January
+
+    Args:
+        tenure (int): Tenure in months
+        start_year (int, optional): Calendar year of the first month, so leap-year
+            Februaries get 29 days (default: every year has 365 days)
+
+    Returns:
+        np.ndarray: Days in each loan month
+    """
+    if start_year is None:
+        return DAYS_IN_MONTH[np.arange(tenure) % 12]
+    month_starts = np.datetime64(f"{int(start_year):04d}-01", "M") + np.arange(tenure + 1)
+    return np.diff(month_starts.astype("datetime64[D]")).astype(int)
+
+
+def daily_flows(emi, surplus_monthly, salary_day=1, emi_day=5, withdrawals=(), days_in_month=DAYS_IN_MONTH):
+    """
+    Running total of the money moving through the OD account on each day of a month
+
+    Positive amounts raise the effective outstanding (withdrawals), negative
+    amounts lower it (salary surplus credit, EMI debit). Days past the end of a
+    month are clamped to its last day. The pattern repeats every month of the same
+    length, so only one row per month length is built (by default the twelve
+    calendar months).
+
+    Returns:
+        tuple: (running, valid) where running[m, d] is the total flow from the start of
+        a month of days_in_month[m] days up to and including day d + 1 (months x 31),
+        and valid marks the days that exist
+    """
+    days_in_month = np.asarray(days_in_month)
+    flows = np.zeros((len(days_in_month), 31))
+    months = np.arange(len(days_in_month))
+    for day, amount in [(salary_day, -surplus_monthly), (emi_day, -emi)] + [(d, a) for d, a in withdrawals]:
+        np.add.at(flows, (months, np.minimum(day, days_in_month) - 1), amount)
+
+    valid = np.arange(31) < days_in_month[:, None]
+    return np.cumsum(flows, axis=1), valid
+
+
+def simulate_overdraft_daily(amount, annual_rate, tenure, surplus_initial, surplus_monthly,
+                             salary_day=1, emi_day=5, withdrawals=(), start_year=None):
+    """
+    Simulate one overdraft account with interest accrued on every day's closing balance
+
+    The monthly surplus is credited on salary_day, the EMI is debited on emi_day,
+    and each (day, amount) in withdrawals is taken out every month. Interest is
+    accrued daily at annual_rate / 365 on the positive effective outstanding and
+    debited at month end. As in the monthly model, the OD balance is capped at the
+    outstanding loan (at the start and at each month end). The loan starts in
+    January; with start_year, Februaries of leap years have 29 days (the daily
+    rate stays annual_rate / 365, as banks quote it).
+
+    While the effective outstanding D stays positive all month, a month's interest
+    is r * (days * D + sum of running flows), so D follows an affine monthly
+    recurrence solved in closed form across all months at once. Only the months
+    where the balance touches zero are evaluated one at a time, day by day; after
+    that, months starting from a zero balance are again evaluated all at once.
+
+    Returns:
+        dict: Same keys as simulate_overdraft_batch for a single scenario (scalars
+        and 1-D arrays cut at the months simulated), plus 'od_balance' (at each month end)
+    """
+    daily_rate = annual_rate / (365 * 100)
+    emi = calculate_emi(amount, annual_rate, tenure)
+    running, valid = daily_flows(emi, surplus_monthly, salary_day, emi_day, withdrawals, MONTH_LENGTHS)
+
+    # Per month length: net flow, sum of running flows, lowest point, and the
+    # interest of a month that starts from zero effective outstanding
+    month_flow = running[np.arange(len(MONTH_LENGTHS)), MONTH_LENGTHS - 1]
+    running_sum = np.where(valid, running, 0).sum(axis=1)
+    lowest = np.where(valid, running, np.inf).min(axis=1)
+    zero_start_interest = daily_rate * np.where(valid, np.maximum(running, 0), 0).sum(axis=1)
+
+    days = month_days(tenure, start_year)
+    pattern = days - MONTH_LENGTHS[0]  # Row of each loan month in the per-length arrays
+    month_flow, running_sum = month_flow[pattern], running_sum[pattern]
+    lowest, zero_start_interest = lowest[pattern], zero_start_interest[pattern]
+
+    effective = np.zeros(tenure + 1)  # Effective outstanding at the start of each month (and after the last)
+    interest = np.zeros(tenure)
+    effective[0] = max(amount - surplus_initial, 0.0)
+    month = 0
+    while month < tenure:
+        if effective[month] > 0:
+            # Positive all month: affine recurrence until the balance first touches zero
+            path = chained_balances(effective[month], 1 + days[month:] * daily_rate,
+                                    -(month_flow[month:] + daily_rate * running_sum[month:]))
+            touches = path + lowest[month:] < 0
+            stop = month + (int(touches.argmax()) if touches.any() else tenure - month)
+            interest[month:stop] = daily_rate * (days[month:stop] * path[:stop - month] + running_sum[month:stop])
+            effective[month:stop] = path[:stop - month]
+            if stop == tenure:
+                effective[tenure] = effective[tenure - 1] + month_flow[tenure - 1] + interest[tenure - 1]
+                break
+            # Month where the balance touches zero: accrue day by day
+            effective[stop] = path[stop - month]
+            balance = effective[stop] + running[pattern[stop]][valid[pattern[stop]]]
+            interest[stop] = daily_rate * np.maximum(balance, 0).sum()
+        else:
+            # Starting from zero: the month ends at zero again unless withdrawals outweigh credits
+            ends = month_flow[month:] + zero_start_interest[month:]
+            positive = ends > 0
+            stop = month + (int(positive.argmax()) if positive.any() else tenure - month)
+            interest[month:stop] = zero_start_interest[month:stop]
+            effective[month:stop + 1] = 0.0
+            if stop == tenure:
+                break
+            interest[stop] = zero_start_interest[stop]
+        effective[stop + 1] = max(0.0, effective[stop] + month_flow[stop] + interest[stop])
+        month = stop + 1
+
+    principal = emi - interest
+    outstanding = amount - np.cumsum(principal)
+
+    closed = outstanding <= 0
+    months = int(closed.argmax()) + 1 if closed.any() else tenure
+    final_od_balance = max(outstanding[months - 1] - max(effective[months], 0), 0)
+    od_balance = np.maximum(outstanding - np.maximum(effective[1:], 0), 0)  # At the end of each month
+
+    return {
+        "interest": interest[:months],
+        "principal": principal[:months],
+        "od_balance": od_balance[:months],
+        "emi": emi,
+        "months": months,
+        "final_od_balance": final_od_balance,
+        "scheduled_interest": emi * tenure - amount
+    }
+
+
+def simulate_overdraft_daily_batch(amount, annual_rates, tenure, surplus_initial, surplus_monthly,
+                                   salary_day=1, emi_day=5, withdrawals=(), start_year=None):
+    """
+    simulate_overdraft_daily for many scenarios, in the padded layout of simulate_overdraft_batch
+
+    annual_rates, surplus_initial and surplus_monthly are broadcast against each
+    other as in simulate_overdraft_batch.
+    """
+    annual_rates, surplus_initial, surplus_monthly = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(annual_rates, dtype=float)), surplus_initial, surplus_monthly
+    )
+    simulations = [
+        simulate_overdraft_daily(amount, rate, tenure, initial, monthly, salary_day, emi_day, withdrawals, start_year)
+        for rate, initial, monthly in zip(annual_rates.tolist(), surplus_initial.tolist(), surplus_monthly.tolist())
+    ]
+    return _stack_simulations(simulations, tenure)
+
+
+def simulate_overdraft_reference(amount, annual_rate, tenure, surplus_initial, surplus_monthly):
+    """
+    Month-by-month overdraft simulation kept as the reference for simulate_overdraft_batch
+
+    This is the original loop the app used before the closed-form engine. It is
+    slow but obviously correct, so use it to check the engine after changes.
+
+    Returns:
+        dict: Same keys as simulate_overdraft_batch for a single bank, with
+        'interest' and 'principal' as per-month lists
+    """
+    monthly_rate = annual_rate / (12 * 100)
+    emi = calculate_emi(amount, annual_rate, tenure)
+
+    # Simulate overdraft account over tenure
+    outstanding = amount
+    od_balance = surplus_initial  # Money in OD account
+    monthly_interest = []
+    monthly_principal = []
+
+    for month in range(tenure):
+        # Effective outstanding = Loan outstanding - OD balance
+        effective_outstanding = max(0, outstanding - od_balance)
+
+        # Interest on effective outstanding
+        interest_component = effective_outstanding * monthly_rate
+
+        # Principal component
+        principal_component = emi - interest_component
+        outstanding -= principal_component
+
+        # Add monthly surplus to OD account
+        od_balance += surplus_monthly
+
+        # Cap OD balance at outstanding loan (can't park more than loan amount)
+        od_balance = min(od_balance, max(0, outstanding))
+
+        monthly_interest.append(interest_component)
+        monthly_principal.append(principal_component)
+
+        if outstanding <= 0:
+            break
+
+    return {
+        "interest": monthly_interest,
+        "principal": monthly_principal,
+        "emi": emi,
+        "months": len(monthly_interest),
+        "final_od_balance": od_balance
+    }
@@ -0,0 +1,69 @@
+"""
+Profile Sweep - Net cost of every bank at the personalized rates of many borrower profiles
+"""
+import numpy as np
+
+from .loans import (loan_processing_fees, regular_yearly, regular_schedule_tax,
+                    overdraft_yearly, overdraft_schedule_tax)
+from .scenario_cache import memoize_scenario
+
+
+@memoize_scenario()
+def profile_sweep(amount, regular_terms, od_terms, regular_rates, od_rates, tenure, surplus_initial,
+                  surplus_monthly, tax_slab, old_regime, prop_type, annual_prepay=0, prepay_month=12,
+                  daily_accrual=None):
+    """
+    Net cost of each bank's regular and overdraft loan for a (profiles x banks) matrix of rates
+
+    Personalized rates are rounded to 0.01%, so even hundreds of profiles share a
+    few dozen distinct rates. Each loan type is simulated once, as one batch over
+    its distinct rates (through the cached schedule stages of engine.loans), and
+    the results are scattered back to the matrix with each bank's fees added.
+    A row gives the same net costs as evaluating its banks at those rates directly.
+
+    Args:
+        amount (float): Loan amount
+        regular_terms (list): Regular loan bank terms, one per column of regular_rates
+        od_terms (list): Overdraft loan bank terms, one per column of od_rates
+        regular_rates (array-like): Regular loan rate in % p.a. per profile and bank
+        od_rates (array-like): Overdraft loan rate in % p.a. per profile and bank
+        tenure (int): Tenure in months
+        surplus_initial (float): Amount parked in the OD account on day 1
+        surplus_monthly (float): Amount added to the OD account every month
+        tax_slab (float): Income tax slab in %
+        old_regime (bool): Whether the old tax regime applies
+        prop_type (str): "Self-Occupied" or "Let-Out"
+        annual_prepay (float): Yearly prepayment on the regular loan
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+        daily_accrual (dict, optional): Daily overdraft interest (see evaluate_overdraft_scenarios)
+
+    Returns:
+        dict: {
+            'regular_net_cost', 'od_net_cost': np.ndarray (profiles x banks),
+            'distinct_rates': int (rates simulated over both loan types)
+        }
+    """
+    regular_rates = np.asarray(regular_rates, dtype=float)
+    od_rates = np.asarray(od_rates, dtype=float)
+
+    rates, inverse = np.unique(regular_rates, return_inverse=True)
+    loan = (amount, rates.tolist(), tenure)
+    interest = regular_yearly(*loan, annual_prepay, prepay_month)["total_interest"]
+    tax_benefit = regular_schedule_tax(*loan, tax_slab, old_regime, prop_type, annual_prepay, prepay_month)
+    inverse = inverse.reshape(regular_rates.shape)
+    regular_net_cost = interest[inverse] + loan_processing_fees(amount, regular_terms) - tax_benefit[inverse]
+
+    od_unique, od_inverse = np.unique(od_rates, return_inverse=True)
+    account = (amount, od_unique.tolist(), tenure, surplus_initial, surplus_monthly)
+    od_interest = overdraft_yearly(*account, daily_accrual=daily_accrual)["total_interest_paid"]
+    od_tax_benefit = overdraft_schedule_tax(*account, tax_slab, old_regime, prop_type, daily_accrual=daily_accrual)
+    od_charges = np.array([term["od_charge"] for term in od_terms])
+    od_inverse = od_inverse.reshape(od_rates.shape)
+    od_net_cost = (od_interest[od_inverse] + loan_processing_fees(amount, od_terms) + od_charges
+                   - od_tax_benefit[od_inverse])
+
+    return {
+        "regular_net_cost": regular_net_cost,
+        "od_net_cost": od_net_cost,
+        "distinct_rates": len(rates) + len(od_unique)
+    }
@@ -0,0 +1,147 @@
+"""
+Loan Results - Compact read-only per-bank results backed by the batch arrays they were computed in
+"""
+from collections.abc import Mapping
+
+import numpy as np
+
+from .tax import tax_benefits, TAX_REGIMES, PROPERTY_TYPES
+
+
+def _scalar(key):
+    return property(lambda self: float(self._batch[key][self._index]))
+
+
+def _yearly(key):
+    # Read-only view of this bank's loan years, no copy
+    return property(lambda self: self._batch[key][self._index, :self.years])
+
+
+class _LoanResult(Mapping):
+    """
+    One bank's result as a read-only record over the arrays of its whole batch
+
+    Reads like the dict it replaces (result["net_cost"], result.get(...), {**result})
+    but only holds a reference to the shared batch and its row. Yearly values are
+    NumPy views; the monthly schedule, cumulative sums and tax breakdown are
+    derived on first access and kept.
+    """
+    __slots__ = ("_batch", "_index", "_schedule", "_tax_breakdown")
+    FIELDS = ()
+
+    def __init__(self, batch, index):
+        object.__setattr__(self, "_batch", batch)
+        object.__setattr__(self, "_index", index)
+        object.__setattr__(self, "_schedule", None)
+        object.__setattr__(self, "_tax_breakdown", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Loan results are read-only")
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(interest_rate={self.interest_rate!r}, net_cost={self.net_cost:,.0f})"
+
+    @property
+    def months(self):
+        return int(self._batch["months"][self._index])
+
+    @property
+    def years(self):
+        return -(-self.months // 12)
+
+    @property
+    def interest_rate(self):
+        return self._batch["interest_rates"][self._index]
+
+    @property
+    def cumulative_interest(self):
+        """Interest paid by the end of each loan year"""
+        return np.cumsum(self.yearly_interest)
+
+    @property
+    def cumulative_principal(self):
+        """Principal repaid by the end of each loan year"""
+        return np.cumsum(self.yearly_principal)
+
+    @property
+    def schedule(self):
+        """
+        Month-by-month schedule of this bank (e.g. 'interest', 'principal'), computed on first access
+
+        Comes from the cached schedule stage of the batch, sliced to the months the loan runs.
+        """
+        if self._schedule is None:
+            stage = self._batch["schedule"]()
+            object.__setattr__(self, "_schedule", {
+                key: value[self._index, :self.months] for key, value in stage.items()
+                if isinstance(value, np.ndarray) and value.ndim == 2
+            })
+        return self._schedule
+
+    @property
+    def tax_breakdown(self):
+        """
+        Yearly 80C and 24(b) benefit under the batch's regime and property type, computed on first access
+
+        Returns:
+            dict: {'section_80c', 'section_24b', 'yearly': np.ndarray (per loan year)}
+        """
+        if self._tax_breakdown is None:
+            tax_slab, old_regime, prop_type, principal_eligible = self._batch["tax"]
+            benefits = tax_benefits(self.yearly_principal, self.yearly_interest, tax_slab, principal_eligible)
+            regime = (TAX_REGIMES.index("Old" if old_regime else "New"), PROPERTY_TYPES.index(prop_type))
+            object.__setattr__(self, "_tax_breakdown", {
+                key: benefits[key][regime] for key in ("section_80c", "section_24b", "yearly")
+            })
+        return self._tax_breakdown
+
+    yearly_principal = _yearly("yearly_principal")
+    yearly_interest = _yearly("yearly_interest")
+    emi = _scalar("emi")
+    processing_fee = _scalar("processing_fee")
+    total_tax_benefit = _scalar("total_tax_benefit")
+    net_cost = _scalar("net_cost")
+
+
+class RegularLoanResult(_LoanResult):
+    """Cost of one bank's regular EMI home loan (see evaluate_regular_scenarios)"""
+    __slots__ = ()
+    FIELDS = ("emi", "final_emi", "total_payment", "total_interest", "processing_fee", "total_tax_benefit",
+              "net_cost", "interest_rate", "yearly_principal", "yearly_interest", "actual_tenure_months",
+              "total_prepayments")
+
+    final_emi = _scalar("final_emi")  # EMI after last prepayment
+    total_payment = _scalar("total_payment")
+    total_interest = _scalar("total_interest")
+    total_prepayments = _scalar("total_prepayments")
+
+    @property
+    def actual_tenure_months(self):
+        return self.months
+
+
+class OverdraftLoanResult(_LoanResult):
+    """Cost of one bank's home loan with overdraft (see overdraft_scenario_results)"""
+    __slots__ = ()
+    FIELDS = ("emi", "total_interest_paid", "total_interest_saved", "processing_fee", "od_charge",
+              "total_tax_benefit", "net_cost", "interest_rate", "yearly_principal", "yearly_interest",
+              "final_od_balance")
+
+    total_interest_paid = _scalar("total_interest_paid")
+    total_interest_saved = _scalar("total_interest_saved")
+    final_od_balance = _scalar("final_od_balance")
+
+    @property
+    def od_charge(self):
+        return self._batch["od_charges"][self._index]
@@ -0,0 +1,131 @@
+"""
+Scenario Cache - Bounded LRU memoization for loan calculations keyed on normalized inputs
+"""
+import numbers
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import wraps
+from types import MappingProxyType
+
+# Types normalized inline when they sit in a sequence or dict (bool is deliberately not one of them)
+_PLAIN_NUMBERS = (int, float)
+
+# Already immutable, so freeze returns them without a recursive call
+_IMMUTABLE = (int, float, bool, str, type(None))
+
+
+def normalize_key(value):
+    """
+    Convert scenario inputs into a canonical, hashable key
+
+    Numbers become floats (so 5000000 and 5000000.0 share an entry), lists,
+    tuples and arrays become tuples, and dicts become sorted item tuples.
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    # Plain types first: the abstract-class checks below are much slower
+    if isinstance(value, (int, float)):
+        return float(value)
+    # Most items are plain numbers, so they skip the recursive call
+    if isinstance(value, (list, tuple)):
+        return tuple([float(item) if type(item) in _PLAIN_NUMBERS else normalize_key(item) for item in value])
+    if isinstance(value, Mapping):
+        return tuple(sorted([(key, float(item) if type(item) in _PLAIN_NUMBERS else normalize_key(item))
+                             for key, item in value.items()]))
+    if isinstance(value, numbers.Real):  # NumPy integer and float scalars
+        return float(value)
+    if hasattr(value, "ravel"):  # NumPy array, duck-typed so NumPy is never imported here
+        return ("ndarray", value.shape, tuple(value.ravel().tolist()))
+    raise TypeError(f"Cannot use {type(value).__name__} in a scenario cache key")
+
+
+def freeze(value):
+    """
+    Make a calculation result read-only so cached entries cannot be changed by callers
+
+    Dicts become read-only mappings, lists become tuples and arrays are marked
+    non-writeable. Scalars, strings and other objects (e.g. the read-only result
+    records of engine.results) are returned as they are.
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: item if type(item) in _IMMUTABLE else freeze(item)
+                                 for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple([item if type(item) in _IMMUTABLE else freeze(item) for item in value])
+    if hasattr(value, "flags") and value.flags.writeable:  # NumPy array (NumPy scalars are already read-only)
+        value.flags.writeable = False
+    return value
+
+
+class ScenarioCache:
+    """Thread-safe bounded LRU cache with hit/miss counters shared by all sessions"""
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Compute outside the lock so slow scenarios don't block other sessions
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize
+            }
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Process-wide cache for the app's loan calculations
+SCENARIO_CACHE = ScenarioCache()
+
+# Month-by-month schedules are the largest results, so they get a smaller cache of their own
+SCHEDULE_CACHE = ScenarioCache(maxsize=32)
+
+
+def memoize_scenario(cache=SCENARIO_CACHE):
+    """
+    Decorator that memoizes a calculation on its normalized arguments
+
+    The function's name is part of the key, so one cache can serve several
+    functions. Results are frozen before they are stored.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, normalize_key(args), normalize_key(kwargs) if kwargs else ())
+            return cache.get_or_compute(key, lambda: freeze(func(*args, **kwargs)))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,273 @@
+"""
+Schedule View - Full month-by-month schedules of a batch of loans, built lazily and exported without row dicts
+"""
+import csv
+import io
+from collections import namedtuple
+
+import numpy as np
+
+from .amortization import calculate_emi, BALANCE_EPSILON
+from .loans import regular_schedule, overdraft_schedule
+
+# Parquet export needs pyarrow; everything else works without it
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pa = pq = None
+    PARQUET_AVAILABLE = False
+
+SCHEDULE_COLUMNS = ("month", "opening_balance", "interest", "principal", "prepayment", "od_balance",
+                    "closing_balance")
+
+# One month of a schedule, as yielded by iter_regular_schedule / iter_overdraft_schedule
+ScheduleRow = namedtuple("ScheduleRow", SCHEDULE_COLUMNS)
+
+
+class ScheduleView:
+    """
+    Month-by-month schedule of every loan in a batch, as columns derived on first access
+
+    Holds only a callable returning the batch's schedule stage (cached by the
+    engine), and derives each column as one (loans x months) array the first time
+    it is read; months after a loan closes are zero. Exports write one loan at a
+    time straight from those arrays, so no per-row objects are ever built.
+    """
+    __slots__ = ("labels", "_amount", "_stage", "_surplus", "_schedule", "_columns")
+
+    def __init__(self, labels, amount, stage, surplus=None):
+        """
+        Args:
+            labels (list): One label per loan (e.g. the bank name)
+            amount (float): Loan amount
+            stage (callable): Returns the schedule stage (see regular_schedule / overdraft_schedule)
+            surplus (tuple, optional): (surplus_initial, surplus_monthly) for overdraft loans
+        """
+        self.labels = tuple(labels)
+        self._amount = amount
+        self._stage = stage
+        self._surplus = surplus
+        self._schedule = None
+        self._columns = {}
+
+    def _data(self):
+        if self._schedule is None:
+            self._schedule = self._stage()
+        return self._schedule
+
+    @property
+    def months(self):
+        """Months each loan runs"""
+        return np.asarray(self._data()["months"])
+
+    def __len__(self):
+        return int(self.months.sum())
+
+    def column(self, name):
+        """One schedule column as a read-only (loans x months) array, computed on first access"""
+        if name not in SCHEDULE_COLUMNS:
+            raise KeyError(name)
+        if name not in self._columns:
+            for key, value in self._derive(name).items():
+                if value.flags.writeable:
+                    value.flags.writeable = False
+                self._columns[key] = value
+        return self._columns[name]
+
+    def _derive(self, name):
+        schedule = self._data()
+        interest = schedule["interest"]
+        width = interest.shape[1]
+        active = np.arange(width) < self.months[:, None]
+
+        if name == "month":
+            return {"month": np.broadcast_to(np.arange(1, width + 1), interest.shape)}
+        if name in ("interest", "principal"):
+            return {name: schedule[name]}
+        if name == "prepayment":
+            return {"prepayment": schedule.get("prepayment", np.zeros_like(interest))}
+
+        # Balances: closing from the engine when it tracks it, else from the principal repaid
+        repaid = self.column("principal") + self.column("prepayment")
+        if "outstanding" in schedule:
+            closing = schedule["outstanding"]
+        else:
+            closing = np.where(active, self._amount - np.cumsum(repaid, axis=1), 0.0)
+        columns = {"closing_balance": closing, "opening_balance": np.where(active, closing + repaid, 0.0)}
+
+        if "od_balance" in schedule:  # Daily accrual tracks the OD balance itself
+            od_balance = schedule["od_balance"]
+        elif self._surplus is None:
+            od_balance = np.zeros_like(interest)
+        else:
+            # Month-end OD balance: surplus added each month, capped at the outstanding loan.
+            # The outstanding only falls, so once the cap binds it binds for good.
+            surplus_initial, surplus_monthly = (np.asarray(value, dtype=float).reshape(-1, 1)
+                                                for value in self._surplus)
+            parked = surplus_initial + surplus_monthly * np.arange(1, width + 1)
+            od_balance = np.where(active, np.minimum(parked, np.maximum(closing, 0)), 0.0)
+        columns["od_balance"] = od_balance
+        return columns
+
+    def loan(self, index):
+        """One loan's schedule as a dict of read-only column arrays (views, one entry per month)"""
+        months = int(self.months[index])
+        return {name: self.column(name)[index, :months] for name in SCHEDULE_COLUMNS}
+
+    def to_csv(self, target, float_format="%.2f"):
+        """
+        Write the schedule of every loan as CSV, one loan at a time
+
+        Args:
+            target (str or file): Path, or a text file object to write to
+            float_format (str): printf-style format for amounts
+        """
+        if isinstance(target, str):
+            with open(target, 'w', encoding='utf-8', newline='') as f:
+                return self.to_csv(f, float_format)
+
+        target.write(",".join(("loan",) + SCHEDULE_COLUMNS) + "\n")
+        fmt = ",".join(["%d"] + [float_format] * (len(SCHEDULE_COLUMNS) - 1))
+        for index, label in enumerate(self.labels):
+            loan = self.loan(index)
+            if not len(loan["month"]):
+                continue
+            # Format the numbers in one call, then prefix every line with the (quoted) label
+            prefix = io.StringIO()
+            csv.writer(prefix, lineterminator=",").writerow([label])
+            rows = io.StringIO()
+            np.savetxt(rows, np.column_stack([loan[name] for name in SCHEDULE_COLUMNS]), fmt=fmt)
+            target.write(prefix.getvalue() + rows.getvalue()[:-1].replace("\n", "\n" + prefix.getvalue()) + "\n")
+
+    def to_parquet(self, target):
+        """
+        Write the schedule of every loan as Parquet, one row group per loan (requires pyarrow)
+
+        Args:
+            target (str or file): Path, or a binary file object to write to
+        """
+        if not PARQUET_AVAILABLE:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+
+        schema = pa.schema([("loan", pa.string()), ("month", pa.int32())]
+                           + [(name, pa.float64()) for name in SCHEDULE_COLUMNS[1:]])
+        with pq.ParquetWriter(target, schema) as writer:
+            for index, label in enumerate(self.labels):
+                loan = self.loan(index)
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.repeat(label, len(loan["month"])), pa.array(loan["month"], pa.int32())]
+                    + [pa.array(loan[name]) for name in SCHEDULE_COLUMNS[1:]],
+                    schema=schema
+                ))
+
+
+def regular_schedule_view(labels, amount, interest_rates, tenure, annual_prepay=0, prepay_month=12,
+                          rate_events=(), reset_policy="recompute_emi"):
+    """
+    Full monthly schedule of regular EMI loans, one per interest rate (see regular_schedule)
+
+    Nothing is simulated until a column is read or the view is exported.
+
+    Returns:
+        ScheduleView: Loans labelled with labels (one per rate)
+    """
+    return ScheduleView(labels, amount, lambda: regular_schedule(
+        amount, interest_rates, tenure, annual_prepay, prepay_month, rate_events, reset_policy
+    ))
+
+
+def overdraft_schedule_view(labels, amount, interest_rates, tenure, surplus_initial, surplus_monthly,
+                            rate_events=(), reset_policy="recompute_emi", daily_accrual=None):
+    """
+    Full monthly schedule of overdraft loans, one per interest rate (see overdraft_schedule)
+
+    Nothing is simulated until a column is read or the view is exported.
+
+    Returns:
+        ScheduleView: Loans labelled with labels (one per rate)
+    """
+    return ScheduleView(labels, amount, lambda: overdraft_schedule(
+        amount, interest_rates, tenure, surplus_initial, surplus_monthly, rate_events, reset_policy, daily_accrual
+    ), surplus=(surplus_initial, surplus_monthly))
+
+
+def iter_regular_schedule(amount, annual_rate, tenure, annual_prepay=0, prepay_month=12):
+    """
+    Yield a regular EMI loan's schedule one month at a time, stopping when the loan closes
+
+    Each month is computed only when it is requested, so callers that need the
+    first few months, or stop at a condition (e.g. with itertools.takewhile), never
+    pay for the rest of the tenure. Follows amortize_regular month by month: the
+    prepayment is made in prepay_month every year and the EMI is then recomputed
+    over the remaining tenure. Values agree with amortize_regular to rounding.
+
+    Args:
+        amount (float): Loan amount
+        annual_rate (float): Interest rate in % p.a.
+        tenure (int): Tenure in months
+        annual_prepay (float): Prepayment made once every year
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+
+    Yields:
+        ScheduleRow: One row per month (od_balance is always 0)
+    """
+    monthly_rate = annual_rate / (12 * 100)
+    emi = calculate_emi(amount, annual_rate, tenure)
+    outstanding = float(amount)
+
+    for month in range(1, tenure + 1):
+        opening = outstanding
+        interest = opening * monthly_rate
+        principal = min(emi - interest, opening)
+        outstanding -= principal
+
+        prepayment = 0.0
+        if annual_prepay > 0 and month % 12 == prepay_month % 12 and month < tenure and outstanding >= BALANCE_EPSILON:
+            prepayment = min(annual_prepay, outstanding)
+            outstanding -= prepayment
+            if outstanding >= BALANCE_EPSILON:
+                emi = calculate_emi(outstanding, annual_rate, tenure - month)
+
+        yield ScheduleRow(month, opening, interest, principal, prepayment, 0.0, outstanding)
+        if outstanding < BALANCE_EPSILON:
+            return
+
+
+def iter_overdraft_schedule(amount, annual_rate, tenure, surplus_initial, surplus_monthly):
+    """
+    Yield an overdraft loan's schedule one month at a time, stopping when the loan closes
+
+    Month-by-month version of the monthly overdraft model (see
+    simulate_overdraft_reference): interest is charged on the outstanding minus
+    the OD balance, and the OD balance grows by the monthly surplus, capped at
+    the outstanding loan. Nothing beyond the requested months is computed.
+
+    Args:
+        amount (float): Loan amount
+        annual_rate (float): Interest rate in % p.a.
+        tenure (int): Tenure in months
+        surplus_initial (float): Amount parked in the OD account on day 1
+        surplus_monthly (float): Amount added to the OD account every month
+
+    Yields:
+        ScheduleRow: One row per month (od_balance at the month end, prepayment always 0)
+    """
+    monthly_rate = annual_rate / (12 * 100)
+    emi = calculate_emi(amount, annual_rate, tenure)
+    outstanding = float(amount)
+    od_balance = float(surplus_initial)
+
+    for month in range(1, tenure + 1):
+        opening = outstanding
+        interest = max(0, outstanding - od_balance) * monthly_rate
+        principal = emi - interest
+        outstanding -= principal
+
+        # Cap OD balance at outstanding loan (can't park more than loan amount)
+        od_balance = min(od_balance + surplus_monthly, max(0, outstanding))
+
+        yield ScheduleRow(month, opening, interest, principal, 0.0, od_balance, outstanding)
+        if outstanding <= 0:
+            return
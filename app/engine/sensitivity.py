@@ -0,0 +1,333 @@
+"""
+Sensitivity - How much each input moves the net cost of a regular and an overdraft loan (tornado analysis and rate x tenure grids)
+"""
+import numpy as np
+
+from .amortization import amortize_regular_batch, amortize_rate_resets, yearly_totals
+from .overdraft import simulate_overdraft_batch, simulate_overdraft_rate_resets, simulate_overdraft_daily_batch
+from .loans import loan_processing_fees
+from .tax import tax_benefits, TAX_REGIMES, PROPERTY_TYPES
+from .scenario_cache import memoize_scenario
+
+# Inputs that are bumped, with the default bump size (tenure in months, tax slab in % points)
+SENSITIVITY_DELTAS = {
+    "interest_rate": 0.5,
+    "tenure": 60,
+    "surplus_initial": 100000,
+    "surplus_monthly": 5000,
+    "tax_slab": 10,
+    "annual_prepay": 50000
+}
+
+# Grid cells evaluated per batch by savings_grid_interest, sized so a block's (rows x months) arrays stay in cache
+GRID_BLOCK_ROWS = 256
+
+
+def _bumped_scenarios(base, deltas):
+    """Base scenario followed by a down and an up bump of every input, as one array per input"""
+    rows = {name: [value] for name, value in base.items()}
+    for name, delta in deltas.items():
+        for sign in (-1, 1):
+            for column, value in base.items():
+                rows[column].append(value + sign * delta if column == name else value)
+
+    # Bumped inputs cannot go negative (the rate is a shift, floored later)
+    scenarios = {name: np.array(values, dtype=float) for name, values in rows.items()}
+    for name in scenarios:
+        if name != "interest_rate":
+            scenarios[name] = np.maximum(scenarios[name], 0)
+    scenarios["tenure"] = np.maximum(scenarios["tenure"], 12).astype(int)
+    return scenarios
+
+
+def _tax_index(old_regime, prop_type):
+    """Position of a regime and property type on the leading axes of tax_benefits results"""
+    return TAX_REGIMES.index("Old" if old_regime else "New"), PROPERTY_TYPES.index(prop_type)
+
+
+def _shifted_events(rate_events, shift):
+    """Rate events moved in step with a shifted starting rate (floored at zero like the rates)"""
+    return tuple((month, max(new_rate + shift, 0)) for month, new_rate in rate_events)
+
+
+def _stack_years(rows):
+    """Stack per-row loan-year totals of different lengths into one array, zero-padded"""
+    stacked = np.zeros((len(rows), max(len(row) for row in rows)))
+    for values, row in zip(stacked, rows):
+        values[:len(row)] = row
+    return stacked
+
+
+def _regular_years(amount, rates, tenure, annual_prepay, prepay_month, shifts, rate_events, reset_policy):
+    """Loan-year principal (with prepayments) and interest of the regular loan in every row"""
+    if not rate_events and reset_policy == "recompute_emi":
+        if np.ndim(tenure):
+            tenure = np.reshape(tenure, (-1, 1))  # One tenure per row
+        schedule = amortize_regular_batch(amount, rates, tenure, annual_prepay, prepay_month)
+        return yearly_totals(schedule["principal"] + schedule["prepayment"]), yearly_totals(schedule["interest"])
+
+    # Rate resets: one row at a time, each with its events shifted like its rate
+    principal, interest = [], []
+    prepays = np.broadcast_to(annual_prepay, (len(rates), 1))[:, 0]
+    for rate, prepay, shift in zip(rates.tolist(), prepays.tolist(), shifts.tolist()):
+        schedule = amortize_rate_resets(amount, rate, tenure, _shifted_events(rate_events, shift), reset_policy,
+                                        prepay, prepay_month)
+        principal.append(yearly_totals(schedule["principal"] + schedule["prepayment"]))
+        interest.append(yearly_totals(schedule["interest"]))
+    return _stack_years(principal), _stack_years(interest)
+
+
+def _overdraft_years(amount, rates, tenure, surplus_initial, surplus_monthly, shifts, rate_events, reset_policy,
+                     daily_accrual):
+    """Loan-year interest of the overdraft loan in every row"""
+    if daily_accrual is not None:
+        if rate_events:
+            raise ValueError("Daily accrual does not support rate reset events")
+        simulation = simulate_overdraft_daily_batch(amount, rates, tenure, surplus_initial, surplus_monthly,
+                                                    **daily_accrual)
+        return yearly_totals(simulation["interest"])
+    if not rate_events and reset_policy == "recompute_emi":
+        return yearly_totals(simulate_overdraft_batch(amount, rates, tenure, surplus_initial, surplus_monthly)["interest"])
+
+    rows = np.broadcast_arrays(rates, surplus_initial, surplus_monthly, shifts)
+    return _stack_years([
+        yearly_totals(simulate_overdraft_rate_resets(amount, rate, tenure, initial, monthly,
+                                                     _shifted_events(rate_events, shift), reset_policy)["interest"])
+        for rate, initial, monthly, shift in zip(*(row.tolist() for row in rows))
+    ])
+
+
+def _interest_and_deductions(amount, regular_rates, od_rates, tenure, annual_prepay, prepay_month,
+                             surplus_initial, surplus_monthly, rate_shifts=0.0, rate_events=(), od_rate_events=(),
+                             reset_policy="recompute_emi", daily_accrual=None):
+    """
+    Total interest and tax-deductible amount of both loans in every row
+
+    The deductible amount is the tax benefit at a 100% slab for every regime and
+    property type (leading axes as in tax_benefits); the benefit is linear in the
+    slab, so callers pick their regime and scale by the slab.
+
+    rate_events (regular loan) and od_rate_events (overdraft loan) are the base
+    scenario's rate changes; each row's events move by its rate shift. They,
+    reset_policy and daily_accrual pick the engine as the regular_schedule and
+    overdraft_schedule stages do; rate resets and daily accrual are evaluated
+    one row at a time and need one tenure (int) for all rows; the fixed-rate
+    monthly engines also take one tenure per row.
+    """
+    shifts = np.broadcast_to(np.asarray(rate_shifts, dtype=float), np.shape(regular_rates))
+    yearly_principal, yearly_interest = _regular_years(amount, regular_rates, tenure, annual_prepay, prepay_month,
+                                                       shifts, rate_events, reset_policy)
+    regular_deductible = tax_benefits(yearly_principal, yearly_interest, 100)["total"]
+
+    od_yearly_interest = _overdraft_years(amount, od_rates, tenure, surplus_initial, surplus_monthly, shifts,
+                                          od_rate_events, reset_policy, daily_accrual)
+    od_deductible = tax_benefits(od_yearly_interest, od_yearly_interest, 100, principal_eligible=False)["total"]
+
+    return (yearly_interest.sum(axis=1), regular_deductible,
+            od_yearly_interest.sum(axis=1), od_deductible)
+
+
+@memoize_scenario()
+def sensitivity_analysis(amount, regular_term, od_term, tenure, surplus_initial, surplus_monthly,
+                         tax_slab, old_regime, prop_type, annual_prepay=0, prepay_month=12, deltas=None,
+                         rate_events=(), od_rate_events=(), reset_policy="recompute_emi", daily_accrual=None):
+    """
+    Net cost of both loans with every input bumped down and up by a delta, evaluated as one batch
+
+    Every bumped scenario is a row of the same batch. The interest rate bump moves
+    both banks' rates (and their rate change events); surplus bumps only affect the
+    overdraft loan and the prepayment bump only the regular loan. The tax benefit is
+    linear in the tax slab, so it is computed once per schedule at a 100% slab and
+    scaled per row. Tenure changes the schedule length, so rows are grouped by
+    tenure and each engine runs once per distinct tenure (three at most).
+
+    Args:
+        amount (float): Loan amount
+        regular_term (dict): Regular loan bank terms
+        od_term (dict): Overdraft loan bank terms
+        tenure (int): Tenure in months
+        surplus_initial (float): Amount parked in the OD account on day 1
+        surplus_monthly (float): Amount added to the OD account every month
+        tax_slab (float): Income tax slab in %
+        old_regime (bool): Whether the old tax regime applies
+        prop_type (str): "Self-Occupied" or "Let-Out"
+        annual_prepay (float): Yearly prepayment on the regular loan
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+        deltas (dict, optional): Bump size per input (keys of SENSITIVITY_DELTAS; default: all of them)
+        rate_events (iterable): (month, new_rate) rate changes of the regular loan
+        od_rate_events (iterable): (month, new_rate) rate changes of the overdraft loan
+        reset_policy (str): "recompute_emi" or "extend_tenure" (see amortize_rate_resets)
+        daily_accrual (dict, optional): Daily interest on the overdraft loan (see evaluate_overdraft_scenarios)
+
+    Returns:
+        dict: {
+            'inputs': tuple of bumped input names,
+            'low_values', 'high_values': np.ndarray (bumped value of each input; rate shift for interest_rate),
+            'base': {'regular_net_cost', 'od_net_cost', 'savings': float},
+            'low', 'high': {'regular_net_cost', 'od_net_cost', 'savings': np.ndarray (one per input)}
+        }
+    """
+    deltas = dict(SENSITIVITY_DELTAS if deltas is None else deltas)
+    unknown = set(deltas) - set(SENSITIVITY_DELTAS)
+    if unknown:
+        raise ValueError(f"Unknown sensitivity input(s): {', '.join(sorted(unknown))}")
+
+    base = {
+        "interest_rate": 0.0,  # Shift added to both banks' rates
+        "tenure": tenure,
+        "surplus_initial": surplus_initial,
+        "surplus_monthly": surplus_monthly,
+        "tax_slab": tax_slab,
+        "annual_prepay": annual_prepay
+    }
+    rows = _bumped_scenarios(base, deltas)
+    regular_rates = np.maximum(regular_term["interest_rate"] + rows["interest_rate"], 0)
+    od_rates = np.maximum(od_term["interest_rate"] + rows["interest_rate"], 0)
+
+    regular_interest = np.zeros(len(regular_rates))
+    regular_deductible = np.zeros(len(regular_rates))
+    od_interest = np.zeros(len(regular_rates))
+    od_deductible = np.zeros(len(regular_rates))
+
+    regime = _tax_index(old_regime, prop_type)
+    for months in np.unique(rows["tenure"]):
+        group = rows["tenure"] == months
+        interest, deductible, interest_od, deductible_od = _interest_and_deductions(
+            amount, regular_rates[group], od_rates[group], int(months), rows["annual_prepay"][group][:, None],
+            prepay_month, rows["surplus_initial"][group], rows["surplus_monthly"][group],
+            rows["interest_rate"][group], rate_events, od_rate_events, reset_policy, daily_accrual
+        )
+        regular_interest[group], regular_deductible[group] = interest, deductible[regime]
+        od_interest[group], od_deductible[group] = interest_od, deductible_od[regime]
+
+    slab = rows["tax_slab"] / 100
+    regular_fee = loan_processing_fees(amount, [regular_term])[0]
+    od_fee = loan_processing_fees(amount, [od_term])[0] + od_term["od_charge"]
+    regular_net_cost = regular_interest + regular_fee - regular_deductible * slab
+    od_net_cost = od_interest + od_fee - od_deductible * slab
+    savings = regular_net_cost - od_net_cost
+
+    names = tuple(deltas)
+    low, high = slice(1, None, 2), slice(2, None, 2)
+
+    def bumped(side):
+        return {
+            "regular_net_cost": regular_net_cost[side],
+            "od_net_cost": od_net_cost[side],
+            "savings": savings[side]
+        }
+
+    return {
+        "inputs": names,
+        "low_values": np.array([rows[name][1 + 2 * i] for i, name in enumerate(names)]),
+        "high_values": np.array([rows[name][2 + 2 * i] for i, name in enumerate(names)]),
+        "base": {
+            "regular_net_cost": float(regular_net_cost[0]),
+            "od_net_cost": float(od_net_cost[0]),
+            "savings": float(savings[0])
+        },
+        "low": bumped(low),
+        "high": bumped(high)
+    }
+
+
+@memoize_scenario()
+def savings_grid_interest(amount, regular_rate, od_rate, rates, tenures, surplus_initial, surplus_monthly,
+                          annual_prepay=0, prepay_month=12):
+    """
+    Simulation stage of savings_grid: interest and deductible amounts on the rate x tenure grid
+
+    Every (rate, tenure) cell is one row of the batch, each masked after its own
+    tenure. Rows are ordered by tenure and evaluated GRID_BLOCK_ROWS at a time, so
+    every block is padded only to its own longest tenure and its arrays stay in cache.
+    Independent of tax slab, regime and fees, so changing those reuses this stage.
+
+    Returns:
+        dict: {
+            'regular_interest', 'od_interest': np.ndarray (rates x tenures),
+            'regular_deductible', 'od_deductible': np.ndarray (regimes x property types x rates x tenures,
+            tax benefit at a 100% slab)
+        }
+    """
+    rates = np.asarray(rates, dtype=float)
+    tenures = np.asarray(tenures, dtype=int)
+    od_rates = np.maximum(rates + (od_rate - regular_rate), 0)
+
+    # Rows run tenure by tenure, so each block is padded only to its own longest tenure
+    rows = len(tenures) * len(rates)
+    row_rates = np.tile(rates, len(tenures))
+    row_od_rates = np.tile(od_rates, len(tenures))
+    row_tenures = np.repeat(tenures, len(rates))
+
+    regular_interest, od_interest = np.zeros(rows), np.zeros(rows)
+    regular_deductible = np.zeros((len(TAX_REGIMES), len(PROPERTY_TYPES), rows))
+    od_deductible = np.zeros_like(regular_deductible)
+    for start in range(0, rows, GRID_BLOCK_ROWS):
+        block = slice(start, start + GRID_BLOCK_ROWS)
+        (regular_interest[block], regular_deductible[..., block],
+         od_interest[block], od_deductible[..., block]) = _interest_and_deductions(
+            amount, row_rates[block], row_od_rates[block], row_tenures[block], annual_prepay, prepay_month,
+            surplus_initial, surplus_monthly
+        )
+
+    def grid(values):
+        return np.swapaxes(values.reshape(values.shape[:-1] + (len(tenures), len(rates))), -1, -2)
+
+    return {
+        "regular_interest": grid(regular_interest),
+        "od_interest": grid(od_interest),
+        "regular_deductible": grid(regular_deductible),
+        "od_deductible": grid(od_deductible)
+    }
+
+
+@memoize_scenario()
+def savings_grid(amount, regular_term, od_term, rates, tenures, surplus_initial, surplus_monthly,
+                 tax_slab, old_regime, prop_type, annual_prepay=0, prepay_month=12):
+    """
+    Net cost of both loans and the overdraft savings over a grid of interest rates and tenures
+
+    The rate axis is the regular loan's rate; the overdraft rate keeps its current
+    spread over it. Every cell is one row of a single batched evaluation (see
+    savings_grid_interest). This is the fixed-rate model with monthly interest:
+    rate change scenarios and daily accrual are not applied, since they would
+    need one simulation per cell. The simulation comes from the cached
+    savings_grid_interest stage, so tax changes only redo the final step.
+
+    Args:
+        amount (float): Loan amount
+        regular_term (dict): Regular loan bank terms
+        od_term (dict): Overdraft loan bank terms
+        rates (array-like): Regular loan interest rates in % p.a.
+        tenures (array-like): Tenures in months
+        surplus_initial (float): Amount parked in the OD account on day 1
+        surplus_monthly (float): Amount added to the OD account every month
+        tax_slab (float): Income tax slab in %
+        old_regime (bool): Whether the old tax regime applies
+        prop_type (str): "Self-Occupied" or "Let-Out"
+        annual_prepay (float): Yearly prepayment on the regular loan
+        prepay_month (int): Month of year (1-12) when the prepayment is made
+
+    Returns:
+        dict: {
+            'rates', 'tenures': np.ndarray (grid axes),
+            'regular_net_cost', 'od_net_cost', 'savings': np.ndarray (rates x tenures)
+        }
+    """
+    grid = savings_grid_interest(amount, regular_term["interest_rate"], od_term["interest_rate"], rates, tenures,
+                                 surplus_initial, surplus_monthly, annual_prepay, prepay_month)
+    regime = _tax_index(old_regime, prop_type)
+
+    slab = tax_slab / 100
+    regular_net_cost = (grid["regular_interest"] + loan_processing_fees(amount, [regular_term])[0]
+                        - grid["regular_deductible"][regime] * slab)
+    od_net_cost = (grid["od_interest"] + loan_processing_fees(amount, [od_term])[0] + od_term["od_charge"]
+                   - grid["od_deductible"][regime] * slab)
+
+    return {
+        "rates": np.asarray(rates, dtype=float),
+        "tenures": np.asarray(tenures, dtype=int),
+        "regular_net_cost": regular_net_cost,
+        "od_net_cost": od_net_cost,
+        "savings": regular_net_cost - od_net_cost
+    }
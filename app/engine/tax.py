@@ -0,0 +1,95 @@
+"""
+Tax Engine - Home loan tax benefits under Section 80C and 24(b) for both regimes and property types
+"""
+import numpy as np
+
+TAX_REGIMES = ("Old", "New")
+PROPERTY_TYPES = ("Self-Occupied", "Let-Out")
+
+# Yearly deduction limits
+SECTION_80C_LIMIT = 150000  # Principal repayment (old regime only)
+SECTION_24B_LIMIT = 200000  # Interest on a self-occupied property (let-out: no limit)
+
+
+def deduction_limits(old_regime, prop_type, principal_eligible=True):
+    """
+    Yearly 80C and 24(b) limits for one regime and property type
+
+    New regime: no 80C, and interest is only deductible for a let-out property.
+    principal_eligible=False drops 80C (OD deposits do not count as principal repayment).
+
+    Returns:
+        tuple: (80C limit, 24(b) limit), np.inf where there is no limit
+    """
+    section_80c = SECTION_80C_LIMIT if old_regime and principal_eligible else 0.0
+    if prop_type == "Let-Out":
+        section_24b = np.inf
+    else:
+        section_24b = SECTION_24B_LIMIT if old_regime else 0.0
+    return section_80c, section_24b
+
+
+def tax_benefit(yearly_principal, yearly_interest, tax_slab, old_regime, prop_type, principal_eligible=True):
+    """
+    Total tax benefit over the loan for one regime and property type
+
+    Works on any leading shape (e.g. banks or rate paths) with years on the last axis.
+
+    Args:
+        yearly_principal (np.ndarray): Principal repaid per loan year (prepayments included); ignored
+            when principal_eligible is False
+        yearly_interest (np.ndarray): Interest paid per loan year
+        tax_slab (float): Income tax slab in %
+        old_regime (bool): Whether the old tax regime applies
+        prop_type (str): "Self-Occupied" or "Let-Out"
+        principal_eligible (bool): Whether principal repaid qualifies for 80C
+
+    Returns:
+        np.ndarray: Total tax benefit per leading element
+    """
+    section_80c, section_24b = deduction_limits(old_regime, prop_type, principal_eligible)
+    deduction = np.minimum(yearly_interest, section_24b).sum(axis=-1)
+    if section_80c:
+        deduction = deduction + np.minimum(yearly_principal, section_80c).sum(axis=-1)
+    return deduction * (tax_slab / 100)
+
+
+def tax_benefits(yearly_principal, yearly_interest, tax_slab, principal_eligible=True):
+    """
+    Yearly 80C, 24(b) and total benefits for every regime and property type in one pass
+
+    The limits of all four combinations are broadcast against the yearly amounts,
+    so one loan's schedule gives the old-vs-new comparison without re-simulating.
+
+    Args:
+        yearly_principal (np.ndarray): Principal repaid per loan year (years on the last axis)
+        yearly_interest (np.ndarray): Interest paid per loan year
+        tax_slab (float): Income tax slab in %
+        principal_eligible (bool): Whether principal repaid qualifies for 80C (False for OD loans)
+
+    Returns:
+        dict: {
+            'regimes': TAX_REGIMES, 'property_types': PROPERTY_TYPES,
+            'section_80c', 'section_24b', 'yearly': np.ndarray (regimes x property types x ... x years),
+            'total': np.ndarray (regimes x property types x ..., summed over years)
+        }
+    """
+    yearly_principal = np.asarray(yearly_principal, dtype=float)
+    yearly_interest = np.asarray(yearly_interest, dtype=float)
+    limits = np.array([[deduction_limits(regime == "Old", prop_type, principal_eligible)
+                        for prop_type in PROPERTY_TYPES] for regime in TAX_REGIMES])
+    expand = (slice(None), slice(None)) + (None,) * yearly_interest.ndim
+
+    rate = tax_slab / 100
+    section_80c = np.minimum(yearly_principal, limits[..., 0][expand]) * rate
+    section_24b = np.minimum(yearly_interest, limits[..., 1][expand]) * rate
+    yearly = section_80c + section_24b
+
+    return {
+        "regimes": TAX_REGIMES,
+        "property_types": PROPERTY_TYPES,
+        "section_80c": section_80c,
+        "section_24b": section_24b,
+        "yearly": yearly,
+        "total": yearly.sum(axis=-1)
+    }
@@ -0,0 +1,171 @@
+"""
+Withdrawals - Overdraft cost when money parked in the OD account is withdrawn again, over many random draws
+"""
+import numpy as np
+
+from .amortization import annuity_factors, yearly_totals
+from .loans import loan_processing_fees, overdraft_tax_benefit
+from .scenario_cache import memoize_scenario
+
+
+def generate_withdrawals(draws, months, withdrawals_per_year=2, median_withdrawal=100000,
+                         withdrawal_spread=0.5, seed=None):
+    """
+    Simulate withdrawal requests from the OD account, shape (draws x months)
+
+    The number of withdrawals in a month is Poisson with mean
+    withdrawals_per_year / 12, and their size is log-normal around
+    median_withdrawal (one size per month, scaled by the count).
+
+    Args:
+        draws (int): Number of random draws
+        months (int): Months per draw
+        withdrawals_per_year (float): Expected withdrawals per year
+        median_withdrawal (float): Median size of one withdrawal
+        withdrawal_spread (float): Standard deviation of log withdrawal size (0 for a fixed size)
+        seed (int, optional): Random seed for reproducible draws
+
+    Returns:
+        np.ndarray: Amount requested in every draw and month
+    """
+    rng = np.random.default_rng(seed)
+    counts = rng.poisson(withdrawals_per_year / 12, (draws, months))
+    sizes = median_withdrawal * np.exp(withdrawal_spread * rng.standard_normal((draws, months)))
+    return counts * sizes
+
+
+def simulate_overdraft_withdrawals(amount, annual_rates, tenure, surplus_initial, surplus_monthly,
+                                   withdrawals, repay_months=6, repay_share=1.0):
+    """
+    Simulate the overdraft account for every bank and withdrawal draw at once
+
+    Follows simulate_overdraft_reference, with withdrawals taken from the OD
+    balance after the month's surplus is added. A withdrawal can never exceed
+    what is parked, and repay_share of every withdrawal actually made is paid
+    back into the account in equal parts over the next repay_months months
+    (repay_months=0: never repaid). Withdrawals make the balance path-dependent,
+    so months are stepped one at a time, each over all (banks x draws) at once.
+
+    Args:
+        amount (float): Loan amount
+        annual_rates (array-like): Interest rate in % p.a. per bank
+        tenure (int): Tenure in months
+        surplus_initial (float): Amount parked in the OD account on day 1
+        surplus_monthly (float): Amount added to the OD account every month
+        withdrawals (np.ndarray): Withdrawal requests, shape (draws, months >= tenure)
+        repay_months (int): Months over which a withdrawal is paid back
+        repay_share (float): Share of each withdrawal that is paid back
+
+    Returns:
+        dict: {
+            'interest', 'principal': np.ndarray (banks x draws x months, zero after closure),
+            'emi': np.ndarray (EMI per bank),
+            'months': np.ndarray (months simulated per bank and draw),
+            'withdrawn': np.ndarray (total actually withdrawn per bank and draw),
+            'final_od_balance': np.ndarray (per bank and draw)
+        }
+    """
+    monthly_rate = np.atleast_1d(np.asarray(annual_rates, dtype=float))[:, None] / (12 * 100)
+    emi = amount * annuity_factors(monthly_rate, tenure)
+    shape = (len(monthly_rate), len(withdrawals))
+
+    outstanding = np.full(shape, float(amount))
+    od_balance = np.full(shape, float(surplus_initial))
+    active = np.ones(shape, dtype=bool)
+    months = np.full(shape, tenure)
+
+    # Month-major buffers keep every step's slices contiguous
+    requested = np.ascontiguousarray(np.asarray(withdrawals, dtype=float)[:, :tenure].T)
+    interest = np.zeros((tenure,) + shape)
+    principal = np.zeros((tenure,) + shape)
+
+    # Running total of withdrawals actually made, by the start of each month
+    withdrawn = np.zeros((tenure + 1,) + shape)
+    repay_rate = repay_share / repay_months if repay_months else 0.0
+
+    for month in range(tenure):
+        interest[month] = np.maximum(outstanding - od_balance, 0) * monthly_rate * active
+        principal[month] = (emi - interest[month]) * active
+        outstanding -= principal[month]
+
+        repayment = repay_rate * (withdrawn[month] - withdrawn[max(month - repay_months, 0)])
+        od_balance += surplus_monthly + repayment - requested[month]
+        shortfall = np.minimum(od_balance, 0)  # Can't withdraw more than is parked
+        withdrawn[month + 1] = withdrawn[month] + (requested[month] + shortfall) * active
+
+        # Cap OD balance at outstanding loan (can't park more than loan amount)
+        od_balance = np.minimum(od_balance - shortfall, np.maximum(outstanding, 0))
+
+        closed = active & (outstanding <= 0)
+        months[closed] = month + 1
+        active &= ~closed
+        if not active.any():
+            break
+
+    return {
+        "interest": np.moveaxis(interest, 0, -1),
+        "principal": np.moveaxis(principal, 0, -1),
+        "emi": emi[:, 0],
+        "months": months,
+        "withdrawn": withdrawn[month + 1],
+        "final_od_balance": od_balance
+    }
+
+
+@memoize_scenario()
+def overdraft_withdrawal_risk(amount, terms, tenure, surplus_initial, surplus_monthly,
+                              tax_slab, old_regime, prop_type, withdrawals_per_year=2, median_withdrawal=100000,
+                              withdrawal_spread=0.5, repay_months=6, repay_share=1.0, draws=2000, seed=0,
+                              worst_case_percentile=95):
+    """
+    Expected and worst-case net cost of overdraft loans when the parked money is sometimes withdrawn
+
+    Every bank sees the same withdrawal draws (see generate_withdrawals), so
+    banks are compared like with like. Memoized; with the default fixed seed the
+    results are reproducible. Like simulate_overdraft_reference, this is the
+    fixed-rate model with monthly interest: rate resets and daily accrual are
+    not modelled.
+
+    Args:
+        amount (float): Loan amount
+        terms (list): Bank terms dicts (see loan_terms), each with 'od_charge'
+        tenure (int): Tenure in months
+        surplus_initial (float): Amount parked in the OD account on day 1
+        surplus_monthly (float): Amount added to the OD account every month
+        tax_slab (float): Income tax slab in %
+        old_regime (bool): Whether the old tax regime applies
+        prop_type (str): "Self-Occupied" or "Let-Out"
+        withdrawals_per_year, median_withdrawal, withdrawal_spread: Withdrawal model (see generate_withdrawals)
+        repay_months, repay_share: Repayment behavior (see simulate_overdraft_withdrawals)
+        draws (int): Number of random draws
+        seed (int, optional): Random seed
+        worst_case_percentile (float): Percentile of draws reported as the worst case
+
+    Returns:
+        dict: {
+            'expected_interest', 'expected_net_cost': np.ndarray (mean over draws, per bank),
+            'worst_case_interest', 'worst_case_net_cost': np.ndarray (percentile over draws, per bank),
+            'expected_withdrawn': np.ndarray (mean total withdrawn, per bank),
+            'worst_case_percentile': float
+        }
+    """
+    withdrawals = generate_withdrawals(draws, tenure, withdrawals_per_year, median_withdrawal,
+                                       withdrawal_spread, seed)
+    simulation = simulate_overdraft_withdrawals(
+        amount, [term["interest_rate"] for term in terms], tenure, surplus_initial, surplus_monthly,
+        withdrawals, repay_months, repay_share
+    )
+
+    fees = loan_processing_fees(amount, terms) + np.array([term["od_charge"] for term in terms])
+    interest = simulation["interest"].sum(axis=-1)
+    tax_benefit = overdraft_tax_benefit(yearly_totals(simulation["interest"]), tax_slab, old_regime, prop_type)
+    net_cost = interest + fees[:, None] - tax_benefit
+
+    return {
+        "expected_interest": interest.mean(axis=1),
+        "expected_net_cost": net_cost.mean(axis=1),
+        "worst_case_interest": np.percentile(interest, worst_case_percentile, axis=1),
+        "worst_case_net_cost": np.percentile(net_cost, worst_case_percentile, axis=1),
+        "expected_withdrawn": simulation["withdrawn"].mean(axis=1),
+        "worst_case_percentile": float(worst_case_percentile)
+    }
@@ -4,15 +4,24 @@ import plotly.graph_objects as go
 import plotly.express as px
 import numpy as np
 from datetime import datetime
+import io
 import sys
 import os
 
 # Add utils directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'utils'))
 from rate_loader import get_bank_data_for_app, get_update_status_message
-from rate_calculator import calculate_personalized_rate, get_profile_impact_summary
+from rate_calculator import calculate_personalized_rate, get_profile_impact_summary, profile_grid, personalized_rates
 from number_formatter import format_with_approximation, format_currency_compact
 
+# Loan calculations live in the headless engine package next to this file
+from engine import (
+    loan_terms, evaluate_regular_scenarios, overdraft_scenario_results,
+    overdraft_net_costs, find_break_even_surplus, sweep_overdraft_surplus, monte_carlo_comparison,
+    overdraft_withdrawal_risk, sensitivity_analysis, savings_grid, tax_benefits, PROPERTY_TYPES, profile_sweep,
+    regular_schedule_view, overdraft_schedule_view, PARQUET_AVAILABLE
+)
+
 # Note: Page configuration is set in home_loan_with_payment.py (wrapper file)
 # to avoid duplicate set_page_config error
 
@@ -161,6 +170,38 @@ withdrawal_pattern = st.sidebar.radio(
     help="Will you withdraw from OD account?"
 )
 
+withdrawal_model = None
+if withdrawal_pattern == "Occasional Withdrawals":
+    withdrawal_model = {
+        "withdrawals_per_year": st.sidebar.slider(
+            "Withdrawals per Year", min_value=1, max_value=12, value=2,
+            help="How often you expect to take money back out of the OD account"
+        ),
+        "median_withdrawal": st.sidebar.number_input(
+            "Typical Withdrawal (₹)", min_value=10000, max_value=5000000, value=100000, step=10000,
+            help="Usual size of one withdrawal (actual sizes vary around this)"
+        ),
+        "repay_months": st.sidebar.slider(
+            "Put Back Over (months)", min_value=0, max_value=24, value=6,
+            help="Months over which you top the OD account back up after a withdrawal (0 = never)"
+        )
+    }
+
+daily_interest = st.sidebar.checkbox(
+    "Daily Interest Calculation",
+    value=False,
+    help="Real OD accounts charge interest on each day's closing balance, so the days your salary comes in and your EMI goes out matter"
+)
+
+daily_accrual = None
+if daily_interest:
+    daily_accrual = {
+        "salary_day": st.sidebar.number_input("Salary Credit Day", min_value=1, max_value=31, value=1,
+                                              help="Day of month your monthly surplus reaches the OD account"),
+        "emi_day": st.sidebar.number_input("EMI Debit Day", min_value=1, max_value=31, value=5,
+                                           help="Day of month the EMI is debited")
+    }
+
 # Interest Rate Mode Selection
 st.sidebar.subheader("💳 Interest Rate Mode")
 rate_mode = st.sidebar.radio(
@@ -279,239 +320,184 @@ if enable_manual_rates:
 
     st.sidebar.info("ℹ️ Using custom rates. All other bank parameters (fees, charges) remain from selected banks.")
 
-# Functions for calculations
-def calculate_emi(principal, annual_rate, months):
-    """Calculate EMI for home loan"""
-    monthly_rate = annual_rate / (12 * 100)
-    if monthly_rate == 0:
-        return principal / months
-    emi = principal * monthly_rate * (1 + monthly_rate)**months / ((1 + monthly_rate)**months - 1)
-    return emi
-
-def calculate_regular_home_loan(amount, bank_name, tenure, tax_slab, old_regime, prop_type, annual_prepay=0, prepay_month=12, custom_rate=None):
-    """Calculate complete cost for regular home loan with EMI and optional annual prepayment"""
-    bank_data = BANK_DATA["Regular Home Loan (EMI)"][bank_name]
-
-    # Interest rate (use custom rate if provided, otherwise use bank rate)
-    interest_rate = custom_rate if custom_rate is not None else bank_data["interest_rate"]
-    monthly_rate = interest_rate / (12 * 100)
-
-    # Processing fee
-    processing_fee_pct = bank_data["processing_fee"]
-    processing_fee = max((amount * processing_fee_pct / 100), bank_data["min_processing"]) * 1.18  # With GST
-
-    # Initial EMI calculation
-    base_emi = calculate_emi(amount, interest_rate, tenure)
-
-    # Simulate loan with prepayments
-    outstanding = amount
-    months_elapsed = 0
-    actual_tenure_months = 0
-    current_emi = base_emi
-
-    yearly_principal = []
-    yearly_interest = []
-    total_interest = 0
-    total_principal_paid = 0
-    total_prepayments = 0
-
-    while outstanding > 0.01 and months_elapsed < tenure:  # 0.01 to handle floating point precision
-        months_elapsed += 1
-        month_in_year = ((months_elapsed - 1) % 12) + 1
-        year_idx = (months_elapsed - 1) // 12
-
-        # Initialize yearly arrays if needed
-        if month_in_year == 1:
-            yearly_principal.append(0)
-            yearly_interest.append(0)
-
-        # Calculate interest and principal for this month
-        interest_component = outstanding * monthly_rate
-        principal_component = min(current_emi - interest_component, outstanding)
-
-        # Update tracking
-        outstanding -= principal_component
-        total_interest += interest_component
-        total_principal_paid += principal_component
-
-        yearly_principal[year_idx] += principal_component
-        yearly_interest[year_idx] += interest_component
-
-        # Apply annual prepayment if it's the prepayment month and prepayment is configured
-        if month_in_year == prepay_month and annual_prepay > 0 and outstanding > 0.01:
-            prepayment_amount = min(annual_prepay, outstanding)
-            outstanding -= prepayment_amount
-            total_prepayments += prepayment_amount
-            yearly_principal[year_idx] += prepayment_amount
-
-            # Recalculate EMI for remaining tenure if loan is not fully paid
-            if outstanding > 0.01:
-                remaining_months = tenure - months_elapsed
-                if remaining_months > 0:
-                    current_emi = calculate_emi(outstanding, interest_rate, remaining_months)
-
-        actual_tenure_months = months_elapsed
-
-        # Safety check to avoid infinite loop
-        if outstanding < 0.01:
-            break
-
-    # Calculate total payment
-    total_payment = total_principal_paid + total_interest
-
-    # Calculate tax benefits
-    total_tax_benefit = 0
-
-    if old_regime:
-        for year in range(len(yearly_principal)):
-            # Section 80C - Principal repayment (max 1.5L) - includes prepayments
-            principal_benefit = min(yearly_principal[year], 150000) * (tax_slab / 100)
-
-            # Section 24(b) - Interest deduction
-            if prop_type == "Self-Occupied":
-                interest_benefit = min(yearly_interest[year], 200000) * (tax_slab / 100)
-            else:  # Let-out - no limit
-                interest_benefit = yearly_interest[year] * (tax_slab / 100)
-
-            total_tax_benefit += (principal_benefit + interest_benefit)
-    else:
-        # New regime - only interest benefit for let-out property
-        if prop_type == "Let-Out":
-            for year in range(len(yearly_interest)):
-                interest_benefit = yearly_interest[year] * (tax_slab / 100)
-                total_tax_benefit += interest_benefit
-
-    net_cost = total_interest + processing_fee - total_tax_benefit
-
-    return {
-        "emi": base_emi,  # Original EMI
-        "final_emi": current_emi,  # EMI after last prepayment
-        "total_payment": total_payment,
-        "total_interest": total_interest,
-        "processing_fee": processing_fee,
-        "total_tax_benefit": total_tax_benefit,
-        "net_cost": net_cost,
-        "interest_rate": interest_rate,
-        "yearly_principal": yearly_principal,
-        "yearly_interest": yearly_interest,
-        "outstanding_schedule": [],  # Will calculate if needed
-        "actual_tenure_months": actual_tenure_months,
-        "total_prepayments": total_prepayments
-    }
-
-def calculate_overdraft_home_loan(amount, bank_name, tenure, surplus_initial, surplus_monthly,
-                                   tax_slab, old_regime, prop_type, withdrawal_pattern, custom_rate=None):
-    """Calculate cost for home loan with overdraft facility"""
-    bank_data = BANK_DATA["Home Loan with Overdraft"][bank_name]
-
-    # Interest rate (use custom rate if provided, otherwise use bank rate)
-    interest_rate = custom_rate if custom_rate is not None else bank_data["interest_rate"]
-    monthly_rate = interest_rate / (12 * 100)
-
-    # Processing fee
-    processing_fee_pct = bank_data["processing_fee"]
-    processing_fee = max((amount * processing_fee_pct / 100), bank_data["min_processing"]) * 1.18
-
-    # OD account opening charge
-    od_charge = bank_data["od_charge"]
-
-    # Calculate EMI for the loan amount
-    emi = calculate_emi(amount, interest_rate, tenure)
-
-    # Simulate overdraft account over tenure
-    outstanding = amount
-    od_balance = surplus_initial  # Money in OD account
-    total_interest_paid = 0
-    total_principal_paid = 0
-
-    yearly_principal = []
-    yearly_interest = []
-
-    for month in range(tenure):
-        # Effective outstanding = Loan outstanding - OD balance
-        effective_outstanding = max(0, outstanding - od_balance)
-
-        # Interest on effective outstanding
-        interest_component = effective_outstanding * monthly_rate
-        total_interest_paid += interest_component
-
-        # Principal component
-        principal_component = emi - interest_component
-        total_principal_paid += principal_component
-        outstanding -= principal_component
-
-        # Add monthly surplus to OD account
-        od_balance += surplus_monthly
+# Rate reset scenario (floating rates change with the repo rate)
+st.sidebar.subheader("📉 Rate Change Scenario")
+rate_change = st.sidebar.slider(
+    "Expected Rate Change (%)",
+    min_value=-2.0,
+    max_value=2.0,
+    value=0.0,
+    step=0.25,
+    help="Floating rates move with the RBI repo rate. Model a future rate hike or cut for both loans."
+)
 
-        # Cap OD balance at outstanding loan (can't park more than loan amount)
-        od_balance = min(od_balance, max(0, outstanding))
+rate_change_year = 1
+reset_policy = "recompute_emi"
+if rate_change != 0:
+    rate_change_year = st.sidebar.slider(
+        "Rate Changes From Loan Year",
+        min_value=1,
+        max_value=tenure_years,
+        value=min(2, tenure_years)
+    )
+    reset_policy = st.sidebar.radio(
+        "When Rate Changes, Bank Will",
+        options=["recompute_emi", "extend_tenure"],
+        format_func=lambda x: {"recompute_emi": "Change EMI (same tenure)",
+                               "extend_tenure": "Change Tenure (same EMI)"}[x],
+        help="Most banks keep the EMI and extend the tenure unless you ask them to change the EMI"
+    )
 
-        # Track yearly data
-        year_idx = month // 12
-        if month % 12 == 0:
-            yearly_principal.append(0)
-            yearly_interest.append(0)
+def rate_change_events(start_rate):
+    """Rate reset events for a loan starting at start_rate under the sidebar rate change scenario"""
+    if rate_change == 0:
+        return []
+    return [((rate_change_year - 1) * 12 + 1, start_rate + rate_change)]
 
-        yearly_principal[year_idx] += principal_component
-        yearly_interest[year_idx] += interest_component
+def od_rate_change_events(start_rate):
+    """Rate reset events for the overdraft loan (daily interest mode uses the current rate throughout)"""
+    return rate_change_events(start_rate) if daily_accrual is None else []
 
-        if outstanding <= 0:
-            break
+if rate_change != 0 and daily_accrual is not None:
+    st.sidebar.caption("ℹ️ Daily interest calculation uses the current overdraft rate for the whole tenure.")
 
-    # Calculate tax benefits (same logic as regular loan)
-    total_tax_benefit = 0
+withdrawals_unmodelled = withdrawal_model is not None and (rate_change != 0 or daily_accrual is not None)
+if withdrawals_unmodelled:
+    st.sidebar.caption("ℹ️ Withdrawal costs are simulated with fixed rates and monthly interest, "
+                       "so they are not shown while a rate change or daily interest calculation is on.")
 
-    # Note: OD deposits are NOT eligible for 80C deduction (important!)
-    if old_regime:
-        for year in range(len(yearly_principal)):
-            # Section 80C - Only for actual EMI principal component, not OD deposits
-            # Being conservative, we don't claim 80C as it's complex with OD
-            principal_benefit = 0  # OD deposits not eligible
+# Functions for calculations
+def regular_loan_terms(bank_names, custom_rate=None):
+    """Interest rate and fee terms of each regular home loan bank"""
+    return [loan_terms(BANK_DATA["Regular Home Loan (EMI)"][bank_name], custom_rate) for bank_name in bank_names]
+
+def compare_regular_home_loans(amount, bank_names, tenure, tax_slab, old_regime, prop_type, annual_prepay=0, prepay_month=12, custom_rate=None,
+                               rate_events=(), reset_policy="recompute_emi"):
+    """Calculate complete cost of a regular home loan for several banks in one batched evaluation"""
+    return evaluate_regular_scenarios(
+        amount, regular_loan_terms(bank_names, custom_rate), tenure, tax_slab, old_regime, prop_type,
+        annual_prepay, prepay_month, rate_events, reset_policy
+    )
 
-            # Section 24(b) - Interest deduction (still eligible)
-            if prop_type == "Self-Occupied":
-                interest_benefit = min(yearly_interest[year], 200000) * (tax_slab / 100)
-            else:
-                interest_benefit = yearly_interest[year] * (tax_slab / 100)
+def calculate_regular_home_loan(amount, bank_name, tenure, tax_slab, old_regime, prop_type, annual_prepay=0, prepay_month=12, custom_rate=None,
+                                rate_events=(), reset_policy="recompute_emi"):
+    """
+    Calculate complete cost for regular home loan with EMI and optional annual prepayment
+
+    rate_events is a list of (month, new_rate) floating-rate resets, and reset_policy
+    ("recompute_emi" or "extend_tenure") decides whether the EMI or the tenure changes.
+    """
+    return compare_regular_home_loans(
+        amount, [bank_name], tenure, tax_slab, old_regime, prop_type,
+        annual_prepay, prepay_month, custom_rate=custom_rate, rate_events=rate_events, reset_policy=reset_policy
+    )[0]
+
+def overdraft_loan_terms(bank_names, custom_rate=None):
+    """Interest rate, fee and OD charge terms of each overdraft bank"""
+    return [loan_terms(BANK_DATA["Home Loan with Overdraft"][bank_name], custom_rate) for bank_name in bank_names]
+
+def compare_overdraft_home_loans(amount, bank_names, tenure, surplus_initial, surplus_monthly,
+                                 tax_slab, old_regime, prop_type, withdrawal_pattern, custom_rate=None,
+                                 rate_events=(), reset_policy="recompute_emi", daily_accrual=None,
+                                 withdrawal_model=None):
+    """
+    Calculate cost of a home loan with overdraft facility for several banks in one batched evaluation
+
+    With "Occasional Withdrawals" and a withdrawal_model (keyword arguments of
+    overdraft_withdrawal_risk), each result also gets 'expected_net_cost' and
+    'worst_case_net_cost' over simulated withdrawals. The withdrawal simulation
+    uses fixed rates and monthly interest, so those keys are left out when
+    rate_events or daily_accrual is given.
+    """
+    terms = overdraft_loan_terms(bank_names, custom_rate)
+    results = overdraft_scenario_results(
+        amount, terms, tenure, surplus_initial, surplus_monthly,
+        tax_slab, old_regime, prop_type, rate_events, reset_policy, daily_accrual
+    )
+    if withdrawal_pattern != "Occasional Withdrawals" or not withdrawal_model:
+        return results
+    if rate_events or daily_accrual is not None:
+        return results
+
+    risk = overdraft_withdrawal_risk(amount, terms, tenure, surplus_initial, surplus_monthly,
+                                     tax_slab, old_regime, prop_type, **withdrawal_model)
+    return [
+        {**result,
+         "expected_net_cost": float(risk["expected_net_cost"][i]),
+         "worst_case_net_cost": float(risk["worst_case_net_cost"][i]),
+         "expected_withdrawn": float(risk["expected_withdrawn"][i])}
+        for i, result in enumerate(results)
+    ]
 
-            total_tax_benefit += (principal_benefit + interest_benefit)
-    else:
-        if prop_type == "Let-Out":
-            for year in range(len(yearly_interest)):
-                interest_benefit = yearly_interest[year] * (tax_slab / 100)
-                total_tax_benefit += interest_benefit
-
-    # Interest saved compared to regular loan
-    regular_interest = (emi * tenure) - amount
-    interest_saved = regular_interest - total_interest_paid
-
-    net_cost = total_interest_paid + processing_fee + od_charge - total_tax_benefit
-
-    return {
-        "emi": emi,
-        "total_interest_paid": total_interest_paid,
-        "total_interest_saved": interest_saved,
-        "processing_fee": processing_fee,
-        "od_charge": od_charge,
-        "total_tax_benefit": total_tax_benefit,
-        "net_cost": net_cost,
-        "interest_rate": interest_rate,
-        "yearly_principal": yearly_principal,
-        "yearly_interest": yearly_interest,
-        "final_od_balance": od_balance
-    }
+def calculate_overdraft_home_loan(amount, bank_name, tenure, surplus_initial, surplus_monthly,
+                                   tax_slab, old_regime, prop_type, withdrawal_pattern, custom_rate=None,
+                                   rate_events=(), reset_policy="recompute_emi", daily_accrual=None,
+                                   withdrawal_model=None):
+    """
+    Calculate cost for home loan with overdraft facility
+
+    rate_events/reset_policy work as for the regular loan. daily_accrual (dict with
+    'salary_day', 'emi_day' and optional 'withdrawals') charges interest on daily
+    closing balances instead of one monthly snapshot.
+    """
+    return compare_overdraft_home_loans(
+        amount, [bank_name], tenure, surplus_initial, surplus_monthly,
+        tax_slab, old_regime, prop_type, withdrawal_pattern, custom_rate=custom_rate,
+        rate_events=rate_events, reset_policy=reset_policy, daily_accrual=daily_accrual,
+        withdrawal_model=withdrawal_model
+    )[0]
+
+def prepared_download(name, scenario, label, build, file_name, mime):
+    """
+    Download button for a schedule export that is only encoded when the user asks for it
+
+    The encoded file is kept in the session for the scenario it was built from, so
+    reruns (including the one the download click triggers) don't encode it again;
+    any change to the scenario falls back to the "Prepare" button.
+
+    Args:
+        name (str): Export name, unique on the page
+        scenario (tuple): Inputs the export depends on
+        label (str): Download button label
+        build (callable): Returns the file contents (str or bytes)
+    """
+    exports = st.session_state.setdefault("prepared_exports", {})
+    prepared = exports.get(name)
+    if prepared is None or prepared[0] != scenario:
+        if not st.button(f"📦 Prepare {label}", key=f"prepare_{name}"):
+            return
+        prepared = exports[name] = (scenario, build())
+    st.download_button(f"⬇️ Download {label}", prepared[1], file_name=file_name, mime=mime, key=f"download_{name}")
+
+def schedule_csv(view):
+    """Schedule view as CSV text"""
+    data = io.StringIO()
+    view.to_csv(data)
+    return data.getvalue()
+
+def schedule_parquet(view):
+    """Schedule view as Parquet bytes"""
+    data = io.BytesIO()
+    view.to_parquet(data)
+    return data.getvalue()
 
 # Calculate costs
+regular_terms = regular_loan_terms([selected_regular_bank], manual_regular_rate)[0]
+od_terms = overdraft_loan_terms([selected_od_bank], manual_od_rate)[0]
+
 regular_loan = calculate_regular_home_loan(
     loan_amount, selected_regular_bank, tenure_months,
     tax_slab, old_tax_regime, property_type, annual_prepayment, prepayment_month,
-    custom_rate=manual_regular_rate
+    custom_rate=manual_regular_rate,
+    rate_events=rate_change_events(regular_terms['interest_rate']), reset_policy=reset_policy
 )
 
 od_loan = calculate_overdraft_home_loan(
     loan_amount, selected_od_bank, tenure_months, surplus_amount,
     monthly_surplus, tax_slab, old_tax_regime, property_type, withdrawal_pattern,
-    custom_rate=manual_od_rate
+    custom_rate=manual_od_rate,
+    rate_events=od_rate_change_events(od_terms['interest_rate']), reset_policy=reset_policy,
+    daily_accrual=daily_accrual, withdrawal_model=withdrawal_model
 )
 
 # Main comparison section
@@ -545,6 +531,13 @@ with col2:
               delta=format_currency_compact(od_loan['total_interest_saved']),
               delta_color="normal")
     st.metric("Net Cost", format_with_approximation(od_loan['net_cost']))
+    if 'expected_net_cost' in od_loan:
+        st.metric("Expected Net Cost (with withdrawals)", format_with_approximation(od_loan['expected_net_cost']),
+                  help=f"Average over simulated withdrawals (about {format_with_approximation(od_loan['expected_withdrawn'])} taken out in total)")
+        st.metric("Worst-Case Net Cost (with withdrawals)", format_with_approximation(od_loan['worst_case_net_cost']),
+                  help="Cost in the worst 5% of simulated withdrawal patterns")
+    elif withdrawals_unmodelled:
+        st.caption("ℹ️ Withdrawal costs not shown: they assume fixed rates and monthly interest.")
 
 # Savings calculation
 total_savings = regular_loan['net_cost'] - od_loan['net_cost']
@@ -636,7 +629,14 @@ However, interest paid is still eligible for Section 24(b) deduction.
 # Detailed breakdown tabs
 st.header("🔍 Detailed Cost Breakdown")
 
-tab1, tab2, tab3 = st.tabs(["Regular Home Loan", "Home Loan with Overdraft", "Year-wise Comparison"])
+tab1, tab2, tab3, tab4 = st.tabs(["Regular Home Loan", "Home Loan with Overdraft", "Year-wise Comparison",
+                                  "Old vs New Tax Regime"])
+
+# Tax benefits of both loans under every regime and property type, from the schedules already computed
+regular_tax = tax_benefits(regular_loan['yearly_principal'], regular_loan['yearly_interest'], tax_slab)
+od_tax = tax_benefits(od_loan['yearly_principal'], od_loan['yearly_interest'], tax_slab, principal_eligible=False)
+regime_index = 0 if old_tax_regime else 1
+property_index = PROPERTY_TYPES.index(property_type)
 
 with tab1:
     st.subheader(f"Regular Home Loan - {selected_regular_bank}")
@@ -664,8 +664,8 @@ with tab1:
             f"₹{regular_loan['total_interest']:,.0f}",
             f"₹{regular_loan['processing_fee']:,.0f}",
             f"₹{regular_loan['total_tax_benefit']:,.0f}",
-            f"₹{sum([min(p, 150000) for p in regular_loan['yearly_principal']]) * (tax_slab/100) if old_tax_regime else 0:,.0f}",
-            f"₹{regular_loan['total_tax_benefit'] - (sum([min(p, 150000) for p in regular_loan['yearly_principal']]) * (tax_slab/100) if old_tax_regime else 0):,.0f}",
+            f"₹{regular_tax['section_80c'][regime_index, property_index].sum():,.0f}",
+            f"₹{regular_tax['section_24b'][regime_index, property_index].sum():,.0f}",
             f"₹{regular_loan['net_cost']:,.0f}"
         ]
     }
@@ -749,10 +749,70 @@ with tab3:
                                for i in range(max_years)]
     })
 
-    st.dataframe(comparison_df[:10], use_container_width=True, hide_index=True)  # Show first 10 years
+    st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+
+    st.subheader("Month-by-Month Schedule")
+    schedule_column_labels = {
+        "month": "Month",
+        "opening_balance": "Opening Balance (₹)",
+        "interest": "Interest (₹)",
+        "principal": "Principal (₹)",
+        "prepayment": "Prepayment (₹)",
+        "od_balance": "OD Balance at Month End (₹)",
+        "closing_balance": "Closing Balance (₹)"
+    }
+    schedule_views = {
+        f"Regular - {selected_regular_bank}": regular_schedule_view(
+            [selected_regular_bank], loan_amount, [regular_terms['interest_rate']], tenure_months,
+            annual_prepayment, prepayment_month, rate_change_events(regular_terms['interest_rate']), reset_policy
+        ),
+        f"Overdraft - {selected_od_bank}": overdraft_schedule_view(
+            [selected_od_bank], loan_amount, [od_terms['interest_rate']], tenure_months, surplus_amount,
+            monthly_surplus, od_rate_change_events(od_terms['interest_rate']), reset_policy, daily_accrual
+        )
+    }
+    schedule_choice = st.radio("Loan", options=list(schedule_views), horizontal=True, key="schedule_loan")
+    schedule_view = schedule_views[schedule_choice]
+
+    st.dataframe(
+        pd.DataFrame(schedule_view.loan(0)).rename(columns=schedule_column_labels),
+        use_container_width=True, hide_index=True, height=400,
+        column_config={label: st.column_config.NumberColumn(format="%.0f")
+                       for name, label in schedule_column_labels.items() if name != "month"}
+    )
 
-    if max_years > 10:
-        st.markdown("*Showing first 10 years. Interest savings compound over time!*")
+    prepared_download(
+        "bank_schedule",
+        (schedule_choice, loan_amount, tenure_months, regular_terms['interest_rate'], od_terms['interest_rate'],
+         annual_prepayment, prepayment_month, surplus_amount, monthly_surplus, rate_change, rate_change_year,
+         reset_policy, daily_accrual),
+        "Schedule (CSV)", lambda: schedule_csv(schedule_view),
+        file_name=f"schedule_{schedule_view.labels[0]}.csv", mime="text/csv"
+    )
+
+with tab4:
+    st.subheader(f"Old vs New Tax Regime ({property_type})")
+
+    regime_rows = []
+    for loan_name, loan, loan_tax in (("Regular Home Loan", regular_loan, regular_tax),
+                                      ("Home Loan with Overdraft", od_loan, od_tax)):
+        old_benefit, new_benefit = loan_tax['total'][:, property_index]
+        cost_before_tax = loan['net_cost'] + loan['total_tax_benefit']
+        regime_rows.append({
+            "Loan": loan_name,
+            "Tax Benefit - Old (₹)": f"{old_benefit:,.0f}",
+            "Tax Benefit - New (₹)": f"{new_benefit:,.0f}",
+            "Net Cost - Old (₹)": f"{cost_before_tax - old_benefit:,.0f}",
+            "Net Cost - New (₹)": f"{cost_before_tax - new_benefit:,.0f}"
+        })
+
+    st.dataframe(pd.DataFrame(regime_rows), use_container_width=True, hide_index=True)
+    st.markdown(f"""
+    - **Old regime:** Section 80C on principal (₹1.5L/year, regular loan only) plus Section 24(b) on interest
+      ({'₹2L/year' if property_type == 'Self-Occupied' else 'no limit for let-out'})
+    - **New regime:** {'no home loan deductions for a self-occupied property' if property_type == 'Self-Occupied' else 'Section 24(b) on interest only (no 80C)'}
+    - Both at your {tax_slab}% slab, from the same loan schedules
+    """)
 
 # Visualization charts
 st.header("📊 Visual Comparison")
@@ -811,38 +871,260 @@ st.markdown("""
 See how different surplus amounts affect your total interest cost with overdraft facility:
 """)
 
-surplus_scenarios = [0, 200000, 500000, 1000000, 2000000]
-if loan_amount > 5000000:
-    surplus_scenarios.append(5000000)
+surplus_scenarios = np.array([0, 200000, 500000, 1000000, 2000000] + ([5000000] if loan_amount > 5000000 else []))
+surplus_scenarios = surplus_scenarios[surplus_scenarios <= loan_amount]
 
-od_costs_by_surplus = []
+selected_od_terms = overdraft_loan_terms([selected_od_bank])[0]
+selected_od_rate_events = od_rate_change_events(selected_od_terms['interest_rate'])
 
-for surplus in surplus_scenarios:
-    if surplus <= loan_amount:
-        temp_od = calculate_overdraft_home_loan(
-            loan_amount, selected_od_bank, tenure_months, surplus,
-            monthly_surplus, tax_slab, old_tax_regime, property_type, withdrawal_pattern
-        )
-        od_costs_by_surplus.append(temp_od['net_cost'])
-    else:
-        od_costs_by_surplus.append(None)
+od_costs_by_surplus = overdraft_net_costs(
+    loan_amount, selected_od_terms, tenure_months, surplus_scenarios,
+    monthly_surplus, tax_slab, old_tax_regime, property_type, selected_od_rate_events, reset_policy,
+    daily_accrual
+)
 
 surplus_df = pd.DataFrame({
-    'Initial Surplus (₹)': [f"₹{s:,.0f}" for s in surplus_scenarios if s <= loan_amount],
-    'Net Cost (₹)': [f"₹{c:,.0f}" for c in od_costs_by_surplus if c is not None],
-    'Savings vs Regular (₹)': [f"₹{regular_loan['net_cost'] - c:,.0f}" for c in od_costs_by_surplus if c is not None]
+    'Initial Surplus (₹)': [f"₹{s:,.0f}" for s in surplus_scenarios],
+    'Net Cost (₹)': [f"₹{c:,.0f}" for c in od_costs_by_surplus],
+    'Savings vs Regular (₹)': [f"₹{regular_loan['net_cost'] - c:,.0f}" for c in od_costs_by_surplus]
 })
 
 st.dataframe(surplus_df, use_container_width=True, hide_index=True)
 
+# Continuous surplus curve with break-even point
+surplus_sweep = sweep_overdraft_surplus(
+    loan_amount, selected_od_terms, tenure_months, monthly_surplus,
+    tax_slab, old_tax_regime, property_type, regular_loan['net_cost'],
+    rate_events=selected_od_rate_events, reset_policy=reset_policy, daily_accrual=daily_accrual
+)
+
+fig_surplus = go.Figure()
+fig_surplus.add_trace(go.Scatter(
+    x=surplus_sweep['surplus'],
+    y=surplus_sweep['net_cost'],
+    name='Overdraft Net Cost',
+    line=dict(color='#2ca02c', width=2)
+))
+fig_surplus.add_hline(
+    y=regular_loan['net_cost'],
+    line_dash='dash',
+    line_color='#1f77b4',
+    annotation_text='Regular Loan Net Cost'
+)
+if surplus_sweep['break_even_surplus']:
+    fig_surplus.add_vline(
+        x=surplus_sweep['break_even_surplus'],
+        line_dash='dot',
+        line_color='#ff7f0e',
+        annotation_text='Break-even'
+    )
+
+fig_surplus.update_layout(
+    title='Overdraft Net Cost vs Initial Surplus Parked',
+    xaxis_title='Initial Surplus (₹)',
+    yaxis_title='Net Cost (₹)',
+    height=400,
+    hovermode='x unified'
+)
+
+st.plotly_chart(fig_surplus, width='stretch')
+
+if surplus_sweep['break_even_surplus'] is None:
+    st.markdown(f"Even parking the full loan amount initially does not make overdraft cheaper than the regular loan with ₹{monthly_surplus:,.0f}/month surplus.")
+elif surplus_sweep['break_even_surplus'] == 0:
+    st.markdown("Overdraft is cheaper than the regular loan even with no initial surplus parked.")
+else:
+    st.markdown(f"**Break-even:** Park at least **{format_with_approximation(surplus_sweep['break_even_surplus'])}** initially for overdraft to beat the regular loan.")
+
+# Monthly parking needed with the current initial surplus
+monthly_break_even = find_break_even_surplus(
+    loan_amount, selected_od_terms, tenure_months, surplus_amount, monthly_surplus,
+    tax_slab, old_tax_regime, property_type, regular_loan['net_cost'], solve_for="monthly",
+    rate_events=selected_od_rate_events, reset_policy=reset_policy, daily_accrual=daily_accrual
+)['value']
+
+if monthly_break_even is None:
+    st.markdown(f"With ₹{surplus_amount:,.0f} parked initially, no monthly surplus makes overdraft cheaper than the regular loan.")
+elif monthly_break_even == 0:
+    st.markdown(f"With ₹{surplus_amount:,.0f} parked initially, overdraft beats the regular loan even without monthly additions.")
+else:
+    st.markdown(f"**Or:** With ₹{surplus_amount:,.0f} parked initially, add at least **{format_with_approximation(monthly_break_even)}/month** for overdraft to beat the regular loan.")
+
+# Floating rate risk (Monte Carlo over repo-rate paths)
+st.header("🎲 Floating Rate Risk")
+
+st.markdown("""
+Both loans are floating-rate: your rate moves with the RBI repo rate. Simulate thousands of possible
+rate paths (quarterly resets, 0.25% steps) to see the range of outcomes instead of a single number:
+""")
+
+run_monte_carlo = st.checkbox("Simulate floating rates (Monte Carlo)", value=False)
+
+if run_monte_carlo:
+    col_mc1, col_mc2 = st.columns(2)
+    with col_mc1:
+        rate_volatility = st.slider(
+            "Rate Volatility (% per year)",
+            min_value=0.25, max_value=2.5, value=1.0, step=0.25,
+            help="How much the repo rate typically moves in a year"
+        )
+    with col_mc2:
+        rate_paths = st.select_slider(
+            "Number of Rate Paths",
+            options=[1000, 2000, 5000, 10000],
+            value=10000
+        )
+
+    floating = monte_carlo_comparison(
+        loan_amount, regular_terms, od_terms, tenure_months,
+        surplus_amount, monthly_surplus, tax_slab, old_tax_regime, property_type,
+        annual_prepayment, prepayment_month, paths=rate_paths, volatility=rate_volatility
+    )
+
+    floating_df = pd.DataFrame({
+        'Percentile': [f"P{p:.0f}" for p in floating['percentiles']],
+        'Regular Interest (₹)': [f"₹{v:,.0f}" for v in floating['regular']['total_interest']],
+        'Regular Net Cost (₹)': [f"₹{v:,.0f}" for v in floating['regular']['net_cost']],
+        'Overdraft Interest (₹)': [f"₹{v:,.0f}" for v in floating['overdraft']['total_interest']],
+        'Overdraft Net Cost (₹)': [f"₹{v:,.0f}" for v in floating['overdraft']['net_cost']],
+        'Overdraft Savings (₹)': [f"₹{v:,.0f}" for v in floating['savings']]
+    })
+    st.dataframe(floating_df, use_container_width=True, hide_index=True)
+
+    fig_floating = go.Figure()
+    fig_floating.add_trace(go.Scatter(
+        x=floating['percentiles'], y=floating['regular']['net_cost'],
+        name='Regular Loan', line=dict(color='#1f77b4', width=2)
+    ))
+    fig_floating.add_trace(go.Scatter(
+        x=floating['percentiles'], y=floating['overdraft']['net_cost'],
+        name='Overdraft Loan', line=dict(color='#2ca02c', width=2)
+    ))
+    fig_floating.update_layout(
+        title='Net Cost Percentiles Across Rate Paths',
+        xaxis_title='Percentile of Rate Paths',
+        yaxis_title='Net Cost (₹)',
+        height=400,
+        hovermode='x unified'
+    )
+    st.plotly_chart(fig_floating, width='stretch')
+
+    st.markdown(f"Overdraft is cheaper in **{floating['od_cheaper_share']:.0%}** of simulated rate paths. "
+                f"In the worst 5% of paths the regular loan costs at least **{format_with_approximation(floating['regular']['net_cost'][-1])}** "
+                f"and the overdraft at least **{format_with_approximation(floating['overdraft']['net_cost'][-1])}**.")
+
+# Sensitivity analysis
+st.header("🌪️ What Matters Most")
+
+st.markdown("""
+Each input below is moved down and up by the amount shown while everything else stays the same.
+The longest bars are the inputs that change your overdraft savings the most:
+""")
+
+with st.expander("Adjust how far each input is moved"):
+    col_s1, col_s2, col_s3 = st.columns(3)
+    with col_s1:
+        rate_delta = st.number_input("Interest Rate (± %)", min_value=0.05, max_value=3.0, value=0.5, step=0.05)
+        tenure_delta = st.number_input("Tenure (± years)", min_value=1, max_value=10, value=5)
+    with col_s2:
+        surplus_delta = st.number_input("Initial Surplus (± ₹)", min_value=10000, max_value=5000000,
+                                        value=100000, step=10000)
+        monthly_surplus_delta = st.number_input("Monthly Surplus (± ₹)", min_value=1000, max_value=100000,
+                                                value=5000, step=1000)
+    with col_s3:
+        tax_slab_delta = st.number_input("Tax Slab (± %)", min_value=5, max_value=30, value=10, step=5)
+        prepayment_delta = st.number_input("Annual Prepayment (± ₹)", min_value=10000, max_value=1000000,
+                                           value=50000, step=10000)
+
+sensitivity = sensitivity_analysis(
+    loan_amount, regular_terms, od_terms, tenure_months, surplus_amount, monthly_surplus,
+    tax_slab, old_tax_regime, property_type, annual_prepayment, prepayment_month,
+    deltas={
+        "interest_rate": rate_delta,
+        "tenure": tenure_delta * 12,
+        "surplus_initial": surplus_delta,
+        "surplus_monthly": monthly_surplus_delta,
+        "tax_slab": tax_slab_delta,
+        "annual_prepay": prepayment_delta
+    },
+    rate_events=rate_change_events(regular_terms['interest_rate']),
+    od_rate_events=od_rate_change_events(od_terms['interest_rate']),
+    reset_policy=reset_policy, daily_accrual=daily_accrual
+)
+
+sensitivity_labels = {
+    "interest_rate": "Interest Rate",
+    "tenure": "Tenure",
+    "surplus_initial": "Initial Surplus",
+    "surplus_monthly": "Monthly Surplus",
+    "tax_slab": "Tax Slab",
+    "annual_prepay": "Annual Prepayment"
+}
+base_savings = sensitivity['base']['savings']
+low_change = sensitivity['low']['savings'] - base_savings
+high_change = sensitivity['high']['savings'] - base_savings
+order = np.argsort(np.maximum(np.abs(low_change), np.abs(high_change)))
+tornado_labels = [sensitivity_labels[sensitivity['inputs'][i]] for i in order]
+
+fig_tornado = go.Figure()
+fig_tornado.add_trace(go.Bar(
+    y=tornado_labels, x=low_change[order], orientation='h',
+    name='Input Down', marker_color='#d62728'
+))
+fig_tornado.add_trace(go.Bar(
+    y=tornado_labels, x=high_change[order], orientation='h',
+    name='Input Up', marker_color='#2ca02c'
+))
+fig_tornado.update_layout(
+    title=f'Change in Overdraft Savings (currently {format_with_approximation(base_savings)})',
+    xaxis_title='Change in Savings (₹)',
+    barmode='overlay',
+    height=400
+)
+st.plotly_chart(fig_tornado, width='stretch')
+
+st.subheader("Savings by Interest Rate and Tenure")
+
+if rate_change != 0 or daily_accrual is not None:
+    st.caption("The grid uses fixed rates and monthly interest (rate change scenario and daily interest not applied).")
+
+grid = savings_grid(
+    loan_amount, regular_terms, od_terms, np.round(np.arange(7.0, 12.0001, 0.05), 2), np.arange(5, 31) * 12,
+    surplus_amount, monthly_surplus, tax_slab, old_tax_regime, property_type, annual_prepayment, prepayment_month
+)
+
+fig_grid = go.Figure()
+fig_grid.add_trace(go.Heatmap(
+    x=grid['tenures'] // 12, y=grid['rates'], z=grid['savings'],
+    colorscale='RdYlGn', zmid=0,
+    colorbar=dict(title='Savings (₹)'),
+    hovertemplate='Tenure: %{x} years<br>Rate: %{y:.2f}%<br>Savings: ₹%{z:,.0f}<extra></extra>'
+))
+fig_grid.add_trace(go.Scatter(
+    x=[tenure_years], y=[regular_terms['interest_rate']], mode='markers',
+    marker=dict(symbol='x', size=12, color='black'), name='Your Loan'
+))
+fig_grid.update_layout(
+    title='Overdraft Savings vs Regular Loan (fixed rates; overdraft rate keeps its current spread)',
+    xaxis_title='Tenure (years)',
+    yaxis_title='Regular Loan Interest Rate (%)',
+    height=500
+)
+st.plotly_chart(fig_grid, width='stretch')
+
 # All banks comparison (hide when using manual rates)
 if not enable_manual_rates:
     st.header("🏦 Compare All Banks")
 
+    if rate_change != 0:
+        st.caption("Bank comparison uses each bank's current rate for the whole tenure (rate change scenario not applied).")
+
     st.subheader("Regular Home Loan Comparison")
+    regular_banks = list(BANK_DATA["Regular Home Loan (EMI)"].keys())
+    regular_costs = compare_regular_home_loans(loan_amount, regular_banks, tenure_months, tax_slab, old_tax_regime, property_type, annual_prepayment, prepayment_month)
     regular_comparison = []
-    for bank, data in BANK_DATA["Regular Home Loan (EMI)"].items():
-        cost = calculate_regular_home_loan(loan_amount, bank, tenure_months, tax_slab, old_tax_regime, property_type, annual_prepayment, prepayment_month)
+    for bank, cost in zip(regular_banks, regular_costs):
+        data = BANK_DATA["Regular Home Loan (EMI)"][bank]
         regular_comparison.append({
             "Bank": bank,
             "Interest Rate (%)": data["interest_rate"],
@@ -856,10 +1138,13 @@ if not enable_manual_rates:
     st.dataframe(pd.DataFrame(regular_comparison), use_container_width=True, hide_index=True)
 
     st.subheader("Home Loan with Overdraft Comparison")
+    od_banks = list(BANK_DATA["Home Loan with Overdraft"].keys())
+    od_costs = compare_overdraft_home_loans(loan_amount, od_banks, tenure_months, surplus_amount, monthly_surplus,
+                                            tax_slab, old_tax_regime, property_type, withdrawal_pattern,
+                                            daily_accrual=daily_accrual, withdrawal_model=withdrawal_model)
     od_comparison = []
-    for bank, data in BANK_DATA["Home Loan with Overdraft"].items():
-        cost = calculate_overdraft_home_loan(loan_amount, bank, tenure_months, surplus_amount, monthly_surplus,
-                                             tax_slab, old_tax_regime, property_type, withdrawal_pattern)
+    for bank, cost in zip(od_banks, od_costs):
+        data = BANK_DATA["Home Loan with Overdraft"][bank]
         od_comparison.append({
             "Bank": bank,
             "Interest Rate (%)": data["interest_rate"],
@@ -869,11 +1154,120 @@ if not enable_manual_rates:
             "Interest Saved (₹)": f"{cost['total_interest_saved']:,.0f}",
             "Net Cost (₹)": f"{cost['net_cost']:,.0f}"
         })
+        if 'expected_net_cost' in cost:
+            od_comparison[-1]["Expected Net Cost (₹)"] = f"{cost['expected_net_cost']:,.0f}"
+            od_comparison[-1]["Worst-Case Net Cost (₹)"] = f"{cost['worst_case_net_cost']:,.0f}"
 
     st.dataframe(pd.DataFrame(od_comparison), use_container_width=True, hide_index=True)
+
+    # Monthly schedules of every bank, encoded only when an export is asked for
+    regular_rates = [BANK_DATA["Regular Home Loan (EMI)"][bank]["interest_rate"] for bank in regular_banks]
+    od_rates = [BANK_DATA["Home Loan with Overdraft"][bank]["interest_rate"] for bank in od_banks]
+    all_schedules = {
+        "regular": regular_schedule_view(
+            regular_banks, loan_amount, regular_rates, tenure_months, annual_prepayment, prepayment_month
+        ),
+        "overdraft": overdraft_schedule_view(
+            od_banks, loan_amount, od_rates, tenure_months, surplus_amount, monthly_surplus, daily_accrual=daily_accrual
+        )
+    }
+    export_format = st.radio("Schedule export format", options=["CSV", "Parquet"] if PARQUET_AVAILABLE else ["CSV"],
+                             horizontal=True)
+    encode = schedule_parquet if export_format == "Parquet" else schedule_csv
+    export_scenario = (export_format, loan_amount, tenure_months, annual_prepayment, prepayment_month, surplus_amount,
+                       monthly_surplus, daily_accrual, tuple(zip(regular_banks, regular_rates)), tuple(zip(od_banks, od_rates)))
+    col_ex1, col_ex2 = st.columns(2)
+    for export_col, (loan_key, view) in zip((col_ex1, col_ex2), all_schedules.items()):
+        with export_col:
+            prepared_download(
+                f"all_{loan_key}_schedules", export_scenario, f"All {loan_key.title()} Schedules ({export_format})",
+                lambda view=view: encode(view), file_name=f"{loan_key}_schedules.{export_format.lower()}",
+                mime="application/vnd.apache.parquet" if export_format == "Parquet" else "text/csv"
+            )
 else:
     st.info("ℹ️ 'Compare All Banks' section is hidden when using custom interest rates. Disable manual override to see all banks comparison.")
 
+# Profile sweep: how the rate and cost of every bank move with the borrower's profile
+st.header("🧭 How Your Profile Moves Your Rate")
+
+st.markdown("""
+Every combination of the profile factors you pick below, with everything else kept as in your profile
+(or the standard profile in Standard Rates mode), evaluated for every bank:
+""")
+
+profile_factor_labels = {
+    "credit_score": "Credit Score",
+    "age": "Age Band",
+    "gender": "Gender",
+    "employment": "Employment Type",
+    "loan_amount": "Loan Amount Band",
+    "location": "Property Location"
+}
+sweep_factors = st.multiselect(
+    "Profile factors to vary",
+    options=list(profile_factor_labels),
+    default=["credit_score", "employment"],
+    format_func=profile_factor_labels.get,
+    help="All combinations of the chosen factors are compared (e.g. 4 credit scores x 4 employment types = 16 profiles)"
+)
+
+if sweep_factors:
+    sweep_profile = user_profile if use_personalized else {'loan_amount': loan_amount}
+    sweep = profile_grid(sweep_profile, sweep_factors)
+    sweep_labels = [" · ".join(categories) for categories in sweep['categories']]
+    sweep_labels[sweep['current']] += " (you)"
+
+    sweep_regular_banks = list(BANK_DATA["Regular Home Loan (EMI)"].keys())
+    sweep_od_banks = list(BANK_DATA["Home Loan with Overdraft"].keys())
+    sweep_regular_rates = personalized_rates(
+        [BANK_DATA["Regular Home Loan (EMI)"][bank]['base_rate'] for bank in sweep_regular_banks], sweep['codes']
+    )
+    sweep_od_rates = personalized_rates(
+        [BANK_DATA["Home Loan with Overdraft"][bank]['base_rate'] for bank in sweep_od_banks], sweep['codes']
+    )
+    sweep_costs = profile_sweep(
+        loan_amount, regular_loan_terms(sweep_regular_banks), overdraft_loan_terms(sweep_od_banks),
+        sweep_regular_rates, sweep_od_rates, tenure_months, surplus_amount, monthly_surplus,
+        tax_slab, old_tax_regime, property_type, annual_prepayment, prepayment_month, daily_accrual
+    )
+
+    sweep_height = max(400, 22 * len(sweep_labels) + 150)
+    sweep_views = [
+        ("Regular Loan", sweep_regular_banks, sweep_regular_rates, sweep_costs['regular_net_cost']),
+        ("Overdraft Loan", sweep_od_banks, sweep_od_rates, sweep_costs['od_net_cost'])
+    ]
+    for sweep_tab, (loan_label, banks, rates, net_costs) in zip(st.tabs([view[0] for view in sweep_views]), sweep_views):
+        with sweep_tab:
+            col_sw1, col_sw2 = st.columns(2)
+            with col_sw1:
+                fig_sweep_rate = go.Figure(go.Heatmap(
+                    x=banks, y=sweep_labels, z=rates, colorscale='RdYlGn_r',
+                    text=np.char.mod('%.2f', rates), texttemplate='%{text}',
+                    colorbar=dict(title='Rate (%)'),
+                    hovertemplate='%{y}<br>%{x}: %{z:.2f}%<extra></extra>'
+                ))
+                fig_sweep_rate.update_layout(title=f'{loan_label} Interest Rate (%)', height=sweep_height,
+                                             yaxis=dict(autorange='reversed'))
+                st.plotly_chart(fig_sweep_rate, width='stretch')
+            with col_sw2:
+                fig_sweep_cost = go.Figure(go.Heatmap(
+                    x=banks, y=sweep_labels, z=net_costs, colorscale='RdYlGn_r',
+                    colorbar=dict(title='Net Cost (₹)'),
+                    hovertemplate='%{y}<br>%{x}: ₹%{z:,.0f}<extra></extra>'
+                ))
+                fig_sweep_cost.update_layout(title=f'{loan_label} Net Cost (₹)', height=sweep_height,
+                                             yaxis=dict(autorange='reversed'))
+                st.plotly_chart(fig_sweep_cost, width='stretch')
+
+    best_row = int(np.argmin(np.minimum(sweep_costs['regular_net_cost'].min(axis=1), sweep_costs['od_net_cost'].min(axis=1))))
+    if best_row != sweep['current']:
+        current_cost = min(sweep_costs['regular_net_cost'][sweep['current']].min(), sweep_costs['od_net_cost'][sweep['current']].min())
+        best_cost = min(sweep_costs['regular_net_cost'][best_row].min(), sweep_costs['od_net_cost'][best_row].min())
+        st.info(f"💡 With **{sweep_labels[best_row]}** the cheapest bank would cost "
+                f"**{format_with_approximation(current_cost - best_cost)}** less than the cheapest bank for your current profile.")
+else:
+    st.caption("Pick at least one profile factor to compare.")
+
 # Recommendations
 st.header("🎯 When to Choose What")
 
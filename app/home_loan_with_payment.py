@@ -9,6 +9,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from payment_handler import PaymentHandler
+from script_cache import compiled_script
 
 # Page configuration
 st.set_page_config(
@@ -95,7 +96,6 @@ if not has_access:
     # Stop execution - don't load the app
     st.stop()
 
-# User has access - load the full app
+# User has access - run the full app (compiled once per process, recompiled only after the file changes)
 app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "home_loan_comparison_app.py")
-with open(app_path, 'r', encoding='utf-8') as f:
-    exec(f.read())
+exec(compiled_script(app_path))
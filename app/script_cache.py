@@ -0,0 +1,100 @@
+"""
+Script Cache - Compiled code of the Streamlit app, shared by every session and rerun
+
+Streamlit reruns the wrapper script on every interaction, but imported modules
+stay loaded, so the compiled app lives here for the whole process. It is keyed
+on the file's modification time and size, so an edited app is recompiled on the
+next rerun.
+
+Benchmark the per-rerun saving with:
+    python script_cache.py
+"""
+import os
+import threading
+import time
+
+# Process-wide compiled scripts: absolute path -> ((mtime_ns, size), code object)
+_CODE_CACHE = {}
+_CODE_CACHE_STATS = {"hits": 0, "misses": 0}
+_CODE_CACHE_LOCK = threading.Lock()
+
+
+def _compile_script(path):
+    with open(path, 'rb') as f:
+        # Real filename so tracebacks point into the app instead of "<string>"
+        return compile(f.read(), path, 'exec', dont_inherit=True)
+
+
+def compiled_script(path):
+    """
+    Get the compiled code of a script, compiling it only when the file has changed
+
+    Args:
+        path (str): Path to the Python script
+
+    Returns:
+        code: Code object to run with exec()
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    # Compile under the lock so a burst of sessions compiles a changed file only once
+    with _CODE_CACHE_LOCK:
+        cached = _CODE_CACHE.get(path)
+        if cached is not None and cached[0] == version:
+            _CODE_CACHE_STATS["hits"] += 1
+            return cached[1]
+
+        _CODE_CACHE_STATS["misses"] += 1
+        code = _compile_script(path)
+        _CODE_CACHE[path] = (version, code)
+        return code
+
+
+def script_cache_stats():
+    """Get hit/miss counters of the compiled script cache and the number of scripts cached"""
+    with _CODE_CACHE_LOCK:
+        return {**_CODE_CACHE_STATS, "size": len(_CODE_CACHE)}
+
+
+def clear_script_cache():
+    """Forget all compiled scripts and reset the counters"""
+    with _CODE_CACHE_LOCK:
+        _CODE_CACHE.clear()
+        _CODE_CACHE_STATS.update(hits=0, misses=0)
+
+
+def benchmark(path, reruns=50):
+    """
+    Time loading the app per rerun: reading and compiling the file vs the cached code object
+
+    Args:
+        path (str): Script to load
+        reruns (int): Number of simulated reruns
+
+    Returns:
+        dict: {'uncached_ms', 'cached_ms': float (per rerun), 'speedup': float}
+    """
+    start = time.perf_counter()
+    for _ in range(reruns):
+        with open(path, 'r', encoding='utf-8') as f:
+            compile(f.read(), path, 'exec')  # What exec(f.read()) did on every rerun
+    uncached = (time.perf_counter() - start) / reruns
+
+    compiled_script(path)  # First rerun after start-up or an edit pays the compile once
+    start = time.perf_counter()
+    for _ in range(reruns):
+        compiled_script(path)
+    cached = (time.perf_counter() - start) / reruns
+
+    return {"uncached_ms": uncached * 1000, "cached_ms": cached * 1000, "speedup": uncached / cached}
+
+
+if __name__ == "__main__":
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "home_loan_comparison_app.py")
+    result = benchmark(app_path)
+    print(f"Read + compile per rerun: {result['uncached_ms']:.2f} ms")
+    print(f"Cached code per rerun:    {result['cached_ms']:.4f} ms")
+    print(f"Saving per rerun:         {result['uncached_ms'] - result['cached_ms']:.2f} ms "
+          f"({result['speedup']:,.0f}x faster)")
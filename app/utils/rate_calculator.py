@@ -1,6 +1,166 @@
 """
 Rate Calculator - Calculate personalized interest rates based on user profile
 """
+import numpy as np
+
+# Rate adjustment (% points) of every category of each profile factor, in the
+# order they are applied. Values a factor doesn't list fall in its last category.
+PROFILE_FACTORS = {
+    'credit_score': {'750+': -0.25, '700-749': 0.0, '650-699': 0.35, '<650': 0.75},
+    'age': {'25-35': -0.10, '36-45': 0.0, '46-55': 0.10, '56-62': 0.20},
+    'gender': {'Female': -0.05, 'Male': 0.0},
+    'employment': {'Salaried-Govt': -0.15, 'Salaried-MNC': -0.10, 'Salaried-Other': 0.0, 'Self-Employed': 0.25},
+    'loan_amount': {'≥75L': -0.10, '20L-75L': 0.0, '≤20L': 0.15},
+    'location': {'Metro Tier-1': 0.0, 'Tier-2': 0.10, 'Tier-3': 0.15}
+}
+
+# Profile fields read for each factor, with the default used when a field is missing
+PROFILE_DEFAULTS = {
+    'credit_score': '750+',
+    'age': 35,
+    'gender': 'Male',
+    'employment': 'Salaried-Other',
+    'loan_amount': 5000000,
+    'property_location': 'Metro Tier-1'
+}
+
+MIN_RATE = 7.0
+MAX_RATE = 15.0
+
+_FACTOR_ADJUSTMENTS = [np.array(list(categories.values())) for categories in PROFILE_FACTORS.values()]
+_CATEGORY_INDEX = {
+    factor: {category: i for i, category in enumerate(categories)}
+    for factor, categories in PROFILE_FACTORS.items()
+}
+
+# Total adjustment of every profile, indexed by its encoded factor categories
+# (4 x 4 x 2 x 4 x 3 x 3 entries), summed in the same order as the factors
+ADJUSTMENT_TABLE = sum(
+    adjustments.reshape((-1,) + (1,) * (len(_FACTOR_ADJUSTMENTS) - 1 - i))
+    for i, adjustments in enumerate(_FACTOR_ADJUSTMENTS)
+)
+
+
+def _category(factor, value):
+    """Index of a categorical value; unknown values fall in the factor's last category"""
+    index = _CATEGORY_INDEX[factor]
+    return index.get(value, len(index) - 1)
+
+
+def _age_category(age):
+    if 25 <= age <= 35:
+        return 0
+    elif 36 <= age <= 45:
+        return 1
+    elif 46 <= age <= 55:
+        return 2
+    return 3  # 56-62 (and anyone outside the bands above)
+
+
+def _loan_amount_category(loan_amount):
+    if loan_amount >= 7500000:  # ≥75L
+        return 0
+    elif loan_amount <= 2000000:  # ≤20L
+        return 2
+    return 1
+
+
+def encode_profile(user_profile):
+    """
+    Encode a user profile as the category index of each factor
+
+    Args:
+        user_profile (dict): User profile (see calculate_personalized_rate); missing keys use PROFILE_DEFAULTS
+
+    Returns:
+        tuple: One category index per factor, in PROFILE_FACTORS order
+    """
+    profile = {**PROFILE_DEFAULTS, **user_profile}
+    return (
+        _category('credit_score', profile['credit_score']),
+        _age_category(profile['age']),
+        _category('gender', profile['gender']),
+        _category('employment', profile['employment']),
+        _loan_amount_category(profile['loan_amount']),
+        _category('location', profile['property_location'])
+    )
+
+
+def encode_profiles(user_profiles):
+    """
+    Encode many user profiles as flat indices into ADJUSTMENT_TABLE
+
+    Args:
+        user_profiles (iterable): User profile dicts
+
+    Returns:
+        np.ndarray: One table index per profile
+    """
+    codes = np.array([encode_profile(profile) for profile in user_profiles], dtype=np.intp)
+    if not len(codes):
+        return np.zeros(0, dtype=np.intp)
+    return np.ravel_multi_index(codes.T, ADJUSTMENT_TABLE.shape)
+
+
+def profile_grid(user_profile, factors=('credit_score', 'employment')):
+    """
+    Encode every combination of categories of some factors, keeping the others at the profile's own
+
+    Combinations are built directly as ADJUSTMENT_TABLE indices, so a sweep of
+    hundreds of profiles never builds a profile dict per combination.
+
+    Args:
+        user_profile (dict): Profile the sweep starts from; missing keys use PROFILE_DEFAULTS
+        factors (iterable): Factors to vary (keys of PROFILE_FACTORS)
+
+    Returns:
+        dict: {
+            'factors': tuple of varied factors,
+            'categories': list (one tuple of category labels per combination),
+            'codes': np.ndarray (table index per combination, for personalized_rates),
+            'current': int (position of the profile itself)
+        }
+    """
+    factors = tuple(factors)
+    unknown = set(factors) - set(PROFILE_FACTORS)
+    if unknown or not factors:
+        raise ValueError(f"Choose profile factors from: {', '.join(PROFILE_FACTORS)}")
+
+    current = encode_profile(user_profile)
+    combinations = np.indices([len(PROFILE_FACTORS[factor]) for factor in factors]).reshape(len(factors), -1)
+
+    index = [np.full(combinations.shape[1], category) for category in current]
+    for factor, categories in zip(factors, combinations):
+        index[list(PROFILE_FACTORS).index(factor)] = categories
+    codes = np.ravel_multi_index(index, ADJUSTMENT_TABLE.shape)
+
+    labels = [list(PROFILE_FACTORS[factor]) for factor in factors]
+    return {
+        'factors': factors,
+        'categories': [tuple(labels[i][category] for i, category in enumerate(combination))
+                       for combination in combinations.T.tolist()],
+        'codes': codes,
+        'current': int(np.flatnonzero(codes == np.ravel_multi_index(current, ADJUSTMENT_TABLE.shape))[0])
+    }
+
+
+def personalized_rates(base_rates, user_profiles):
+    """
+    Personalized rates for every profile and bank in one vectorized lookup
+
+    Args:
+        base_rates (array-like): Base interest rate of each bank
+        user_profiles (iterable or np.ndarray): User profile dicts, or indices from encode_profiles
+
+    Returns:
+        np.ndarray: Final rate per profile and bank (profiles x banks), rounded to 2 decimals
+        and kept between 7% and 15% (calculate_personalized_rate uses this too)
+    """
+    codes = np.asarray(user_profiles) if isinstance(user_profiles, np.ndarray) else encode_profiles(user_profiles)
+    total_adjustment = ADJUSTMENT_TABLE.ravel()[codes]
+    final_rates = np.asarray(base_rates, dtype=float)[None, :] + total_adjustment[:, None]
+    return np.round(np.clip(final_rates, MIN_RATE, MAX_RATE), 2)
+
 
 def calculate_personalized_rate(base_rate, user_profile):
     """
@@ -23,78 +183,22 @@ def calculate_personalized_rate(base_rate, user_profile):
             'total_adjustment': float
         }
     """
+    code = encode_profile(user_profile)
 
-    adjustments = {}
-
-    # 1. Credit Score Adjustment
-    credit_score = user_profile.get('credit_score', '750+')
-    if credit_score == '750+':
-        adjustments['credit_score'] = -0.25
-    elif credit_score == '700-749':
-        adjustments['credit_score'] = 0.0
-    elif credit_score == '650-699':
-        adjustments['credit_score'] = 0.35
-    else:  # <650
-        adjustments['credit_score'] = 0.75
-
-    # 2. Age Adjustment
-    age = user_profile.get('age', 35)
-    if 25 <= age <= 35:
-        adjustments['age'] = -0.10
-    elif 36 <= age <= 45:
-        adjustments['age'] = 0.0
-    elif 46 <= age <= 55:
-        adjustments['age'] = 0.10
-    else:  # 56-62
-        adjustments['age'] = 0.20
-
-    # 3. Gender Adjustment (Women get concession)
-    gender = user_profile.get('gender', 'Male')
-    if gender == 'Female':
-        adjustments['gender'] = -0.05
-    else:
-        adjustments['gender'] = 0.0
-
-    # 4. Employment Type Adjustment
-    employment = user_profile.get('employment', 'Salaried-Other')
-    if employment == 'Salaried-Govt':
-        adjustments['employment'] = -0.15
-    elif employment == 'Salaried-MNC':
-        adjustments['employment'] = -0.10
-    elif employment == 'Salaried-Other':
-        adjustments['employment'] = 0.0
-    else:  # Self-Employed
-        adjustments['employment'] = 0.25
-
-    # 5. Loan Amount Adjustment
-    loan_amount = user_profile.get('loan_amount', 5000000)
-    if loan_amount >= 7500000:  # ≥75L
-        adjustments['loan_amount'] = -0.10
-    elif loan_amount <= 2000000:  # ≤20L
-        adjustments['loan_amount'] = 0.15
-    else:
-        adjustments['loan_amount'] = 0.0
-
-    # 6. Property Location Adjustment
-    location = user_profile.get('property_location', 'Metro Tier-1')
-    if location == 'Metro Tier-1':
-        adjustments['location'] = 0.0
-    elif location == 'Tier-2':
-        adjustments['location'] = 0.10
-    else:  # Tier-3
-        adjustments['location'] = 0.15
-
-    # Calculate final rate
-    total_adjustment = sum(adjustments.values())
-    final_rate = base_rate + total_adjustment
-
-    # Ensure rate doesn't go below 7.0% or above 15.0%
-    final_rate = max(7.0, min(15.0, final_rate))
+    adjustments = {
+        factor: float(factor_adjustments[index])
+        for factor, factor_adjustments, index in zip(PROFILE_FACTORS, _FACTOR_ADJUSTMENTS, code)
+    }
+
+    # Final rate from the same lookup, 7-15% clip and rounding as personalized_rates,
+    # so a profile always gets the same rate here as in the bank table and sweeps
+    total_adjustment = ADJUSTMENT_TABLE[code]
+    final_rate = personalized_rates([base_rate], np.array([np.ravel_multi_index(code, ADJUSTMENT_TABLE.shape)]))
 
     return {
-        'final_rate': round(final_rate, 2),
+        'final_rate': float(final_rate[0, 0]),
         'adjustments': adjustments,
-        'total_adjustment': round(total_adjustment, 2)
+        'total_adjustment': float(np.round(total_adjustment, 2))
     }
 
 
@@ -3,14 +3,26 @@ Rate Loader - Load bank interest rates from JSON file with fallback to defaults
 """
 import json
 import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
 from datetime import datetime
+from types import MappingProxyType
+
+import numpy as np
 
 # Import rate calculator at module level to avoid relative import issues
 try:
-    from rate_calculator import calculate_personalized_rate
+    from rate_calculator import encode_profiles, personalized_rates
 except ImportError:
     # Fallback for different import contexts
-    from .rate_calculator import calculate_personalized_rate
+    from .rate_calculator import encode_profiles, personalized_rates
+
+REGULAR_LOANS = "Regular Home Loan (EMI)"
+OVERDRAFT_LOANS = "Home Loan with Overdraft"
+
+# Personalized bank tables kept per process (one per distinct profile category combination)
+PERSONALIZED_TABLES_MAXSIZE = 256
 
 # Fallback default rates if JSON file not available or fails to load
 DEFAULT_RATES = {
@@ -34,104 +46,240 @@ DEFAULT_RATES = {
 }
 
 
+def _freeze(value):
+    """Read-only copy of parsed JSON (dicts become read-only mappings, lists become tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+_FROZEN_DEFAULT_RATES = _freeze(DEFAULT_RATES)
+
+# Process-wide parsed rate files: absolute path -> ((mtime_ns, size), read-only data)
+_RATES_CACHE = {}
+_RATES_CACHE_STATS = {"hits": 0, "misses": 0}
+_RATES_CACHE_LOCK = threading.Lock()
+
+
+def _read_bank_rates(json_path):
+    """Parse and validate a rates file, falling back to the defaults"""
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        # Validate structure
+        if 'rates' in data and 'regular_loans' in data['rates'] and 'od_loans' in data['rates']:
+            return _freeze(data)
+        else:
+            print(f"Warning: Invalid JSON structure in {json_path}, using defaults")
+            return _FROZEN_DEFAULT_RATES
+
+    except Exception as e:
+        print(f"Error loading bank rates from {json_path}: {e}. Using defaults.")
+        return _FROZEN_DEFAULT_RATES
+
+
 def load_bank_rates(json_path=None):
     """
     Load bank interest rates from JSON file or use defaults
 
+    The parsed file is cached for the whole process, keyed on its path, modification
+    time and size, so every session shares one read-only copy and the file is only
+    read again after it changes.
+
     Args:
         json_path (str, optional): Path to JSON file. If None, looks in app/data/bank_rates.json
 
     Returns:
-        dict: Bank rates data with structure matching DEFAULT_RATES
+        Mapping: Read-only bank rates data with structure matching DEFAULT_RATES
     """
 
     if json_path is None:
         # Try to find the JSON file relative to this script
         script_dir = os.path.dirname(os.path.abspath(__file__))
         json_path = os.path.join(script_dir, '..', 'data', 'bank_rates.json')
+    json_path = os.path.abspath(json_path)
 
     try:
-        # Try to load from JSON file
-        if os.path.exists(json_path):
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Validate structure
-            if 'rates' in data and 'regular_loans' in data['rates'] and 'od_loans' in data['rates']:
-                return data
-            else:
-                print(f"Warning: Invalid JSON structure in {json_path}, using defaults")
-                return DEFAULT_RATES
-        else:
-            print(f"Info: Bank rates JSON not found at {json_path}, using defaults")
-            return DEFAULT_RATES
+        stat = os.stat(json_path)
+    except OSError:
+        print(f"Info: Bank rates JSON not found at {json_path}, using defaults")
+        return _FROZEN_DEFAULT_RATES
+    version = (stat.st_mtime_ns, stat.st_size)
 
-    except Exception as e:
-        print(f"Error loading bank rates from {json_path}: {e}. Using defaults.")
-        return DEFAULT_RATES
+    # Parse under the lock so a burst of sessions reads a changed file only once
+    with _RATES_CACHE_LOCK:
+        cached = _RATES_CACHE.get(json_path)
+        if cached is not None and cached[0] == version:
+            _RATES_CACHE_STATS["hits"] += 1
+            return cached[1]
+
+        _RATES_CACHE_STATS["misses"] += 1
+        data = _read_bank_rates(json_path)
+        _RATES_CACHE[json_path] = (version, data)
+        return data
+
+
+def bank_rates_cache_stats():
+    """Get hit/miss counters of the rate file cache and the number of files cached"""
+    with _RATES_CACHE_LOCK:
+        return {**_RATES_CACHE_STATS, "size": len(_RATES_CACHE)}
+
+
+def clear_bank_rates_cache():
+    """Forget all parsed rate files and reset the counters"""
+    with _RATES_CACHE_LOCK:
+        _RATES_CACHE.clear()
+        _RATES_CACHE_STATS.update(hits=0, misses=0)
+
+
+class _BankTerms(Mapping):
+    """
+    One bank's rate data as a compact read-only record
+
+    Reads like the dict it replaces (bank["interest_rate"], bank.get(...),
+    "od_charge" in bank), but keeps its fields in slots instead of a per-bank dict.
+    """
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init__(self, *values):
+        for field, value in zip(self.FIELDS, values):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Bank data is read-only")
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __reduce__(self):
+        return type(self), tuple(self.values())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def with_rate(self, interest_rate):
+        """Same bank terms at another interest rate"""
+        return type(self)(interest_rate, *list(self.values())[1:])
+
+
+class RegularBankTerms(_BankTerms):
+    """Rate data of one regular home loan bank"""
+    FIELDS = ("interest_rate", "base_rate", "processing_fee", "min_processing", "prepayment_charge")
+    __slots__ = FIELDS
+
+    @classmethod
+    def from_rate_info(cls, rate_info):
+        return cls(rate_info['base_rate'], rate_info['base_rate'], rate_info.get('processing_fee', 0.50),
+                   rate_info.get('min_processing', 3000), rate_info.get('prepayment_charge', 0.0))
+
+
+class OverdraftBankTerms(_BankTerms):
+    """Rate data of one home loan with overdraft bank"""
+    FIELDS = ("interest_rate", "base_rate", "processing_fee", "min_processing", "od_charge", "min_loan")
+    __slots__ = FIELDS
+
+    @classmethod
+    def from_rate_info(cls, rate_info):
+        return cls(rate_info['base_rate'], rate_info['base_rate'], rate_info.get('processing_fee', 0.50),
+                   rate_info.get('min_processing', 3000), rate_info.get('od_charge', 5000),
+                   rate_info.get('min_loan', 2000000))
+
+
+def _standard_table(rates_data):
+    """Read-only BANK_DATA at the banks' base rates"""
+    return MappingProxyType({
+        REGULAR_LOANS: MappingProxyType({
+            bank_name: RegularBankTerms.from_rate_info(rate_info)
+            for bank_name, rate_info in rates_data['rates']['regular_loans'].items()
+        }),
+        OVERDRAFT_LOANS: MappingProxyType({
+            bank_name: OverdraftBankTerms.from_rate_info(rate_info)
+            for bank_name, rate_info in rates_data['rates']['od_loans'].items()
+        })
+    })
+
+
+def _personalized_table(standard, profile_code):
+    """Read-only BANK_DATA with every bank's rate personalized for one encoded profile"""
+    table = {}
+    for loan_type, banks in standard.items():
+        final_rates = personalized_rates([bank['base_rate'] for bank in banks.values()], np.array([profile_code]))
+        table[loan_type] = MappingProxyType({
+            bank_name: bank.with_rate(final_rate)
+            for (bank_name, bank), final_rate in zip(banks.items(), final_rates[0].tolist())
+        })
+    return MappingProxyType(table)
+
+
+# Process-wide bank tables shared by all sessions: the standard table of the current
+# rate data and an LRU of personalized tables keyed on the encoded profile
+_TABLES = {"rates_data": None, "standard": None, "personalized": OrderedDict(), "hits": 0, "misses": 0}
+_TABLES_LOCK = threading.Lock()
 
 
 def get_bank_data_for_app(use_personalized=False, user_profile=None):
     """
     Get bank data in the format expected by the main app
 
+    Tables are built once per process and shared read-only: the standard table
+    whenever the rate data changes, and personalized tables on demand, cached by
+    profile (profiles with the same rate factors share one table). Changing the
+    rate file drops every cached table.
+
     Args:
         use_personalized (bool): Whether to apply personalized rate adjustments
         user_profile (dict, optional): User profile for personalized rates
 
     Returns:
-        dict: Bank data in BANK_DATA format for the app
+        tuple: (read-only bank data in BANK_DATA format for the app, last updated date)
     """
 
     rates_data = load_bank_rates()
+    profile_code = int(encode_profiles([user_profile])[0]) if use_personalized and user_profile else None
+
+    with _TABLES_LOCK:
+        if _TABLES["rates_data"] is not rates_data:
+            _TABLES.update(rates_data=rates_data, standard=_standard_table(rates_data))
+            _TABLES["personalized"].clear()
+        bank_data = _TABLES["standard"]
+
+        if profile_code is not None:
+            personalized = _TABLES["personalized"]
+            if profile_code in personalized:
+                personalized.move_to_end(profile_code)
+                _TABLES["hits"] += 1
+            else:
+                _TABLES["misses"] += 1
+                personalized[profile_code] = _personalized_table(bank_data, profile_code)
+                while len(personalized) > PERSONALIZED_TABLES_MAXSIZE:
+                    personalized.popitem(last=False)
+            bank_data = personalized[profile_code]
 
-    # Convert to app format
-    bank_data = {
-        "Regular Home Loan (EMI)": {},
-        "Home Loan with Overdraft": {}
-    }
-
-    # Process regular loans
-    for bank_name, rate_info in rates_data['rates']['regular_loans'].items():
-        base_rate = rate_info['base_rate']
-
-        # Apply personalization if requested
-        if use_personalized and user_profile:
-            result = calculate_personalized_rate(base_rate, user_profile)
-            final_rate = result['final_rate']
-        else:
-            final_rate = base_rate
-
-        bank_data["Regular Home Loan (EMI)"][bank_name] = {
-            "interest_rate": final_rate,
-            "base_rate": base_rate,
-            "processing_fee": rate_info.get('processing_fee', 0.50),
-            "min_processing": rate_info.get('min_processing', 3000),
-            "prepayment_charge": rate_info.get('prepayment_charge', 0.0)
-        }
+    return bank_data, rates_data.get('last_updated', 'Unknown')
 
-    # Process OD loans
-    for bank_name, rate_info in rates_data['rates']['od_loans'].items():
-        base_rate = rate_info['base_rate']
 
-        # Apply personalization if requested
-        if use_personalized and user_profile:
-            result = calculate_personalized_rate(base_rate, user_profile)
-            final_rate = result['final_rate']
-        else:
-            final_rate = base_rate
-
-        bank_data["Home Loan with Overdraft"][bank_name] = {
-            "interest_rate": final_rate,
-            "base_rate": base_rate,
-            "processing_fee": rate_info.get('processing_fee', 0.50),
-            "min_processing": rate_info.get('min_processing', 3000),
-            "od_charge": rate_info.get('od_charge', 5000),
-            "min_loan": rate_info.get('min_loan', 2000000)
+def bank_tables_stats():
+    """Get hit/miss counters and size of the personalized bank table cache"""
+    with _TABLES_LOCK:
+        return {
+            "hits": _TABLES["hits"],
+            "misses": _TABLES["misses"],
+            "size": len(_TABLES["personalized"]),
+            "maxsize": PERSONALIZED_TABLES_MAXSIZE
         }
 
-    return bank_data, rates_data.get('last_updated', 'Unknown')
-
 
 def get_days_since_update(last_updated_str):
     """
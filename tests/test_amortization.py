@@ -0,0 +1,100 @@
+"""
+Equivalence of the closed-form EMI engines with the month-by-month reference loop
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Same import path the app uses for the engine package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from engine.amortization import (
+    _prepayment_segments, amortize_regular, amortize_regular_reference, amortize_regular_yearly,
+    amortize_regular_yearly_batch, yearly_totals
+)
+
+AMOUNT = 5000000
+
+RATES = [0.0, 8.5, 12.0]
+TENURES = [12, 240, 360]
+PREPAYMENTS = [
+    (0, 12),                   # No prepayment: plain annuity
+    (200000, 4),               # Mid-year prepayment
+    (200000, 12),              # Prepayment at the loan-year end
+    (1500000, 1),              # Large prepayments: loan closes years early
+    (2 * AMOUNT, 6),           # First prepayment above the balance
+]
+
+
+def reference_yearly(reference):
+    """Loan-year totals of the reference schedule, with principal and prepayment kept apart"""
+    return {key: yearly_totals(np.array(reference[key])) for key in ("principal", "interest", "prepayment")}
+
+
+@pytest.mark.parametrize("annual_rate", RATES)
+@pytest.mark.parametrize("tenure", TENURES)
+@pytest.mark.parametrize("annual_prepay, prepay_month", PREPAYMENTS)
+def test_monthly_schedule_matches_reference(annual_rate, tenure, annual_prepay, prepay_month):
+    reference = amortize_regular_reference(AMOUNT, annual_rate, tenure, annual_prepay, prepay_month)
+    loan = amortize_regular(AMOUNT, annual_rate, tenure, annual_prepay, prepay_month)
+
+    assert loan["months"] == reference["months"]
+    for key in ("interest", "principal", "prepayment", "outstanding"):
+        np.testing.assert_allclose(loan[key], reference[key], rtol=1e-9, atol=1e-6)
+    assert loan["emi"] == pytest.approx(reference["emi"], rel=1e-9)
+    assert loan["final_emi"] == pytest.approx(reference["final_emi"], rel=1e-9, abs=1e-6)
+
+
+@pytest.mark.parametrize("annual_rate", RATES)
+@pytest.mark.parametrize("tenure", TENURES)
+@pytest.mark.parametrize("annual_prepay, prepay_month", PREPAYMENTS)
+def test_prepayment_segments_match_reference(annual_rate, tenure, annual_prepay, prepay_month):
+    reference = amortize_regular_reference(AMOUNT, annual_rate, tenure, annual_prepay, prepay_month)
+    starts, balances, emis, prepayments, closing = _prepayment_segments(
+        AMOUNT, np.array([[annual_rate / 1200]]), tenure, annual_prepay, prepay_month
+    )
+    closing = int(closing[0])
+
+    # Segment s opens right after the prepayment in month starts[s]
+    for event, start in enumerate(starts[1:]):
+        paid = reference["prepayment"][start - 1] if start <= reference["months"] else 0.0
+        assert prepayments[0, event] == pytest.approx(paid, rel=1e-9, abs=1e-6)
+        if event < closing:
+            assert balances[0, event + 1] == pytest.approx(reference["outstanding"][start - 1], rel=1e-9)
+        else:
+            assert balances[0, event + 1] == 0.0
+    assert balances[0, 0] == AMOUNT
+    assert emis[0, 0] == pytest.approx(reference["emi"], rel=1e-9)
+    assert emis[0, closing] == pytest.approx(reference["final_emi"], rel=1e-9, abs=1e-6)
+
+
+@pytest.mark.parametrize("annual_rate", RATES)
+@pytest.mark.parametrize("tenure", TENURES)
+@pytest.mark.parametrize("annual_prepay, prepay_month", PREPAYMENTS)
+def test_yearly_totals_match_reference(annual_rate, tenure, annual_prepay, prepay_month):
+    reference = amortize_regular_reference(AMOUNT, annual_rate, tenure, annual_prepay, prepay_month)
+    expected = reference_yearly(reference)
+    years = len(expected["principal"])
+    scalar = amortize_regular_yearly(AMOUNT, annual_rate, tenure, annual_prepay, prepay_month)
+    batch = amortize_regular_yearly_batch(AMOUNT, [annual_rate], tenure, annual_prepay, prepay_month)
+
+    for loan in (scalar, {key: value[0] for key, value in batch.items()}):
+        assert loan["months"] == reference["months"]
+        for key in ("principal", "interest", "prepayment"):
+            values = np.asarray(loan[f"yearly_{key}"])
+            np.testing.assert_allclose(values[:years], expected[key], rtol=1e-9, atol=1e-6)
+            assert not values[years:].any()
+        assert loan["emi"] == pytest.approx(reference["emi"], rel=1e-9)
+        assert loan["final_emi"] == pytest.approx(reference["final_emi"], rel=1e-9, abs=1e-6)
+
+
+def test_yearly_batch_rows_are_independent():
+    rates = [0.0, 8.4, 8.5, 9.25, 10.0, 12.0]
+    batch = amortize_regular_yearly_batch(AMOUNT, rates, 240, 200000, 4)
+    for row, annual_rate in enumerate(rates):
+        scalar = amortize_regular_yearly(AMOUNT, annual_rate, 240, 200000, 4)
+        assert batch["months"][row] == scalar["months"]
+        for key in ("yearly_principal", "yearly_interest", "yearly_prepayment"):
+            np.testing.assert_allclose(batch[key][row], scalar[key], rtol=1e-9, atol=1e-6)
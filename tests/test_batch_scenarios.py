@@ -0,0 +1,87 @@
+"""
+Batch scenario runner: bad input rows become error records instead of ending the run
+"""
+import csv
+import json
+import os
+import sys
+
+import pytest
+
+# Same import path the app uses for the engine package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from batch_scenarios import read_scenarios, parse_scenario, evaluate_chunk, run_batch, UnreadableRow
+
+BANKS = ["HDFC Bank", "SBI MaxGain"]
+
+
+def write_jsonl(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def scenario_line(**fields):
+    return json.dumps({"loan_amount": 5000000, "banks": BANKS, **fields})
+
+
+def test_read_scenarios_marks_bad_json(tmp_path):
+    path = write_jsonl(tmp_path / "in.jsonl", [scenario_line(id="a"), "{not json", "", scenario_line(id="b")])
+    rows = list(read_scenarios(path))
+
+    assert len(rows) == 3
+    assert rows[0]["id"] == "a" and rows[2]["id"] == "b"
+    assert isinstance(rows[1], UnreadableRow) and rows[1].error.startswith("Invalid JSON")
+
+
+@pytest.mark.parametrize("row", [[1, 2], "x", 3, None])
+def test_parse_scenario_rejects_non_objects(row):
+    with pytest.raises(ValueError, match="must be a JSON object"):
+        parse_scenario(row)
+
+
+@pytest.mark.parametrize("fields, message", [
+    ({}, "loan_amount is required"),
+    ({"loan_amount": 0}, "loan_amount must be positive"),
+    ({"loan_amount": -5}, "loan_amount must be positive"),
+    ({"loan_amount": 5000000, "tenure_years": 0}, "tenure_years must be at least 1"),
+    ({"loan_amount": 5000000, "prepayment_month": 0}, "prepayment_month must be 1-12"),
+    ({"loan_amount": 5000000, "prepayment_month": 13}, "prepayment_month must be 1-12"),
+])
+def test_parse_scenario_validates_fields(fields, message):
+    with pytest.raises(ValueError, match=message):
+        parse_scenario(fields)
+
+
+def test_evaluate_chunk_turns_bad_rows_into_errors():
+    rows = [
+        (1, UnreadableRow("Invalid JSON: Expecting value")),
+        (2, [1, 2]),
+        (3, {"id": "no-amount"}),
+        (4, {"loan_amount": 5000000, "banks": ["No Such Bank"]}),
+        (5, json.loads(scenario_line())),
+    ]
+    records = evaluate_chunk(rows)
+
+    errors = [record for record in records if "error" in record]
+    assert [record["id"] for record in errors] == [1, 2, "no-amount", 4]
+    assert errors[0]["error"].startswith("Invalid JSON")
+    assert [record["bank"] for record in records if "error" not in record] == BANKS
+    assert all(record["id"] == 5 for record in records if "error" not in record)
+
+
+def test_run_batch_survives_bad_lines(tmp_path):
+    path = write_jsonl(tmp_path / "in.jsonl", [
+        scenario_line(id="first"), "{not json", "[1, 2]", "3", scenario_line(id="bad", tenure_years=0),
+        scenario_line(id="last")
+    ])
+    output = str(tmp_path / "out.csv")
+    stats = run_batch(path, output, workers=1, chunk_size=2)
+
+    with open(output, encoding="utf-8", newline="") as f:
+        records = list(csv.DictReader(f))
+
+    assert stats["scenarios"] == 6 and stats["errors"] == 4
+    assert stats["results"] == len(records) == 2 * len(BANKS) + 4
+    assert [record["id"] for record in records if record["error"]] == ["2", "3", "4", "bad"]
+    assert [record["id"] for record in records if not record["error"]] == ["first"] * 2 + ["last"] * 2
@@ -0,0 +1,71 @@
+"""
+Break-even solver: roots against the overdraft net cost and the number of cost evaluations
+"""
+import math
+import os
+import sys
+
+import pytest
+
+# Same import path the app uses for the engine package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from engine.break_even import find_break_even
+from engine.loans import overdraft_net_costs, find_break_even_surplus
+
+AMOUNT = 5000000
+TENURE = 240
+OD_TERM = {"interest_rate": 8.75, "processing_fee": 0.35, "min_processing": 5000, "od_charge": 10000}
+TAX = (30, True, "Self-Occupied")
+
+# Plain bisection needs log2(AMOUNT / tolerance) evaluations to narrow [0, AMOUNT] to 1
+BISECTION_EVALUATIONS = math.ceil(math.log2(AMOUNT)) + 2
+
+
+def net_cost(surplus_initial, surplus_monthly):
+    return float(overdraft_net_costs(AMOUNT, OD_TERM, TENURE, surplus_initial, surplus_monthly, *TAX)[0])
+
+
+@pytest.mark.parametrize("root", [50000, 298898.6, 1000000, 2000000])
+def test_initial_surplus_root_within_budget(root):
+    target = net_cost(root, 20000)
+    result = find_break_even_surplus(AMOUNT, OD_TERM, TENURE, 0, 20000, *TAX, target)
+
+    assert result["value"] == pytest.approx(root, abs=1.0)
+    assert net_cost(result["value"], 20000) <= target
+    assert result["evaluations"] <= 10
+
+
+@pytest.mark.parametrize("root", [2000, 10000, 40000])
+def test_monthly_surplus_root_beats_bisection(root):
+    target = net_cost(500000, root)
+    result = find_break_even_surplus(AMOUNT, OD_TERM, TENURE, 500000, 0, *TAX, target, solve_for="monthly")
+
+    assert result["value"] == pytest.approx(root, abs=1.0)
+    assert net_cost(500000, result["value"]) <= target
+    assert result["evaluations"] < BISECTION_EVALUATIONS - 5
+
+
+def test_smooth_cost_converges_in_a_handful():
+    result = find_break_even(lambda x: 1e7 / (1 + x / 1e5), 4e6, 0.0, 1e6)
+
+    assert result["value"] == pytest.approx(1.5e5, abs=1.0)
+    assert result["evaluations"] <= 10
+
+
+def test_known_points_are_not_recomputed():
+    calls = []
+
+    def cost(x):
+        calls.append(x)
+        return 100 - x
+
+    result = find_break_even(cost, 40, 0.0, 100.0, known={0.0: 100, 100.0: 0})
+    assert result["value"] == pytest.approx(60, abs=1.0)
+    assert 0.0 not in calls and 100.0 not in calls
+    assert result["evaluations"] == len(calls)
+
+
+def test_bracket_ends():
+    assert find_break_even(lambda x: 10 - x, 20, 0.0, 10.0) == {"value": 0.0, "evaluations": 1}
+    assert find_break_even(lambda x: 10 - x, -5, 0.0, 10.0) == {"value": None, "evaluations": 2}
@@ -0,0 +1,125 @@
+"""
+Equivalence of the daily-accrual overdraft engine with a day-by-day reference loop
+"""
+import calendar
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Same import path the app uses for the engine package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from engine.amortization import calculate_emi
+from engine.overdraft import daily_flows, month_days, simulate_overdraft_daily, DAYS_IN_MONTH
+
+AMOUNT = 5000000
+
+# (salary_day, emi_day, withdrawals)
+DAY_PATTERNS = [
+    (1, 5, ()),
+    (31, 30, ()),                            # Clamped to the last day of short months
+    (7, 29, ((10, 30000), (31, 15000))),     # Withdrawals, one on the last day of every month
+]
+
+
+def days_in_loan_month(month, start_year):
+    """Days in loan month `month` (0-based) of a loan starting in January"""
+    if start_year is None:
+        return int(DAYS_IN_MONTH[month % 12])
+    return calendar.monthrange(start_year + month // 12, month % 12 + 1)[1]
+
+
+def daily_reference(amount, annual_rate, tenure, surplus_initial, surplus_monthly,
+                    salary_day=1, emi_day=5, withdrawals=(), start_year=None):
+    """
+    Day-by-day overdraft account: apply each day's flows, accrue interest on the
+    positive closing balance, debit it at month end and cap the OD balance there
+    """
+    daily_rate = annual_rate / (365 * 100)
+    emi = calculate_emi(amount, annual_rate, tenure)
+    flows = [(salary_day, -surplus_monthly), (emi_day, -emi)] + list(withdrawals)
+
+    effective = max(amount - surplus_initial, 0.0)
+    outstanding = amount
+    interest_paid, principal_paid, od_balances = [], [], []
+    for month in range(tenure):
+        days = days_in_loan_month(month, start_year)
+        balance = effective
+        interest = 0.0
+        for day in range(1, days + 1):
+            balance += sum(flow for flow_day, flow in flows if min(flow_day, days) == day)
+            interest += daily_rate * max(balance, 0)
+        effective = max(0.0, balance + interest)
+
+        outstanding -= emi - interest
+        interest_paid.append(interest)
+        principal_paid.append(emi - interest)
+        od_balances.append(max(outstanding - effective, 0))
+        if outstanding <= 0:
+            break
+
+    return {
+        "interest": interest_paid,
+        "principal": principal_paid,
+        "od_balance": od_balances,
+        "months": len(interest_paid),
+        "final_od_balance": od_balances[-1]
+    }
+
+
+@pytest.mark.parametrize("start_year, februaries", [
+    (None, [28] * 5),
+    (2024, [29, 28, 28, 28, 29]),
+    (2096, [29, 28, 28, 28, 28]),            # 2100 is not a leap year
+])
+def test_month_days(start_year, februaries):
+    days = month_days(60, start_year)
+    assert days[1::12].tolist() == februaries
+    assert [days_in_loan_month(month, start_year) for month in range(60)] == days.tolist()
+
+
+@pytest.mark.parametrize("salary_day, emi_day, withdrawals", DAY_PATTERNS)
+def test_daily_flows_match_day_by_day_sums(salary_day, emi_day, withdrawals):
+    running, valid = daily_flows(40000, 20000, salary_day, emi_day, withdrawals, np.arange(28, 32))
+    flows = [(salary_day, -20000), (emi_day, -40000)] + list(withdrawals)
+
+    for row, days in enumerate(range(28, 32)):
+        expected = np.cumsum([sum(flow for flow_day, flow in flows if min(flow_day, days) == day)
+                              for day in range(1, days + 1)])
+        np.testing.assert_allclose(running[row, :days], expected)
+        assert valid[row].sum() == days
+
+
+@pytest.mark.parametrize("annual_rate", [0.0, 8.5])
+@pytest.mark.parametrize("tenure", [12, 240])
+@pytest.mark.parametrize("start_year", [None, 2024, 2027])
+@pytest.mark.parametrize("salary_day, emi_day, withdrawals", DAY_PATTERNS)
+@pytest.mark.parametrize("surplus_initial, surplus_monthly", [
+    (0, 0),                    # No surplus: never touches zero
+    (500000, 20000),
+    (0, 200000),               # Balance touches zero after a few years
+    (AMOUNT, 0),               # Surplus equal to the loan: starts at zero
+])
+def test_daily_matches_reference(annual_rate, tenure, start_year, salary_day, emi_day, withdrawals,
+                                 surplus_initial, surplus_monthly):
+    args = (AMOUNT, annual_rate, tenure, surplus_initial, surplus_monthly, salary_day, emi_day, withdrawals,
+            start_year)
+    reference = daily_reference(*args)
+    simulation = simulate_overdraft_daily(*args)
+
+    assert simulation["months"] == reference["months"]
+    for key in ("interest", "principal", "od_balance"):
+        np.testing.assert_allclose(simulation[key], reference[key], rtol=1e-9, atol=1e-6)
+    assert simulation["final_od_balance"] == pytest.approx(reference["final_od_balance"], rel=1e-9, abs=1e-6)
+
+
+def test_leap_years_add_a_day_of_interest():
+    common = simulate_overdraft_daily(AMOUNT, 8.5, 360, 500000, 20000)
+    leap = simulate_overdraft_daily(AMOUNT, 8.5, 360, 500000, 20000, start_year=2024)
+    reference = daily_reference(AMOUNT, 8.5, 360, 500000, 20000, start_year=2024)
+
+    np.testing.assert_allclose(leap["interest"], reference["interest"], rtol=1e-9, atol=1e-6)
+    assert leap["interest"][1] > common["interest"][1]      # February 2024 has 29 days
+    np.testing.assert_allclose(leap["interest"][:1], common["interest"][:1])
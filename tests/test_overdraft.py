@@ -0,0 +1,57 @@
+"""
+Equivalence of the closed-form overdraft engine with the month-by-month reference loop
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Same import path the app uses for the engine package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from engine.overdraft import simulate_overdraft_batch, simulate_overdraft_reference
+
+AMOUNT = 5000000
+
+
+@pytest.mark.parametrize("annual_rate", [0.0, 8.5, 12.0])
+@pytest.mark.parametrize("tenure", [12, 240, 360])
+@pytest.mark.parametrize("surplus_initial, surplus_monthly", [
+    (0, 0),                    # No surplus: plain EMI schedule
+    (500000, 20000),
+    (0, 200000),               # Cap binds after a few years
+    (AMOUNT, 0),               # Surplus equal to the loan: cap binds in month 1
+    (2 * AMOUNT, 50000),       # Surplus above the loan
+])
+def test_batch_matches_reference(annual_rate, tenure, surplus_initial, surplus_monthly):
+    reference = simulate_overdraft_reference(AMOUNT, annual_rate, tenure, surplus_initial, surplus_monthly)
+    batch = simulate_overdraft_batch(AMOUNT, [annual_rate], tenure, surplus_initial, surplus_monthly)
+    months = reference["months"]
+
+    assert batch["months"][0] == months
+    np.testing.assert_allclose(batch["interest"][0, :months], reference["interest"], rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(batch["principal"][0, :months], reference["principal"], rtol=1e-9, atol=1e-6)
+    assert batch["final_od_balance"][0] == pytest.approx(reference["final_od_balance"], rel=1e-9, abs=1e-6)
+    assert not batch["interest"][0, months:].any() and not batch["principal"][0, months:].any()
+
+
+def test_batch_rows_are_independent():
+    rates = [0.0, 8.5, 9.25]
+    batch = simulate_overdraft_batch(AMOUNT, rates, 240, 500000, 20000)
+    for row, annual_rate in enumerate(rates):
+        reference = simulate_overdraft_reference(AMOUNT, annual_rate, 240, 500000, 20000)
+        np.testing.assert_allclose(batch["interest"][row, :reference["months"]], reference["interest"],
+                                   rtol=1e-9, atol=1e-6)
+
+
+def test_batch_tenure_per_row():
+    rates, tenures = [0.0, 8.5, 9.25], [12, 360, 240]
+    batch = simulate_overdraft_batch(AMOUNT, rates, np.array(tenures), 500000, 20000)
+    assert batch["interest"].shape == (3, 360)
+    for row, (annual_rate, tenure) in enumerate(zip(rates, tenures)):
+        reference = simulate_overdraft_reference(AMOUNT, annual_rate, tenure, 500000, 20000)
+        assert batch["months"][row] == reference["months"]
+        np.testing.assert_allclose(batch["interest"][row, :reference["months"]], reference["interest"],
+                                   rtol=1e-9, atol=1e-6)
+        assert not batch["interest"][row, reference["months"]:].any()
@@ -0,0 +1,61 @@
+"""
+Personalized rates: the scalar and vectorized paths give the same rate for every profile
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Same import path the app uses for the rate helpers
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app', 'utils'))
+
+from rate_calculator import (
+    calculate_personalized_rate, encode_profiles, personalized_rates, profile_grid, PROFILE_FACTORS
+)
+
+# A profile value inside each age and loan amount band, to turn grid labels back into profiles
+BAND_VALUES = {
+    'age': {'25-35': 30, '36-45': 40, '46-55': 50, '56-62': 60},
+    'loan_amount': {'≥75L': 8000000, '20L-75L': 5000000, '≤20L': 1500000}
+}
+PROFILE_FIELDS = {'location': 'property_location'}
+
+# Base rates ending in a half cent land many profiles exactly half-way between two rounded rates
+BASE_RATES = [6.9, 7.0, 8.125, 8.345, 8.405, 8.5, 9.155, 10.675, 14.995, 15.2]
+
+
+def grid_profiles(grid):
+    """The profile dict of every combination in a profile_grid"""
+    return [
+        {PROFILE_FIELDS.get(factor, factor): BAND_VALUES.get(factor, {}).get(label, label)
+         for factor, label in zip(grid['factors'], labels)}
+        for labels in grid['categories']
+    ]
+
+
+def test_grid_profiles_encode_to_grid_codes():
+    grid = profile_grid({}, factors=PROFILE_FACTORS)
+    assert np.array_equal(encode_profiles(grid_profiles(grid)), grid['codes'])
+
+
+@pytest.mark.parametrize("base_rate", BASE_RATES)
+def test_scalar_rate_matches_vectorized_over_grid(base_rate):
+    grid = profile_grid({}, factors=PROFILE_FACTORS)
+    rates = personalized_rates([base_rate], grid['codes'])[:, 0]
+
+    scalar = [calculate_personalized_rate(base_rate, profile)['final_rate'] for profile in grid_profiles(grid)]
+    assert scalar == rates.tolist()
+    assert rates.min() >= 7.0 and rates.max() <= 15.0
+
+
+def test_half_cent_sweep_matches_everywhere():
+    grid = profile_grid({'age': 40}, factors=('credit_score', 'employment', 'location'))
+    base_rates = np.round(np.arange(7.0, 15.0, 0.005), 3)
+    rates = personalized_rates(base_rates, grid['codes'])
+
+    profiles = grid_profiles(grid)
+    for column in range(0, len(base_rates), 37):
+        scalar = [calculate_personalized_rate(float(base_rates[column]), {'age': 40, **profile})['final_rate']
+                  for profile in profiles]
+        assert scalar == rates[:, column].tolist()
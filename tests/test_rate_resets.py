@@ -0,0 +1,164 @@
+"""
+Equivalence of the piecewise rate-reset engines with a month-by-month reference loop
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Same import path the app uses for the engine package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from engine.amortization import (
+    amortize_rate_resets, calculate_emi, BALANCE_EPSILON, MAX_TENURE_MONTHS, RESET_POLICIES
+)
+from engine.overdraft import simulate_overdraft_rate_resets
+
+AMOUNT = 5000000
+
+RATE_EVENTS = [
+    (),                                  # No resets: fixed-rate loan
+    ((37, 10.5), (97, 7.5)),             # Rise, then fall below the starting rate
+    ((1, 9.0), (61, 12.0), (62, 12.5)),  # Reset in month 1 and back-to-back resets
+]
+
+
+def months_to_repay(balance, emi, monthly_rate, limit):
+    """Months a fixed EMI takes to clear the balance, counted one month at a time (limit + 1 if never)"""
+    for month in range(1, limit + 1):
+        balance -= emi - balance * monthly_rate
+        if balance < BALANCE_EPSILON:
+            return month
+    return limit + 1
+
+
+def rate_resets_reference(amount, annual_rate, tenure, rate_events=(), policy="recompute_emi",
+                          annual_prepay=0, prepay_month=12):
+    """
+    Month-by-month floating-rate EMI loan: pay the month, make any prepayment, then
+    apply rate changes due from the next month and reset the EMI by the policy
+    """
+    max_tenure = max(tenure, MAX_TENURE_MONTHS)
+    rates = {month: new_rate for month, new_rate in rate_events}
+    rate = rates.get(1, annual_rate)
+    emi = calculate_emi(amount, rate, tenure)
+    first_emi = emi
+
+    schedule = {"interest": [], "principal": [], "prepayment": [], "outstanding": [], "monthly_emi": []}
+    outstanding = float(amount)
+    month = 0
+    while outstanding >= BALANCE_EPSILON and month < (tenure if policy == "recompute_emi" else max_tenure):
+        month += 1
+        interest = outstanding * rate / 1200
+        principal = min(emi - interest, outstanding)
+        outstanding -= principal
+
+        prepayment = 0.0
+        prepay_due = annual_prepay > 0 and month % 12 == prepay_month % 12 and outstanding >= BALANCE_EPSILON
+        if prepay_due:
+            prepayment = min(annual_prepay, outstanding)
+            outstanding -= prepayment
+
+        for key, value in zip(schedule, (interest, principal, prepayment, outstanding, emi)):
+            schedule[key].append(value)
+        if outstanding < BALANCE_EPSILON:
+            break
+
+        # Reset the EMI at every rate change or prepayment
+        if month + 1 in rates or prepay_due:
+            rate = rates.get(month + 1, rate)
+            if policy == "recompute_emi":
+                emi = calculate_emi(outstanding, rate, tenure - month)
+            elif month + months_to_repay(outstanding, emi, rate / 1200, max_tenure) > max_tenure:
+                emi = calculate_emi(outstanding, rate, max_tenure - month)
+
+    return {**schedule, "emi": first_emi, "final_emi": emi, "months": month}
+
+
+def overdraft_rate_resets_reference(amount, annual_rate, tenure, surplus_initial, surplus_monthly,
+                                    rate_events=(), policy="recompute_emi"):
+    """Month-by-month overdraft account paying the reference EMI schedule under the same rate events"""
+    schedule = rate_resets_reference(amount, annual_rate, tenure, rate_events, policy)
+    rates = {month: new_rate for month, new_rate in rate_events}
+    rate = annual_rate
+
+    outstanding = amount
+    od_balance = surplus_initial
+    interest_paid, principal_paid = [], []
+    for month, emi in enumerate(schedule["monthly_emi"], start=1):
+        rate = rates.get(month, rate)
+        interest = max(0, outstanding - od_balance) * rate / 1200
+        outstanding -= emi - interest
+        od_balance = min(od_balance + surplus_monthly, max(0, outstanding))
+        interest_paid.append(interest)
+        principal_paid.append(emi - interest)
+        if outstanding <= 0:
+            break
+
+    return {
+        "interest": interest_paid,
+        "principal": principal_paid,
+        "months": len(interest_paid),
+        "final_od_balance": od_balance,
+        "scheduled_interest": sum(schedule["monthly_emi"]) - amount
+    }
+
+
+@pytest.mark.parametrize("policy", RESET_POLICIES)
+@pytest.mark.parametrize("tenure", [120, 240, 360])
+@pytest.mark.parametrize("rate_events", RATE_EVENTS)
+@pytest.mark.parametrize("annual_prepay, prepay_month", [
+    (0, 12),
+    (200000, 3),               # Prepayments fall inside reset segments (months 3, 15, 27, 39, ...)
+    (300000, 1),               # Prepayment in month 1, where a reset can also take effect
+])
+def test_rate_resets_match_reference(policy, tenure, rate_events, annual_prepay, prepay_month):
+    reference = rate_resets_reference(AMOUNT, 8.5, tenure, rate_events, policy, annual_prepay, prepay_month)
+    loan = amortize_rate_resets(AMOUNT, 8.5, tenure, rate_events, policy, annual_prepay, prepay_month)
+
+    assert loan["months"] == reference["months"]
+    for key in ("interest", "principal", "prepayment", "outstanding", "monthly_emi"):
+        np.testing.assert_allclose(loan[key], reference[key], rtol=1e-9, atol=1e-6)
+    assert loan["emi"] == pytest.approx(reference["emi"], rel=1e-9)
+    assert loan["final_emi"] == pytest.approx(reference["final_emi"], rel=1e-9)
+
+
+@pytest.mark.parametrize("tenure, rate_events, expected_months", [
+    (240, ((37, 9.25),), None),               # Rise: the loan runs past its tenure but within the cap
+    (240, ((37, 7.0),), None),                # Fall: the same EMI finishes early
+    (300, ((25, 14.0),), MAX_TENURE_MONTHS),  # Steep rise: EMI raised to finish at the cap
+])
+def test_extend_tenure_matches_reference(tenure, rate_events, expected_months):
+    reference = rate_resets_reference(AMOUNT, 8.5, tenure, rate_events, "extend_tenure")
+    loan = amortize_rate_resets(AMOUNT, 8.5, tenure, rate_events, "extend_tenure")
+
+    assert loan["months"] == reference["months"]
+    if expected_months:
+        assert loan["months"] == expected_months
+        assert loan["final_emi"] > loan["emi"]
+    else:
+        assert loan["months"] != tenure and loan["final_emi"] == loan["emi"]
+    np.testing.assert_allclose(loan["interest"], reference["interest"], rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(loan["outstanding"], reference["outstanding"], rtol=1e-9, atol=1e-6)
+
+
+@pytest.mark.parametrize("policy", RESET_POLICIES)
+@pytest.mark.parametrize("rate_events", RATE_EVENTS + [((25, 14.0),)])
+@pytest.mark.parametrize("surplus_initial, surplus_monthly", [
+    (0, 0),
+    (500000, 20000),
+    (0, 200000),               # Cap binds after a few years
+    (2 * AMOUNT, 50000),       # Surplus above the loan
+])
+def test_overdraft_rate_resets_match_reference(policy, rate_events, surplus_initial, surplus_monthly):
+    reference = overdraft_rate_resets_reference(AMOUNT, 8.5, 240, surplus_initial, surplus_monthly,
+                                                rate_events, policy)
+    simulation = simulate_overdraft_rate_resets(AMOUNT, 8.5, 240, surplus_initial, surplus_monthly,
+                                                rate_events, policy)
+
+    assert simulation["months"] == reference["months"]
+    np.testing.assert_allclose(simulation["interest"], reference["interest"], rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(simulation["principal"], reference["principal"], rtol=1e-9, atol=1e-6)
+    assert simulation["final_od_balance"] == pytest.approx(reference["final_od_balance"], rel=1e-9, abs=1e-6)
+    assert simulation["scheduled_interest"] == pytest.approx(reference["scheduled_interest"], rel=1e-9)